@@ -9,6 +9,9 @@ import json
 import sys
 from typing import Dict, List, Optional
 
+INPUT_PATH = 'frontend/public/transfer-players-2026-merged.json'
+OUTPUT_FILE = 'scripts/ppg_results.json'
+
 def parse_shooting_stat(stat_string: str) -> int:
     """
     Parse a shooting stat string like "124-227" and return the first number (made shots).
@@ -73,12 +76,12 @@ def calculate_points_per_game(player_data: Dict) -> Optional[float]:
         print(f"Error calculating PPG for {player_data.get('player', 'Unknown player')}: {e}")
         return None
 
-def main():
+def main(input_path: str = INPUT_PATH, output_file: str = OUTPUT_FILE):
     """Main function to process the JSON file and calculate PPG for all players."""
     
     # Load the JSON data
     try:
-        with open('frontend/public/transfer-players-2026-merged.json', 'r') as f:
+        with open(input_path, 'r') as f:
             players = json.load(f)
     except FileNotFoundError:
         print("Error: Could not find transfer-players-2026-merged.json")
@@ -127,7 +130,6 @@ def main():
               f"{result['ppg']:<6.1f} {result['two_p']:<10} {result['three_p']:<10} {result['ft']:<10}")
     
     # Save results to a file
-    output_file = 'scripts/ppg_results.json'
     try:
         with open(output_file, 'w') as f:
             json.dump(results, f, indent=2)
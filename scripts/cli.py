@@ -0,0 +1,363 @@
+#!/usr/bin/env python
+"""
+cli.py – single entry point for the PortalFit pipeline scripts
+
+Usage:
+    python scripts/cli.py [--timings] <command> [options]
+
+Commands:
+    aggregate        run the three pillars and write the merged players JSON
+    fit-score        recompute fitScore in a merged JSON and sort by it
+    ppg              print / save points-per-game for the merged JSON
+    add-ppg          add a `ppg` field to every player in a JSON file
+    summarize        generate Illini fit summaries (OpenAI)
+    diff             change set between the new scrape and the previous one
+    feed             publish the merged JSON as a versioned patch feed (manifest + per-version patches)
+    plot-fit         histogram + statistics of fit scores (--batch: per-slice reports)
+    inspect          streaming field profile of JSON / JSONL files (default: merged JSON)
+    memory           memory use of the pipeline inputs, full vs compact
+    similar-teams    team-seasons most similar in style to TEAM in YEAR
+    players-like     portal players statistically closest to PLAYER
+    bootstrap        percentile bands for every pillar score
+    style-sweep      N_PCS × MIN_FEAT_COVERAGE sweep from one SVD (variance + ranking stability)
+    need-sweep       FEAT_WEIGHTS × URGENCY_POWER × MIN_MIN_PCT sweep from one distance tensor
+    reweight         re-aggregate cached score components with new weights (milliseconds)
+    portfolio        best k-transfer class by need coverage + fit (position constraints)
+    snapshot         publish a merged JSON as a memory-mapped snapshot / show the current one
+    history          append season files to the player history store / show a player's seasons
+    check            reference vs fast-path equivalence (scores, top-K τ, explanations, speedup)
+
+- Run from the project root, like the individual scripts.
+- Heavy libraries (pandas, sklearn, matplotlib, openai) are imported only by
+  the command that needs them; --timings prints where start-up time went.
+"""
+import argparse
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+
+_T0 = time.perf_counter()
+_IMPORTS = []                                   # (module, seconds)
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+for sub in ("model", "utils", "."):
+    p = str(SCRIPTS_DIR / sub)
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+
+def _load(name: str):
+    """Import `name` on first use and record how long it took."""
+    if name in sys.modules:
+        return sys.modules[name]
+    t = time.perf_counter()
+    mod = importlib.import_module(name)
+    _IMPORTS.append((name, time.perf_counter() - t))
+    return mod
+
+
+# ---------------------------------------------------------------------------
+# Command handlers
+# ---------------------------------------------------------------------------
+def cmd_aggregate(a):
+    _load("aggregate_player_data").main(year=a.year, data_dir=a.data_dir, output_fp=a.out,
+                                        parallel=a.parallel, snapshot_dir=a.snapshot,
+                                        timings=a.timings)
+
+
+def cmd_fit_score(a):
+    _load("calc_fit_score").main(a.path)
+
+
+def cmd_ppg(a):
+    _load("calculate_ppg").main(a.path, a.out)
+
+
+def cmd_add_ppg(a):
+    _load("simple_ppg").main(a.path)
+
+
+def cmd_summarize(a):
+    _load("summarize_players").main(a.args)
+
+
+def cmd_diff(a):
+    _load("snapshot_diff").main(a.args)
+
+
+def cmd_feed(a):
+    _load("delta_feed").main(a.args)
+
+
+def cmd_plot_fit(a):
+    plot = _load("plot_fit_score_distribution")
+    if a.batch:
+        plot.batch_report(a.path, a.batch, a.jobs, a.min_count, a.force)
+    else:
+        plot.main(a.path)
+
+
+def cmd_inspect(a):
+    _load("profile_schema").main(a.args)
+
+
+def cmd_memory(a):
+    print(_load("compact").input_report(a.year, a.data_dir).to_string(index=False))
+
+
+def cmd_similar_teams(a):
+    sf = _load("style_fit")
+    years = {y: Path(a.data_dir) / f"team-data-{y}.json" for y in range(a.year - 3, a.year + 1)}
+    sim = sf.StyleSimilarity.from_files(years, cache=a.cache)      # rebuilt only when inputs change
+    for team, yr, s in sim.most_similar(a.team, a.season or a.year, k=a.k):
+        print(f"{team} {yr}: {s:.3f}")
+
+
+def cmd_players_like(a):
+    ps = _load("player_similarity")
+    index = ps.PlayerIndex.from_dir(a.data_dir, through=a.year + 1)     # every portal season on disk
+    print(index.query(a.player, k=a.k, buckets=a.bucket).to_string(index=False))
+
+
+def cmd_bootstrap(a):
+    bs = _load("bootstrap")
+    ctx = bs.BootstrapContext(a.year, data_dir=a.data_dir)
+    bands = bs.bootstrap_scores(ctx, n_replicates=a.n, n_jobs=a.jobs)
+    print(bands.head(a.top).to_string(index=False))
+
+
+def cmd_style_sweep(a):
+    sweep = _load("style_sweep")
+    report, _, _ = sweep.sweep_from_files(a.year, a.data_dir,
+                                          n_pcs=range(a.pcs[0], a.pcs[1] + 1),
+                                          coverages=range(a.coverage[0], a.coverage[1] + 1),
+                                          top_k=a.top_k)
+    print(report.to_string(index=False))
+    if a.out:
+        report.to_csv(a.out, index=False)
+
+
+def cmd_need_sweep(a):
+    nsw = _load("need_sweep")
+    t = time.perf_counter()
+    report = nsw.sweep_from_files(a.year, a.data_dir, min_pcts=a.min_pcts,
+                                  weights=nsw.weight_grid(a.step) if a.step else None,
+                                  urgency_powers=a.powers, top_k=a.top_k)
+    print(report.sort_values("tau", ascending=False).head(a.top).to_string(index=False))
+    print(f"\n{len(report)} settings in {time.perf_counter() - t:.2f}s", file=sys.stderr)
+    if a.out:
+        report.to_csv(a.out, index=False)
+
+
+def _weights(pairs):
+    return {k: float(v) for k, v in (p.split("=", 1) for p in pairs)} if pairs else None
+
+
+def cmd_reweight(a):
+    comp = _load("components")
+    table = comp.ComponentTable.from_files(a.year, a.data_dir, cache=a.cache)
+    t = time.perf_counter()
+    ranked = table.reaggregate(quality_weights=_weights(a.quality), feat_weights=_weights(a.feat),
+                               urgency_power=a.urgency_power, fit_weights=_weights(a.fit))
+    print(ranked.head(a.top).to_string(index=False))
+    print(f"\nre-aggregated in {1000 * (time.perf_counter() - t):.1f} ms", file=sys.stderr)
+
+
+def _counts(pairs):
+    return {k: int(v) for k, v in (p.split("=", 1) for p in pairs)} if pairs else None
+
+
+def cmd_portfolio(a):
+    comp, pf = _load("components"), _load("portfolio")
+    selector = pf.PortfolioSelector(comp.ComponentTable.from_files(a.year, a.data_dir, cache=a.cache),
+                                    alpha=a.alpha)
+    t = time.perf_counter()
+    picks = selector.select(k=a.k, min_by_bucket=_counts(a.min), max_by_bucket=_counts(a.max),
+                            exclude=a.exclude or (), exact=a.exact, pool=a.pool)
+    print(picks.to_string(index=False))
+    print(f"\nvalue {picks.attrs['value']:.4f} (need coverage {picks.attrs['coverage']:.4f}) "
+          f"in {1000 * (time.perf_counter() - t):.1f} ms", file=sys.stderr)
+
+
+def cmd_snapshot(a):
+    snap = _load("snapshot")
+    if a.path:
+        with open(a.path) as f:
+            print(f"published v{snap.publish(json.load(f), a.root, source=Path(a.path).name)}")
+    reader = snap.ScoreSnapshot(a.root)
+    print(f"v{reader.version}: {len(reader)} players, {len(reader.kinds)} columns ({reader.header['source']})")
+    for rec in reader.top(a.top):
+        print(f"{rec.get('fitScore')!s:>4}  {rec.get('player')} ({rec.get('team')})")
+
+
+def cmd_history(a):
+    store = _load("player_history").PlayerHistory(a.store)
+    for fp in a.ingest or []:
+        print(f"{fp}: +{store.ingest(fp)} rows")
+    if a.player:
+        pid = store.player_id(a.player)
+        print(store.history([pid], last=a.last).to_string(index=False))
+
+
+def cmd_check(a):
+    _load("equivalence").main(a.args)
+
+
+# ---------------------------------------------------------------------------
+# Argument parsing
+# ---------------------------------------------------------------------------
+PASSTHROUGH = {"summarize", "diff", "feed", "inspect", "check"}  # remaining args go to the script's own parser
+MERGED_DEFAULT = "data/transfer-players-2026-merged.json"
+PUBLIC_DEFAULT = "frontend/public/transfer-players-2026-merged.json"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="PortalFit pipeline commands.")
+    parser.add_argument("--timings", action="store_true", help="Print a start-up / import time report to stderr")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add(name, fn, help_):
+        # pass-through commands leave --help to the wrapped script
+        p = sub.add_parser(name, help=help_, add_help=name not in PASSTHROUGH)
+        p.set_defaults(fn=fn)
+        return p
+
+    def data_opts(p):
+        p.add_argument("--year", type=int, default=2025, help="Season of team/roster data (default: 2025)")
+        p.add_argument("--data-dir", default="data", help="Input directory (default: data)")
+
+    p = add("aggregate", cmd_aggregate, "Run all pillars and write the merged JSON")
+    data_opts(p)
+    p.add_argument("--out", help="Output path (default: <data-dir>/transfer-players-<year+1>-merged.json)")
+    p.add_argument("--parallel", action="store_true", help="Run the three pillars in worker processes")
+    p.add_argument("--snapshot", metavar="DIR", help="Also publish a memory-mapped snapshot to DIR")
+
+    p = add("fit-score", cmd_fit_score, "Recompute and sort by fitScore")
+    p.add_argument("path", nargs="?", default=MERGED_DEFAULT)
+
+    p = add("ppg", cmd_ppg, "Points per game report")
+    p.add_argument("path", nargs="?", default=PUBLIC_DEFAULT)
+    p.add_argument("--out", default="scripts/ppg_results.json")
+
+    p = add("add-ppg", cmd_add_ppg, "Add ppg to every player in-place")
+    p.add_argument("path")
+
+    p = add("summarize", cmd_summarize, "Generate fit summaries (args passed through)")
+    p.add_argument("args", nargs=argparse.REMAINDER)
+
+    p = add("diff", cmd_diff, "Change set vs the previous scrape (args passed through)")
+    p.add_argument("args", nargs=argparse.REMAINDER)
+
+    p = add("feed", cmd_feed, "Versioned patch feed for the dashboard JSON (args passed through)")
+    p.add_argument("args", nargs=argparse.REMAINDER)
+
+    p = add("plot-fit", cmd_plot_fit, "Fit score distribution")
+    p.add_argument("path", nargs="?", default=MERGED_DEFAULT)
+    p.add_argument("--batch", metavar="OUT_DIR", help="Headless per-slice charts + stats.csv")
+    p.add_argument("--jobs", type=int)
+    p.add_argument("--min-count", type=int, default=5)
+    p.add_argument("--force", action="store_true")
+
+    p = add("inspect", cmd_inspect, "Per-field profile of JSON / JSONL files (args passed through)")
+    p.add_argument("args", nargs=argparse.REMAINDER)
+
+    p = add("memory", cmd_memory, "Memory use of the inputs, full vs compact")
+    data_opts(p)
+
+    p = add("similar-teams", cmd_similar_teams, "Team-seasons most similar in style")
+    data_opts(p)
+    p.add_argument("team")
+    p.add_argument("season", nargs="?", type=int, help="Season of TEAM (default: --year)")
+    p.add_argument("-k", type=int, default=10)
+    p.add_argument("--cache", help="Similarity matrix cache (.npz, default: <data-dir>/style-similarity.npz)")
+
+    p = add("players-like", cmd_players_like, "Portal players closest to PLAYER")
+    data_opts(p)
+    p.add_argument("player")
+    p.add_argument("-k", type=int, default=10)
+    p.add_argument("--bucket", action="append", help="Restrict to position bucket (repeatable)")
+
+    p = add("bootstrap", cmd_bootstrap, "Percentile bands for the pillar scores")
+    data_opts(p)
+    p.add_argument("-n", type=int, default=500, help="Replicates (default: 500)")
+    p.add_argument("--jobs", type=int, help="Worker processes (default: all cores)")
+    p.add_argument("--top", type=int, default=50)
+
+    p = add("style-sweep", cmd_style_sweep, "Sweep N_PCS and MIN_FEAT_COVERAGE")
+    data_opts(p)
+    p.add_argument("--pcs", type=int, nargs=2, default=[2, 12], metavar=("MIN", "MAX"))
+    p.add_argument("--coverage", type=int, nargs=2, default=[12, 17], metavar=("MIN", "MAX"))
+    p.add_argument("--top-k", type=int, default=50)
+    p.add_argument("--out", help="Also write the report as CSV")
+
+    p = add("need-sweep", cmd_need_sweep, "Sweep the Team-Need weights, urgency power and minutes threshold")
+    data_opts(p)
+    p.add_argument("--step", type=float, help="Feature-weight simplex grid step, e.g. 0.1 (default: current weights only)")
+    p.add_argument("--powers", type=float, nargs="+", default=[0.25, 0.5, 0.75, 1.0])
+    p.add_argument("--min-pcts", type=float, nargs="+", default=[5.0, 10.0, 15.0])
+    p.add_argument("--top-k", type=int, default=50)
+    p.add_argument("--top", type=int, default=50, help="Rows printed (default: 50)")
+    p.add_argument("--out", help="Also write the full report as CSV")
+
+    p = add("reweight", cmd_reweight, "Re-score with new weights from the component cache")
+    data_opts(p)
+    p.add_argument("--quality", nargs="+", metavar="K=W", help="Rep / Prod / Comp weights, e.g. Rep=0.4 Prod=0.4 Comp=0.2")
+    p.add_argument("--feat", nargs="+", metavar="F=W", help="All need feature weights, e.g. heightIn=0.3 bpm=0.3 ...")
+    p.add_argument("--fit", nargs="+", metavar="P=W", help="Pillar weights: quality= style= need=")
+    p.add_argument("--urgency-power", type=float, default=0.5)
+    p.add_argument("--cache", help="Component cache (default: <data-dir>/components-<year+1>.npz)")
+    p.add_argument("--top", type=int, default=50)
+
+    p = add("portfolio", cmd_portfolio, "Best transfer class under scholarship / position constraints")
+    data_opts(p)
+    p.add_argument("-k", type=int, default=4, help="Scholarships available (default: 4)")
+    p.add_argument("--min", nargs="+", metavar="B=N", help="Position bucket minimums, e.g. C=1 PG=1")
+    p.add_argument("--max", nargs="+", metavar="B=N", help="Position bucket maximums")
+    p.add_argument("--exclude", action="append", metavar="PLAYER", help="Skip this player (repeatable)")
+    p.add_argument("--alpha", type=float, default=0.5, help="Weight of fitScore vs need coverage (default: 0.5)")
+    p.add_argument("--exact", action="store_true", help="Branch & bound over the top --pool candidates")
+    p.add_argument("--pool", type=int, default=25)
+    p.add_argument("--cache", help="Component cache (default: <data-dir>/components-<year+1>.npz)")
+
+    p = add("snapshot", cmd_snapshot, "Publish / show the memory-mapped score snapshot")
+    p.add_argument("path", nargs="?", help="Merged JSON to publish (omit to show the current version)")
+    p.add_argument("--root", default="data/serving", help="Snapshot directory (default: data/serving)")
+    p.add_argument("--top", type=int, default=10)
+
+    p = add("history", cmd_history, "Player history store: ingest seasons / show a player")
+    p.add_argument("player", nargs="?")
+    p.add_argument("--store", default="data/history", help="Store directory (default: data/history)")
+    p.add_argument("--ingest", action="append", metavar="PATH", help="Append a transfer-players file (repeatable)")
+    p.add_argument("--last", type=int, default=5, help="Seasons shown (default: 5)")
+
+    p = add("check", cmd_check, "Equivalence of fast paths vs reference (args passed through)")
+    p.add_argument("args", nargs=argparse.REMAINDER)
+    return parser
+
+
+def report_timings(t_ready: float, t_done: float):
+    print(f"\n[timings] cli ready        {1000 * (t_ready - _T0):8.1f} ms", file=sys.stderr)
+    for name, sec in _IMPORTS:
+        print(f"[timings] import {name:<16}{1000 * sec:8.1f} ms", file=sys.stderr)
+    print(f"[timings] total            {1000 * (t_done - _T0):8.1f} ms", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    if args.command in PASSTHROUGH:
+        args.args = extra + args.args
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    t_ready = time.perf_counter()
+    try:
+        args.fn(args)
+    finally:
+        if args.timings:
+            report_timings(t_ready, time.perf_counter())
+
+
+if __name__ == "__main__":
+    main()
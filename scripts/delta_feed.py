@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+"""
+delta_feed.py – versioned patch feed for the dashboard's merged player JSON
+
+Usage:
+    python scripts/delta_feed.py [merged.json] [--feed-dir frontend/public/feed] [--keep 48]
+
+- Diffs the merged players against the last published version (kept as
+  <feed-dir>/snapshot.json), keyed by (player, team) like snapshot_diff.
+- When something changed, bumps the version and writes
+    patch-<version>.json   added records, removed keys, field-level set / unset
+    snapshot.json          {"version", "players"} – the full fallback
+    manifest.json          current version, oldest reachable version, patch list
+  in that order, each atomically, so a manifest never names a missing file.
+- Patches are upserts: applying one to data that already contains it is a
+  no-op, so a client that raced a refresh can still apply it safely.
+- Client: holding version N, fetch manifest; if N == version, done; if
+  N >= minVersion and the listed patches N→M total fewer bytes than the
+  snapshot, apply them in order; otherwise fetch snapshot.json.
+- If snapshot.json does not hold the manifest's version (lost or written
+  by another run), no patch is cut: the feed restarts at the new version
+  and every client falls back to the full snapshot.
+- Keys must be unique; a repeated (player, team) is rejected rather than
+  letting patches silently drop one of the records.
+- Only the newest --keep patches are kept. Standard library only.
+"""
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from snapshot_diff import _same, index_records, key_fn
+
+KEY_FIELDS = ("player", "team")
+KEEP = 48                        # one portal-window day of hourly refreshes
+DEFAULT_JSON_PATH = "frontend/public/transfer-players-2026-merged.json"
+DEFAULT_FEED_DIR = "frontend/public/feed"
+
+player_key = key_fn(KEY_FIELDS)
+
+
+def _write_json(path: Path, obj: Any):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path) -> Optional[Any]:
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _patch_name(version: int) -> str:
+    return f"patch-{version:06d}.json"
+
+
+# ---------------------------------------------------------------------------
+# Patches
+# ---------------------------------------------------------------------------
+def make_patch(old: List[Dict], new: List[Dict], base: int) -> Dict[str, Any]:
+    """Field-level change set taking `old` (version `base`) to `new`."""
+    old_ix, new_ix = index_records(old, player_key), index_records(new, player_key)
+    changed = []
+    for k, rec in new_ix.items():
+        prev = old_ix.get(k)
+        if prev is None:
+            continue
+        put = {f: v for f, v in rec.items() if f not in prev or not _same(prev[f], v)}
+        drop = [f for f in prev if f not in rec]
+        if put or drop:
+            changed.append({"key": list(k), "set": put, "unset": drop})
+    return {
+        "from": base, "to": base + 1,
+        "added": [rec for k, rec in new_ix.items() if k not in old_ix],
+        "removed": [list(k) for k in old_ix if k not in new_ix],
+        "changed": changed,
+    }
+
+
+def duplicate_keys(records: List[Dict]) -> List[tuple]:
+    seen, dup = set(), []
+    for rec in records:
+        k = player_key(rec)
+        if k in seen and k not in dup:
+            dup.append(k)
+        seen.add(k)
+    return dup
+
+
+def is_empty(patch: Dict[str, Any]) -> bool:
+    return not (patch["added"] or patch["removed"] or patch["changed"])
+
+
+def apply_patch(records: List[Dict], patch: Dict[str, Any]) -> List[Dict]:
+    """Reference client: returns a new list; order kept, added records last."""
+    removed = {tuple(k) for k in patch["removed"]}
+    changes = {tuple(c["key"]): c for c in patch["changed"]}
+    added = {player_key(r): r for r in patch["added"]}
+    out = []
+    for rec in records:
+        k = player_key(rec)
+        if k in removed or k in added:
+            continue
+        if k in changes:
+            rec = {f: v for f, v in rec.items() if f not in changes[k]["unset"]}
+            rec.update(changes[k]["set"])
+        out.append(rec)
+    return out + list(added.values())
+
+
+def plan(manifest: Dict[str, Any], have: int) -> Optional[List[str]]:
+    """Patch files taking version `have` to the manifest's version, [] if
+    current, or None when the full snapshot is cheaper / required."""
+    if have == manifest["version"]:
+        return []
+    if have < manifest["minVersion"] or have > manifest["version"]:
+        return None
+    chain = [p for p in manifest["patches"] if p["from"] >= have]
+    if sum(p["bytes"] for p in chain) >= manifest["snapshotBytes"]:
+        return None
+    return [p["file"] for p in chain]
+
+
+# ---------------------------------------------------------------------------
+# Publishing
+# ---------------------------------------------------------------------------
+def publish(records: List[Dict], feed_dir: Path, keep: int = KEEP) -> Dict[str, Any]:
+    """Add a version for `records` if they differ from the last one; returns the manifest."""
+    dup = duplicate_keys(records)
+    if dup:
+        raise ValueError(f"duplicate {'/'.join(KEY_FIELDS)} keys: {dup[:5]}{' …' if len(dup) > 5 else ''}")
+    feed_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _read_json(feed_dir / "manifest.json") or {"version": 0, "minVersion": 0, "patches": []}
+    last = _read_json(feed_dir / "snapshot.json") or {"version": 0, "players": []}
+    version = manifest["version"]
+    in_sync = version > 0 and last["version"] == version
+    if not in_sync:
+        manifest["patches"] = []                 # no chain reaches the new version → snapshot only
+
+    patch = make_patch(last["players"], records, version) if in_sync else None
+    if patch is not None and is_empty(patch):
+        return manifest
+
+    version += 1
+    entry = None
+    if patch is not None:
+        _write_json(feed_dir / _patch_name(version), patch)
+        entry = {"from": patch["from"], "to": version, "file": _patch_name(version),
+                 "bytes": (feed_dir / _patch_name(version)).stat().st_size,
+                 "counts": {p: len(patch[p]) for p in ("added", "removed", "changed")}}
+    _write_json(feed_dir / "snapshot.json", {"version": version, "players": records})
+
+    patches = (manifest["patches"] + ([entry] if entry else []))[-keep:] if keep else []
+    manifest = {
+        "version": version,
+        "minVersion": patches[0]["from"] if patches else version,
+        "key": list(KEY_FIELDS),
+        "snapshot": "snapshot.json",
+        "snapshotBytes": (feed_dir / "snapshot.json").stat().st_size,
+        "patches": patches,
+        "updated": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    _write_json(feed_dir / "manifest.json", manifest)
+
+    live = {p["file"] for p in patches}
+    for old in feed_dir.glob("patch-*.json"):
+        if old.name not in live:
+            old.unlink(missing_ok=True)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish a versioned patch feed for the merged player JSON.")
+    parser.add_argument("json_path", nargs="?", default=DEFAULT_JSON_PATH,
+                        help=f"Merged players JSON (default: {DEFAULT_JSON_PATH})")
+    parser.add_argument("--feed-dir", default=DEFAULT_FEED_DIR, help=f"Output directory (default: {DEFAULT_FEED_DIR})")
+    parser.add_argument("--keep", type=int, default=KEEP, help=f"Patches kept (default: {KEEP})")
+    args = parser.parse_args(argv)
+
+    records = _read_json(Path(args.json_path))
+    if records is None:
+        parser.error(f"{args.json_path} not found")
+    before = (_read_json(Path(args.feed_dir) / "manifest.json") or {}).get("version", 0)
+    try:
+        manifest = publish(records, Path(args.feed_dir), args.keep)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if manifest["version"] == before:
+        print(f"No changes; feed stays at version {before}")
+    elif manifest["patches"] and manifest["patches"][-1]["to"] == manifest["version"]:
+        p = manifest["patches"][-1]
+        c = p["counts"]
+        print(f"Version {manifest['version']}: +{c['added']} -{c['removed']} ~{c['changed']} "
+              f"({p['bytes']} bytes vs {manifest['snapshotBytes']} full)")
+    else:
+        print(f"Version {manifest['version']}: full snapshot ({manifest['snapshotBytes']} bytes)")
+    return manifest
+
+
+if __name__ == "__main__":
+    main()
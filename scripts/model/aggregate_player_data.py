@@ -1,4 +1,8 @@
 import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
 import pandas as pd
 from pathlib import Path
 import numpy as np
@@ -7,10 +11,12 @@ import numpy as np
 from quality_score import score_quality
 from style_fit import concat_team_stats, StyleModel, illinois_reference, rank_transfers, FEATURES
 from team_need import score_transfers
+from compact import read_frame
+from calc_fit_score import calc_fit
 
 
 def load_247_data(path):
-    df = pd.read_json(path)
+    df = read_frame(path)
     df['name_lc'] = df['name'].str.lower()
     return df
 
@@ -28,34 +34,77 @@ def to_python_type(obj):
     else:
         return obj
 
-def calc_fit(p):
-    q = p.get("qualityScore", 0)
-    s = p.get("styleScore", 0)
-    n = p.get("needScore", 0)
-    raw = 0.34 * q + 0.33 * s + 0.33 * n
-    return int(round(raw * 99))
-
-def main():
-    year = 2025  # 2026 transfer class uses 2025 team/roster data
-    data_dir = Path('data')
-
-    # File paths
-    transfer_players_fp = data_dir / f'transfer-players-{year+1}.json'
-    team_data_fp = data_dir / f'team-data-{year}.json'
-    illinois_roster_fp = data_dir / f'illinois-roster-{year}.json'
-    transfers_247_fp = data_dir / f'transfers-247sports-{year+1}.json'
+FIELDS_247 = ['rating', 'position', 'height', 'weight', 'status', 'imageUrl', 'playerUrl']
+
+def _merge_row(row, q, s, n, d):
+    out = dict(row)
+    # Add model outputs if found
+    if q is not None:
+        out['qualityScore'] = q['qualityScore']
+        out['strengths'] = q['strengths']
+        out['weaknesses'] = q['weaknesses']
+    if s is not None:
+        out['styleScore'] = s['styleScore']
+        out['similarStats'] = s['similarStats']
+        out['dissimilarStats'] = s['dissimilarStats']
+    if n is not None:
+        out['needScore'] = n['needScore']
+        out['matchedTo'] = n['matchedTo']
+    if d is not None:
+        for f in FIELDS_247:
+            out[f'247_{f}'] = d.get(f)
+    return out
+
+def merge_pillars_loop(base_df, quality_df, style_df, need_df, df_247):
+    """Reference merge: one boolean scan of every pillar frame per player."""
+    merged = []
+    for _, row in base_df.iterrows():
+        player_lc = row['player_lc']
+        q = quality_df[quality_df['player_lc'] == player_lc]
+        s = style_df[style_df['player_lc'] == player_lc]
+        n = need_df[need_df['player_lc'] == player_lc]
+        d247 = df_247[df_247['name_lc'] == player_lc]
+        merged.append(_merge_row(row,
+                                 None if q.empty else q.iloc[0],
+                                 None if s.empty else s.iloc[0],
+                                 None if n.empty else n.iloc[0],
+                                 None if d247.empty else d247.iloc[0]))
+    return merged
+
+def merge_pillars(base_df, quality_df, style_df, need_df, df_247):
+    """Same records as merge_pillars_loop, with one hash lookup per pillar:
+    each frame is indexed by name once, keeping the first row per name."""
+    def index(df, key):
+        firsts = df[df[key].notna()].drop_duplicates(key)   # NaN never matches in the loop
+        return dict(zip(firsts[key], (r for _, r in firsts.iterrows())))
+
+    q_ix, s_ix, n_ix = index(quality_df, 'player_lc'), index(style_df, 'player_lc'), index(need_df, 'player_lc')
+    d_ix = index(df_247, 'name_lc')
+    return [_merge_row(row, q_ix.get(k), s_ix.get(k), n_ix.get(k), d_ix.get(k))
+            for k, (_, row) in zip(base_df['player_lc'], base_df.iterrows())]
+
+# --- Pillars (each takes the parsed inputs, returns its scored frame) ---
+def load_inputs(year, data_dir):
+    """Parse every input file once; the pillars work from these frames."""
+    data_dir = Path(data_dir)
+    return {
+        'year': year,
+        'players': pd.read_json(data_dir / f'transfer-players-{year+1}.json'),
+        '247': pd.read_json(data_dir / f'transfers-247sports-{year+1}.json'),
+        'roster': pd.read_json(data_dir / f'illinois-roster-{year}.json'),
+        'team_years': {y: pd.read_json(data_dir / f'team-data-{y}.json')
+                       for y in range(year-3, year+1)},
+    }
 
-    # --- Run models ---
-    # 1. Quality Score
-    quality_df = score_quality(year, data_dir)
-    quality_df['player_lc'] = quality_df['player'].str.lower()
+def run_quality(inputs):
+    year = inputs['year']
+    frames = {'players': inputs['players'], '247': inputs['247'],
+              'team': inputs['team_years'][year], 'roster': inputs['roster']}
+    return score_quality(year, inputs=frames)
 
-    # 2. Style Fit
+def run_style(inputs):
     # Need 4 years of team data for PCA
-    year_files = {
-        y: data_dir / f'team-data-{y}.json' for y in range(year-3, year+1)
-    }
-    teams_df = concat_team_stats(year_files)
+    teams_df = concat_team_stats(inputs['team_years'])
     style_model = StyleModel()
     style_model.fit(teams_df)
     illinois_mean_row = teams_df[teams_df['team'] == 'Illinois'][FEATURES].mean()
@@ -63,68 +112,142 @@ def main():
     # Patch: pass ill_ref_vec as global for rank_transfers
     import style_fit
     style_fit.ill_ref_vec = ill_ref_vec
-    style_df = rank_transfers(
+    return rank_transfers(
         teams_df,
-        transfer_players_fp,
+        inputs['players'],
         illinois_mean_row,
         style_model
     )
-    style_df['player_lc'] = style_df['player'].str.lower()
 
-    # 3. Team Need
-    need_df = score_transfers(illinois_roster_fp, transfer_players_fp)
-    need_df['player_lc'] = need_df['player'].str.lower()
+def run_need(inputs):
+    return score_transfers(inputs['roster'], inputs['players'])
+
+PILLARS = {'quality': run_quality, 'style': run_style, 'need': run_need}
+
+# --- Concurrent mode: one worker process per pillar ---
+_INPUTS = None
+
+def _unlink(blocks):
+    for name, _, _ in blocks.values():
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            continue
+        shm.close()
+        shm.unlink()
+
+def _to_shared(df):
+    """Numeric columns → shared-memory blocks (the parent copies and unlinks
+    them); only the index and the object columns (names, lists) are pickled.
+    Blocks stay registered with the parent's resource tracker until unlinked,
+    so nothing outlives the parent even if it dies first."""
+    blocks, rest = {}, {}
+    try:
+        for c, col in df.items():
+            arr = col.to_numpy()
+            if arr.dtype.kind in 'fiub':
+                shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+                blocks[c] = (shm.name, arr.dtype.str, arr.shape)
+                np.ndarray(arr.shape, arr.dtype, buffer=shm.buf)[:] = arr
+                shm.close()
+            else:
+                rest[c] = col
+    except BaseException:
+        _unlink(blocks)
+        raise
+    return {'columns': list(df.columns), 'index': df.index.to_numpy(),
+            'blocks': blocks, 'rest': pd.DataFrame(rest, index=df.index)}
+
+def _from_shared(payload):
+    cols = {}
+    for c, (name, dtype, shape) in payload['blocks'].items():
+        shm = shared_memory.SharedMemory(name=name)
+        cols[c] = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf).copy()
+        shm.close()
+    df = payload['rest'].assign(**cols)
+    return df[payload['columns']].set_axis(payload['index'])
+
+def _init_worker(inputs):
+    global _INPUTS
+    _INPUTS = inputs
+
+def _run_pillar(name):
+    t = time.perf_counter()
+    out = PILLARS[name](_INPUTS)
+    return _to_shared(out), time.perf_counter() - t
+
+def run_pillars(inputs, parallel=False, timings=False):
+    """{pillar: scored frame}; with `parallel`, every pillar runs in its own
+    worker process (inputs inherited on fork, results via shared memory).
+    `timings` prints per-pillar and wall time."""
+    if not parallel:
+        return {name: fn(inputs) for name, fn in PILLARS.items()}
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    # workers must share the parent's tracker: one started inside a worker
+    # would unlink that worker's blocks as soon as it exits
+    resource_tracker.ensure_running()
+    t = time.perf_counter()
+    payloads, took, error = {}, {}, None
+    try:
+        with ProcessPoolExecutor(len(PILLARS), mp_context=ctx,
+                                 initializer=_init_worker, initargs=(inputs,)) as ex:
+            futures = {name: ex.submit(_run_pillar, name) for name in PILLARS}
+            for name, fut in futures.items():          # wait for all before cleaning up
+                try:
+                    payloads[name], took[name] = fut.result()
+                except BaseException as e:
+                    error = error or e
+        if error is not None:
+            raise error
+        results = {name: _from_shared(p) for name, p in payloads.items()}
+    finally:
+        for p in payloads.values():
+            _unlink(p['blocks'])
+    if timings:
+        wall = time.perf_counter() - t
+        print('Pillars: ' + ', '.join(f'{k} {v:.2f}s' for k, v in took.items()) + f' | wall {wall:.2f}s')
+    return results
+
+def main(year=2025, data_dir='data', output_fp=None, parallel=False, snapshot_dir=None, timings=False):
+    # year 2025 → 2026 transfer class uses 2025 team/roster data
+    data_dir = Path(data_dir)
+
+    # --- Run models ---
+    # 1. Quality Score  2. Style Fit  3. Team Need
+    inputs = load_inputs(year, data_dir)
+    pillars = run_pillars(inputs, parallel=parallel, timings=timings)
+    quality_df, style_df, need_df = pillars['quality'], pillars['style'], pillars['need']
+    for df in (quality_df, style_df, need_df):
+        df['player_lc'] = df['player'].str.lower()
 
     # 4. 247 Sports
-    df_247 = load_247_data(transfers_247_fp)
+    df_247 = load_247_data(inputs['247'])
 
     # 5. Transfer Players (base data)
-    base_df = pd.read_json(transfer_players_fp)
+    base_df = inputs['players'].copy()
     base_df['player_lc'] = base_df['player'].str.lower()
 
     # --- Merge all data ---
-    merged = []
-    for _, row in base_df.iterrows():
-        player_lc = row['player_lc']
-        out = dict(row)
-        # Merge model outputs
-        q = quality_df[quality_df['player_lc'] == player_lc]
-        s = style_df[style_df['player_lc'] == player_lc]
-        n = need_df[need_df['player_lc'] == player_lc]
-        d247 = df_247[df_247['name_lc'] == player_lc]
-        # Add model outputs if found
-        if not q.empty:
-            out['qualityScore'] = q.iloc[0]['qualityScore']
-            out['strengths'] = q.iloc[0]['strengths']
-            out['weaknesses'] = q.iloc[0]['weaknesses']
-        if not s.empty:
-            out['styleScore'] = s.iloc[0]['styleScore']
-            out['similarStats'] = s.iloc[0]['similarStats']
-            out['dissimilarStats'] = s.iloc[0]['dissimilarStats']
-        if not n.empty:
-            out['needScore'] = n.iloc[0]['needScore']
-            out['matchedTo'] = n.iloc[0]['matchedTo']
-        if not d247.empty:
-            d = d247.iloc[0]
-            out['247_rating'] = d.get('rating')
-            out['247_position'] = d.get('position')
-            out['247_height'] = d.get('height')
-            out['247_weight'] = d.get('weight')
-            out['247_status'] = d.get('status')
-            out['247_imageUrl'] = d.get('imageUrl')
-            out['247_playerUrl'] = d.get('playerUrl')
-        merged.append(out)
+    merged = merge_pillars(base_df, quality_df, style_df, need_df, df_247)
 
     # Add fitScore to each player
     for out in merged:
         out["fitScore"] = calc_fit(out)
 
     # --- Output JSON ---
-    output_fp = data_dir / f'transfer-players-2026-merged.json'
+    output_fp = output_fp or data_dir / f'transfer-players-{year+1}-merged.json'
     merged_py = [to_python_type(x) for x in merged]
     with open(output_fp, 'w') as f:
         json.dump(merged_py, f, indent=2)
     print(f"Wrote merged player data to {output_fp}")
 
+    # Memory-mapped snapshot for the serving processes
+    if snapshot_dir:
+        import snapshot
+        version = snapshot.publish(merged_py, snapshot_dir, source=Path(output_fp).name)
+        print(f"Published snapshot v{version} to {snapshot_dir}")
+
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    import sys
+    main(parallel='--parallel' in sys.argv, timings='--timings' in sys.argv) 
\ No newline at end of file
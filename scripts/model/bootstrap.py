@@ -0,0 +1,179 @@
+# bootstrap.py  – Uncertainty bands for the Fit-Score pillars
+# -------------------------------------------------------------
+#   • Perturbation bootstrap: each replicate jitters the inputs
+#       – player stats (bpm, ortg, usg, efg) with noise that grows
+#         as minutes shrink  → Quality + Need
+#       – origin team style features, one draw per team-season
+#         shared by all its transfers                → Style
+#   • Every replicate is rescored with the batched paths
+#     (production_matrix, StyleModel.vectors, NeedScenarios) and
+#     renormalised like the pipeline (÷ max)
+#   • Replicates are split across a process pool
+#   • Output: point score + percentile interval per player
+# -------------------------------------------------------------
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import quality_score as qs
+import style_fit as sf
+from calc_fit_score import FIT_WEIGHTS
+from team_need import FEATURES as NEED_FEATURES, NeedScenarios
+
+N_REPLICATES  = 500
+JITTER        = 0.15     # noise σ as a share of the pool σ for a full-time player
+FULL_MIN_PCT  = 60.0     # at / above this minutes share noise stops shrinking
+MIN_PCT_FLOOR = 5.0      # below this, noise stops growing
+JITTER_STATS  = ["bpm", "ortg", "usg", "efg"]
+PILLARS       = ["quality", "style", "need", "fit"]
+
+
+# ------------------------------------------------------------------------
+# 1.  Fixed inputs (built once, shipped to every worker)
+# ------------------------------------------------------------------------
+class BootstrapContext:
+    def __init__(self, year: int = 2025, data_dir: str | Path = "data"):
+        data_dir   = Path(data_dir)
+        players_fp = data_dir / f"transfer-players-{year + 1}.json"
+        roster_fp  = data_dir / f"illinois-roster-{year}.json"
+
+        players = pd.read_json(players_fp)
+        players["year"] = year
+        self.players = players[["player", "team", "role"]].reset_index(drop=True)
+        n = len(players)
+
+        # Quality: Rep and Comp do not depend on the jittered stats
+        df_247  = pd.read_json(data_dir / f"transfers-247sports-{year + 1}.json")
+        df_team = pd.read_json(data_dir / f"team-data-{year}.json")
+        self.rep  = qs.build_reputation(players, df_247).fillna(0).to_numpy()
+        self.comp = qs.competition_strength(players, df_team).fillna(0).to_numpy()
+        self.buckets = players["role"].apply(qs.map_role).to_numpy()
+
+        # Need: cached departures / candidate z-scores
+        self.need = NeedScenarios(roster_fp, players_fp)
+        self.need_X = self.need.transfers[NEED_FEATURES].to_numpy(dtype=float)
+        self.keep = self.need.keep
+
+        # Stats to jitter, aligned with the players file
+        self.stats = players[JITTER_STATS].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        minutes = pd.to_numeric(players["minPct"], errors="coerce").fillna(MIN_PCT_FLOOR)
+        scale = np.sqrt(FULL_MIN_PCT / minutes.clip(MIN_PCT_FLOOR, FULL_MIN_PCT)).to_numpy()
+        self.stat_sd = JITTER * np.nanstd(self.stats, axis=0, ddof=1) * scale[:, None]
+
+        # Style: origin-team rows exactly as rank_transfers merges them
+        year_files = {y: data_dir / f"team-data-{y}.json" for y in range(year - 3, year + 1)}
+        teams_df = sf.concat_team_stats(year_files)
+        self.model = sf.StyleModel()
+        self.model.fit(teams_df)
+        self.ill_ref = sf.illinois_reference(teams_df, self.model)
+        merged = players.assign(origYear=year).merge(
+            teams_df, how="left", left_on=["team", "origYear"],
+            right_on=["team", "year"], suffixes=("", "_team"))
+        self.style_X = merged[sf.FEATURES].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        self.style_sd = JITTER * np.nanstd(teams_df[sf.FEATURES].to_numpy(dtype=float), axis=0, ddof=1)
+        # one perturbation per origin team-season, broadcast to its rows
+        self.style_group, teams = pd.factorize(merged["team"])
+        self.n_style_groups = len(teams)
+        if len(self.style_X) != n:
+            raise ValueError("duplicate team-season rows in team data")
+
+    # ---------------------------------------------------------------------
+    def score(self, stats: np.ndarray, style_X: np.ndarray) -> np.ndarray:
+        """All pillars for one set of inputs → (4, n_players), pipeline-normalised."""
+        col = {s: stats[:, i] for i, s in enumerate(JITTER_STATS)}
+
+        prod = qs.production_matrix(col["bpm"], col["ortg"], col["usg"], self.buckets)
+        q_raw = (qs.WEIGHTS["Rep"] * self.rep +
+                 qs.WEIGHTS["Prod"] * np.nan_to_num(prod) +
+                 qs.WEIGHTS["Comp"] * self.comp)
+        quality = q_raw / (q_raw.max() or 1.0)
+
+        V = self.model.vectors(pd.DataFrame(style_X, columns=sf.FEATURES))
+        cos = V @ self.ill_ref / (np.linalg.norm(V, axis=1) * np.linalg.norm(self.ill_ref))
+        s_raw = np.nan_to_num(sf.to_0_1(cos))
+        style = s_raw / (s_raw[self.keep].max() or 1.0)
+
+        need_X = self.need_X.copy()
+        for i, s in enumerate(JITTER_STATS):
+            if s in NEED_FEATURES:
+                need_X[:, NEED_FEATURES.index(s)] = stats[:, i]
+        need = self.need.evaluate_many([self.need.baseline], self.need.similarity(need_X))[0][0]
+
+        # Illinois players carry no style / need score in the merged output
+        style = np.where(self.keep, style, np.nan)
+        need  = np.where(self.keep, need, np.nan)
+        fit = 99 * (FIT_WEIGHTS["quality"] * quality +
+                    FIT_WEIGHTS["style"] * np.nan_to_num(style) +
+                    FIT_WEIGHTS["need"] * np.nan_to_num(need))
+        return np.stack([quality, style, need, fit])
+
+    def replicates(self, n: int, seed) -> np.ndarray:
+        """(n, 4, n_players) jittered replicates, float32."""
+        rng = np.random.default_rng(seed)
+        out = np.empty((n, len(PILLARS), len(self.players)), dtype=np.float32)
+        for r in range(n):
+            stats = self.stats + rng.standard_normal(self.stats.shape) * self.stat_sd
+            noise = rng.standard_normal((self.n_style_groups, self.style_X.shape[1]))
+            style_X = self.style_X + noise[self.style_group] * self.style_sd
+            out[r] = self.score(stats, style_X)
+        return out
+
+
+# ------------------------------------------------------------------------
+# 2.  Process-pool driver
+# ------------------------------------------------------------------------
+_CTX: Optional[BootstrapContext] = None
+
+def _init_worker(ctx: BootstrapContext):
+    global _CTX
+    _CTX = ctx
+
+def _run_chunk(args: Tuple[int, np.random.SeedSequence]) -> np.ndarray:
+    n, seed = args
+    return _CTX.replicates(n, seed)
+
+
+def bootstrap_scores(ctx: BootstrapContext,
+                     n_replicates: int = N_REPLICATES,
+                     interval: Tuple[float, float] = (5, 95),
+                     n_jobs: Optional[int] = None,
+                     seed: int = 0) -> pd.DataFrame:
+    """Point scores plus percentile bands for every player and pillar."""
+    n_jobs = n_jobs or os.cpu_count() or 1
+    n_chunks = min(n_jobs, n_replicates)
+    sizes = [len(c) for c in np.array_split(np.arange(n_replicates), n_chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+
+    if n_jobs == 1:
+        reps = [ctx.replicates(sizes[0], seeds[0])]
+    else:
+        with ProcessPoolExecutor(n_jobs, initializer=_init_worker, initargs=(ctx,)) as ex:
+            reps = list(ex.map(_run_chunk, zip(sizes, seeds)))
+    reps = np.concatenate(reps)
+
+    point = ctx.score(ctx.stats, ctx.style_X)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)   # Illinois: no style / need
+        lo, hi = np.nanpercentile(reps, interval, axis=0)
+
+    out = ctx.players.copy()
+    for i, p in enumerate(PILLARS):
+        out[f"{p}Score"] = point[i]
+        out[f"{p}Lo"] = lo[i]
+        out[f"{p}Hi"] = hi[i]
+    out["fitScore"] = np.round(point[PILLARS.index("fit")]).astype(int)   # as calc_fit rounds it
+    return out.sort_values("fitScore", ascending=False)
+
+
+# ------------------------------------------------------------------------
+# 3.  Example driver
+# ------------------------------------------------------------------------
+if __name__ == "__main__":
+    ctx = BootstrapContext(2025, data_dir="data")
+    bands = bootstrap_scores(ctx, n_replicates=N_REPLICATES)
+    print(bands.head(50).to_string(index=False))
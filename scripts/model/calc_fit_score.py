@@ -8,23 +8,23 @@ import json
 # Hard-coded path to the merged players JSON file
 FILE_PATH = "data/transfer-players-2026-merged.json"
 
-# Weights must sum to 1
-WEIGHTS = {"quality": 0.34, "style": 0.33, "need": 0.33}
+# Weights must sum to 1 – the one definition, imported by the other modules
+FIT_WEIGHTS = {"quality": 0.34, "style": 0.33, "need": 0.33}
 
 def calc_fit(p):
     """0‑1 composite, then scale to 0‑99 integer."""
     q = p.get("qualityScore", 0)
     s = p.get("styleScore",   0)
     n = p.get("needScore",    0)
-    raw = (WEIGHTS["quality"] * q +
-           WEIGHTS["style"]   * s +
-           WEIGHTS["need"]    * n)
+    raw = (FIT_WEIGHTS["quality"] * q +
+           FIT_WEIGHTS["style"]   * s +
+           FIT_WEIGHTS["need"]    * n)
     return int(round(raw * 99))
 
 
-def main():
+def main(file_path=FILE_PATH):
     # Load players data
-    with open(FILE_PATH, 'r') as f:
+    with open(file_path, 'r') as f:
         players = json.load(f)
 
     # Calculate fitScore for each player
@@ -35,10 +35,10 @@ def main():
     players_sorted = sorted(players, key=lambda x: x['fitScore'], reverse=True)
 
     # Write updated data back to the JSON file
-    with open(FILE_PATH, 'w') as f:
+    with open(file_path, 'w') as f:
         json.dump(players_sorted, f, indent=2)
 
-    print(f"Updated '{FILE_PATH}' with {len(players_sorted)} players sorted by fitScore.")
+    print(f"Updated '{file_path}' with {len(players_sorted)} players sorted by fitScore.")
 
 
 if __name__ == "__main__":
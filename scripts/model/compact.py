@@ -0,0 +1,119 @@
+# compact.py  – Low-memory representation of player / team frames
+# -------------------------------------------------------------
+#   • float64 stats        → float32, except EXACT_COLS: the stats
+#     the strengths / weaknesses deltas rank on stay float64 so the
+#     explanation lists keep their tie order
+#   • int64 counts         → smallest integer type
+#   • repeated strings     → categoricals (team, conf, role, class …)
+#   • "made-att" strings   → <col>Made / <col>Att nullable ints
+#   • memory_report() lists deep memory use per frame
+# -------------------------------------------------------------
+from pathlib import Path
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+SHOOTING_COLS = ["dunks", "close2", "far2", "ft", "twoP", "threeP"]
+MAX_CAT_RATIO = 0.5        # categorise if unique values ≤ 50 % of rows
+EXACT_COLS    = ["bpm", "ortg", "usg", "efg", "ts",     # quality_score.CORE_STATS,
+                 "twoPPct", "threePPct", "twopPct", "threepPct"]  # both spellings
+
+
+def split_made_att(df: pd.DataFrame, cols: Iterable[str] = SHOOTING_COLS,
+                   drop: bool = True) -> pd.DataFrame:
+    """Parse "124-227" style columns into <col>Made / <col>Att (Int16/Int32)."""
+    out = {}
+    for c in cols:
+        if c not in df:
+            continue
+        parts = df[c].astype("string").str.split("-", n=1, expand=True).reindex(columns=[0, 1])
+        for j, suffix in enumerate(["Made", "Att"]):
+            vals = pd.to_numeric(parts[j], errors="coerce")
+            dtype = "Int16" if vals.max(skipna=True) < np.iinfo(np.int16).max else "Int32"
+            out[f"{c}{suffix}"] = vals.round().astype(dtype)
+    df = df.assign(**out)
+    return df.drop(columns=[c for c in cols if c in df]) if drop else df
+
+
+def _compact_strings(s: pd.Series, max_cat_ratio: float, float_dtype=np.float32) -> pd.Series:
+    try:
+        n_unique = s.nunique(dropna=True)
+    except TypeError:                  # lists / dicts → leave alone
+        return s
+    # numbers scraped as text (roster file) → float32
+    num = pd.to_numeric(s, errors="coerce")
+    if num.notna().sum() == s.notna().sum() and s.notna().any():
+        return num.astype(float_dtype)
+    return s.astype("category") if n_unique <= max_cat_ratio * len(s) else s
+
+
+def compact_frame(df: pd.DataFrame, max_cat_ratio: float = MAX_CAT_RATIO,
+                  parse_shooting: bool = True, exact: Iterable[str] = EXACT_COLS) -> pd.DataFrame:
+    """Return a compact copy of `df` (the input is left untouched); columns
+    in `exact` keep float64."""
+    if parse_shooting:
+        df = split_made_att(df)
+    exact = set(exact)
+    out = {}
+    for c, s in df.items():
+        float_dtype = np.float64 if c in exact else np.float32
+        if pd.api.types.is_bool_dtype(s):
+            out[c] = s
+        elif pd.api.types.is_float_dtype(s):
+            out[c] = s.astype(float_dtype)
+        elif pd.api.types.is_integer_dtype(s):
+            out[c] = pd.to_numeric(s, downcast="integer")
+        elif pd.api.types.is_object_dtype(s) or pd.api.types.is_string_dtype(s):
+            out[c] = _compact_strings(s, max_cat_ratio, float_dtype)
+        else:
+            out[c] = s
+    return pd.DataFrame(out, index=df.index)
+
+
+def read_json_compact(path: str | Path, **kw) -> pd.DataFrame:
+    return compact_frame(pd.read_json(path), **kw)
+
+
+def read_frame(src: str | Path | pd.DataFrame, compact: bool = False,
+               copy: bool = True) -> pd.DataFrame:
+    """Path → parsed JSON; an already-parsed frame → a private copy, or with
+    copy=False a shallow view sharing its data (callers that only read it)."""
+    if isinstance(src, pd.DataFrame):
+        if compact:
+            return compact_frame(src)
+        return src.copy() if copy else src.copy(deep=False)
+    return read_json_compact(src) if compact else pd.read_json(src)
+
+
+def memory_report(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Deep memory usage per frame."""
+    rows = []
+    for name, df in frames.items():
+        b = int(df.memory_usage(deep=True).sum())
+        rows.append({"frame": name, "rows": len(df), "cols": df.shape[1],
+                     "MB": b / 2**20, "bytes/row": b / max(len(df), 1)})
+    return pd.DataFrame(rows)
+
+
+def input_report(year: int = 2025, data_dir: str | Path = "data") -> pd.DataFrame:
+    """Memory of the pipeline input files, full vs compact representation."""
+    data_dir = Path(data_dir)
+    paths = {
+        "transfers":   data_dir / f"transfer-players-{year + 1}.json",
+        "247sports":   data_dir / f"transfers-247sports-{year + 1}.json",
+        "team-data":   data_dir / f"team-data-{year}.json",
+        "ill-roster":  data_dir / f"illinois-roster-{year}.json",
+    }
+    full = {k: pd.read_json(p) for k, p in paths.items() if p.exists()}
+    small = {k: compact_frame(df) for k, df in full.items()}
+    report = memory_report(full).merge(memory_report(small), on="frame",
+                                       suffixes=("", "_compact"))
+    return report[["frame", "rows", "MB", "MB_compact"]]
+
+
+# ------------------------------------------------------------------------
+# Example driver
+# ------------------------------------------------------------------------
+if __name__ == "__main__":
+    print(input_report(2025, "data").to_string(index=False))
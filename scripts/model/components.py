@@ -0,0 +1,180 @@
+# components.py  – Cached raw score components + instant re-weighting
+# -------------------------------------------------------------
+#   • Built once per season from the pipeline inputs:
+#       – Quality   Rep, Prod, Comp                     (per player)
+#       – Style     raw cosine to the Illinois reference (per player)
+#       – Need      |Δz| per (transfer × departure candidate × feature)
+#                   + urgency inputs (importance, buckets, baseline)
+#   • Saved as one .npz next to the data, keyed by the SHA-1 of the
+#     input files and of the model source (code + constants) → reused
+#     until a scrape or the model changes
+#   • reaggregate() applies new Rep/Prod/Comp weights, need feature
+#     weights, urgency power and pillar weights, with the pipeline's
+#     normalisation (÷ max), in one vectorised pass
+# -------------------------------------------------------------
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+import compact
+import quality_score as qs
+import style_fit as sf
+import team_need as tn
+from calc_fit_score import FIT_WEIGHTS
+
+_ARRAYS = ["Rep", "Prod", "Comp", "styleCos", "keep", "D", "importance", "cand_onehot",
+           "cand_names", "tr_b", "same_bucket", "baseline", "player", "team", "role"]
+
+
+def _input_paths(year: int, data_dir: Path) -> Dict[str, Path]:
+    return {
+        "players": data_dir / f"transfer-players-{year + 1}.json",
+        "247":     data_dir / f"transfers-247sports-{year + 1}.json",
+        "roster":  data_dir / f"illinois-roster-{year}.json",
+        **{f"team-{y}": data_dir / f"team-data-{y}.json" for y in range(year - 3, year + 1)},
+    }
+
+
+def _fingerprint(paths: Dict[str, Path]) -> str:
+    h = hashlib.sha1()
+    for name, p in sorted(paths.items()):
+        h.update(name.encode())
+        h.update(p.read_bytes())
+    for mod in (compact, qs, sf, tn):
+        h.update(Path(mod.__file__).read_bytes())
+    h.update(Path(__file__).read_bytes())
+    return h.hexdigest()
+
+
+class ComponentTable:
+    """Raw, un-normalised pillar components for one season's transfer class."""
+    def __init__(self, arrays: Dict[str, np.ndarray], fingerprint: str = ""):
+        for k in _ARRAYS:
+            setattr(self, k, arrays[k])
+        self.fingerprint = fingerprint
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, year: int = 2025, data_dir: str | Path = "data") -> "ComponentTable":
+        data_dir = Path(data_dir)
+        paths = _input_paths(year, data_dir)
+        players = pd.read_json(paths["players"])
+        players["year"] = year
+
+        # Quality components, exactly as score_quality joins them
+        df_247  = pd.read_json(paths["247"])
+        df_team = pd.read_json(data_dir / f"team-data-{year}.json")
+        rep  = qs.build_reputation(players, df_247).reindex(players.index)
+        prod = qs.production_index(players)
+        comp = qs.competition_strength(players, df_team)
+
+        # Style: raw cosine of the origin team-season (rank_transfers merge)
+        year_files = {y: data_dir / f"team-data-{y}.json" for y in range(year - 3, year + 1)}
+        teams_df = sf.concat_team_stats(year_files)
+        model = sf.StyleModel()
+        model.fit(teams_df)
+        ill_ref = sf.illinois_reference(teams_df, model)
+        merged = players.assign(origYear=year).merge(
+            teams_df, how="left", left_on=["team", "origYear"],
+            right_on=["team", "year"], suffixes=("", "_team"))
+        if len(merged) != len(players):
+            raise ValueError("duplicate team-season rows in team data")
+        V = model.vectors(merged)
+        cos = V @ ill_ref / (np.linalg.norm(V, axis=1) * np.linalg.norm(ill_ref))
+
+        # Need: per-feature distances to every possible departure
+        ns = tn.NeedScenarios(paths["roster"], paths["players"])
+        names = ns.candidates["name"].to_numpy(dtype=str)
+
+        return cls({
+            "Rep": rep.to_numpy(dtype=float), "Prod": prod.to_numpy(dtype=float),
+            "Comp": comp.to_numpy(dtype=float), "styleCos": cos,
+            "keep": ns.keep,
+            "D": ns.distances(ns.transfers[tn.FEATURES].to_numpy(dtype=float)),
+            "importance": ns.candidates["importance"].to_numpy(dtype=float),
+            "cand_onehot": ns.cand_onehot, "cand_names": names,
+            "tr_b": ns.tr_b, "same_bucket": ns.same_bucket,
+            "baseline": np.isin(names, list(ns.baseline)),
+            "player": players["player"].to_numpy(dtype=str),
+            "team": players["team"].to_numpy(dtype=str),
+            "role": players["role"].fillna("").to_numpy(dtype=str),
+        }, _fingerprint(paths))
+
+    def save(self, path: str | Path):
+        with open(path, "wb") as f:
+            np.savez(f, fingerprint=np.array(self.fingerprint),
+                     **{k: getattr(self, k) for k in _ARRAYS})
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ComponentTable":
+        with np.load(path, allow_pickle=False) as z:
+            return cls({k: z[k] for k in _ARRAYS}, str(z["fingerprint"]))
+
+    @classmethod
+    def from_files(cls, year: int = 2025, data_dir: str | Path = "data",
+                   cache: Optional[str | Path] = None) -> "ComponentTable":
+        """Load the cached table if the inputs are unchanged, else rebuild it."""
+        data_dir = Path(data_dir)
+        cache = Path(cache) if cache else data_dir / f"components-{year + 1}.npz"
+        if cache.exists():
+            table = cls.load(cache)
+            if table.fingerprint == _fingerprint(_input_paths(year, data_dir)):
+                return table
+        table = cls.build(year, data_dir)
+        table.save(cache)
+        return table
+
+    # ------------------------------------------------------------------
+    def reaggregate(self,
+                    quality_weights: Optional[Dict[str, float]] = None,
+                    feat_weights: Optional[Dict[str, float]] = None,
+                    urgency_power: float = tn.URGENCY_POWER,
+                    fit_weights: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """All pillar scores + fitScore for new weights; unspecified weights
+        default to the module constants. Sorted by fitScore."""
+        qw = qs.WEIGHTS if quality_weights is None else quality_weights
+        fw = FIT_WEIGHTS if fit_weights is None else fit_weights
+
+        q_raw = (qw["Rep"] * np.nan_to_num(self.Rep) + qw["Prod"] * np.nan_to_num(self.Prod) +
+                 qw["Comp"] * np.nan_to_num(self.Comp))
+        quality = q_raw / (q_raw.max() or 1.0)
+
+        s_raw = np.nan_to_num(sf.to_0_1(self.styleCos))
+        style = s_raw / (s_raw[self.keep].max() or 1.0)
+
+        if len(self.cand_names):
+            sim = tn.NeedScenarios.similarity_from(self.D, feat_weights)
+            need, matched = tn.aggregate_need(self.baseline[None, :], sim, self.importance,
+                                              self.cand_onehot, self.cand_names.astype(object),
+                                              self.tr_b, self.same_bucket, self.keep, urgency_power)
+            need, matched = need[0], matched[0]
+        else:
+            need, matched = np.zeros(len(self.keep)), np.full(len(self.keep), None, dtype=object)
+
+        # Illinois players carry no style / need score (→ 0 in the fit)
+        style = np.where(self.keep, style, np.nan)
+        need  = np.where(self.keep, need, np.nan)
+        fit = np.round(99 * (fw["quality"] * quality + fw["style"] * np.nan_to_num(style) +
+                             fw["need"] * np.nan_to_num(need))).astype(int)
+
+        out = pd.DataFrame({"player": self.player, "team": self.team, "role": self.role,
+                            "qualityScore": quality, "styleScore": style, "needScore": need,
+                            "matchedTo": np.where(self.keep, matched, None), "fitScore": fit})
+        return out.sort_values("fitScore", ascending=False, kind="stable")
+
+
+# ------------------------------------------------------------------------
+# Example driver
+# ------------------------------------------------------------------------
+if __name__ == "__main__":
+    import time
+
+    table = ComponentTable.from_files(2025, "data")
+    t = time.perf_counter()
+    ranked = table.reaggregate(quality_weights={"Rep": 0.4, "Prod": 0.4, "Comp": 0.2},
+                               urgency_power=0.75)
+    print(f"re-aggregated {len(ranked)} players in {1000 * (time.perf_counter() - t):.1f} ms")
+    print(ranked.head(25).to_string(index=False))
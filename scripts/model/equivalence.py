@@ -0,0 +1,695 @@
+# equivalence.py  – Golden-output checks for the fast scoring paths
+# -------------------------------------------------------------
+#   • Runs each reference implementation and its fast path on the
+#     same inputs (data/ files for one season, or --synthetic: a small
+#     seeded data set written to a temp dir)
+#   • Compares
+#       – per-player scores          max |Δ| ≤ tolerance
+#       – top-K rank agreement       Kendall τ + overlap of the top K
+#       – explanation lists          exact, or differing only in ties
+#       – incremental                add_player + rescore vs one seed
+#       – end to end                 merged JSON vs the first-commit
+#                                    pipeline run from `git archive`
+#   • Reports best-of-N wall time for both sides and the speedup
+#   • Exit status 1 if any case fails  → usable as a pre-merge gate
+# -------------------------------------------------------------
+import argparse
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import types
+from functools import cached_property
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.stats import kendalltau
+
+import quality_score as qs
+import style_fit as sf
+import team_need as tn
+import aggregate_player_data as agg
+import incremental as inc
+import need_sweep as nsw
+
+SCORE_TOL = 1e-9
+MIN_TAU   = 0.999
+TOP_K     = 50
+REPEAT    = 3
+
+
+# ------------------------------------------------------------------------
+# 1.  Comparison helpers
+# ------------------------------------------------------------------------
+def compare_scores(ref, fast, tol: float = SCORE_TOL, k: int = TOP_K) -> Dict:
+    """Aligned score arrays → max |Δ|, Kendall τ on the reference top K and
+    the share of the reference top K that is also the fast top K."""
+    ref, fast = np.asarray(ref, dtype=float), np.asarray(fast, dtype=float)
+    both_nan = np.isnan(ref) & np.isnan(fast)
+    diff = np.where(both_nan, 0.0, np.abs(ref - fast))
+    max_diff = float(np.nanmax(diff, initial=0.0)) if not np.isnan(diff).any() else np.inf
+
+    r, f = np.nan_to_num(ref, nan=-np.inf), np.nan_to_num(fast, nan=-np.inf)
+    k = min(k, len(ref))
+    top_r = np.argsort(-r, kind="stable")[:k]
+    top_f = np.argsort(-f, kind="stable")[:k]
+    if k < 2 or np.array_equal(r[top_r], f[top_r]):
+        tau = 1.0
+    else:
+        tau = kendalltau(r[top_r], f[top_r]).statistic
+        tau = 0.0 if np.isnan(tau) else float(tau)
+    overlap = len(set(top_r) & set(top_f)) / k if k else 1.0
+    return {"n": len(ref), "maxAbsDiff": max_diff, "tau": tau, "topKOverlap": overlap,
+            "scoresOk": max_diff <= tol and tau >= MIN_TAU}
+
+
+def compare_lists(ref: List[List[str]], fast: List[List[str]],
+                  value: Optional[Callable[[int, str], float]] = None) -> Dict:
+    """Row-wise list equality. With `value(row, name)`, a mismatch where both
+    lists carry the same values in the same order is a tie-order difference."""
+    exact = ties = 0
+    for i, (a, b) in enumerate(zip(ref, fast)):
+        a, b = list(a), list(b)
+        if a == b:
+            exact += 1
+        elif value is not None and len(a) == len(b) and \
+                np.allclose([value(i, x) for x in a], [value(i, x) for x in b], equal_nan=True):
+            ties += 1
+    n = len(ref)
+    return {"n": n, "listsExact": exact / n if n else 1.0, "tieOnly": ties,
+            "listsOk": len(fast) == n and exact + ties == n}
+
+
+def _records_equal(a: Dict, b: Dict) -> bool:
+    if a.keys() != b.keys():
+        return False
+    for k in a:
+        x, y = a[k], b[k]
+        if isinstance(x, float) and isinstance(y, float) and np.isnan(x) and np.isnan(y):
+            continue
+        if isinstance(x, (list, np.ndarray)) or isinstance(y, (list, np.ndarray)):
+            if list(x) != list(y):
+                return False
+        elif x != y:
+            return False
+    return True
+
+
+def _best_time(fn: Callable, repeat: int):
+    best, out = np.inf, None
+    for _ in range(max(repeat, 1)):
+        t = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t)
+    return out, best
+
+
+# ------------------------------------------------------------------------
+# 2.  Shared inputs (each built on first use)
+# ------------------------------------------------------------------------
+MODEL_DIR = Path(__file__).resolve().parent
+_BASELINES: Dict[tuple, types.ModuleType] = {}
+
+
+def baseline_rev() -> str:
+    """The repository's first commit: the pipeline before any fast path."""
+    out = subprocess.run(["git", "rev-list", "--max-parents=0", "HEAD"], cwd=MODEL_DIR,
+                         capture_output=True, text=True, check=True)
+    return out.stdout.split()[-1]
+
+
+def baseline_module(name: str, rev: Optional[str] = None) -> types.ModuleType:
+    """scripts/model/<name>.py as of `rev`, imported under a private name
+    (only for modules whose imports are third-party)."""
+    rev = rev or baseline_rev()
+    if (name, rev) not in _BASELINES:
+        rel = (MODEL_DIR / f"{name}.py").relative_to(_git_root()).as_posix()
+        src = subprocess.run(["git", "show", f"{rev}:{rel}"], cwd=MODEL_DIR,
+                             capture_output=True, text=True, check=True).stdout
+        mod = types.ModuleType(f"_baseline_{name}")
+        exec(compile(src, f"{rev}:{rel}", "exec"), mod.__dict__)
+        _BASELINES[name, rev] = mod
+    return _BASELINES[name, rev]
+
+
+def _git_root() -> Path:
+    out = subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=MODEL_DIR,
+                         capture_output=True, text=True, check=True)
+    return Path(out.stdout.strip())
+
+
+def baseline_tree(dest: str | Path, rev: Optional[str] = None) -> Path:
+    """Extract scripts/model as of `rev` under `dest`; returns its directory."""
+    root = _git_root()
+    rel = MODEL_DIR.relative_to(root).as_posix()
+    tar = subprocess.run(["git", "archive", "--format=tar", rev or baseline_rev(), rel],
+                         cwd=root, capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(tar)) as tf:
+        tf.extractall(dest, filter="data")
+    return Path(dest) / rel
+
+
+# ------------------------------------------------------------------------
+# Synthetic season: every file the pipeline reads, small and seeded
+# ------------------------------------------------------------------------
+ROLES = ["Pure PG", "Scoring PG", "Combo G", "Wing G", "Wing F", "Stretch 4", "PF/C", "C"]
+CONFS = ["B10", "B12", "ACC", "SEC", "BE", "MWC", "WCC", "A10"]
+
+
+def _height(rng, n):
+    inches = rng.integers(72, 85, n)
+    return [f"{h // 12}-{h % 12}" for h in inches]
+
+
+def synthetic_data(data_dir: str | Path, year: int = 2025, n_players: int = 120,
+                   n_teams: int = 40, seed: int = 0) -> Path:
+    """Write transfer / 247 / roster / four team-data files for `year`."""
+    rng = np.random.default_rng(seed)
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    teams = ["Illinois"] + [f"Team {i}" for i in range(1, n_teams)]
+    team_conf = {t: CONFS[i % len(CONFS)] for i, t in enumerate(teams)}
+
+    def dump(name, records):
+        with open(data_dir / name, "w") as f:
+            json.dump(records, f)
+
+    means = {"adjT": 59.6, "rawT": 54.3, "threePRate": 32.4, "threePRateD": 22.0, "twoPPct": 38.0,
+             "twoPPctD": 31.4, "astPct": 55.3, "opAstPct": 24.7, "tovPct": 36.0, "tovPctD": 42.5,
+             "oRebPct": 64.0, "opORebPct": 37.4, "blkPct": 23.4, "blkedPct": 54.2, "ftRate": 45.1,
+             "ftRateD": 21.4, "effHgt": 65.0}
+    for y in range(year - 3, year + 1):
+        rows = []
+        for t in teams:
+            row = {"team": t, "barthag": float(rng.uniform(0.05, 0.98)), "year": y}
+            row.update({f: round(float(m * rng.normal(1, 0.11)), 1) for f, m in means.items()})
+            if rng.random() < 0.05:
+                row[rng.choice(list(means))] = None
+            rows.append(row)
+        dump(f"team-data-{y}.json", rows)
+
+    names = [f"Player {i}" for i in range(n_players)]
+    names[-1] = names[0]                                  # one repeated name, as in real portals
+    players = []
+    for i, name in enumerate(names):
+        made2, att2 = int(rng.integers(20, 160)), int(rng.integers(160, 300))
+        made3, att3 = int(rng.integers(0, 60)), int(rng.integers(60, 180))
+        made1, att1 = int(rng.integers(10, 90)), int(rng.integers(90, 140))
+        team = teams[1 + i % (n_teams - 1)] if i % 25 else "Illinois"
+        players.append({
+            "rk": i + 1, "pick": "-", "player": name, "playerClass": str(rng.choice(["Fr", "So", "Jr", "Sr"])),
+            "height": _height(rng, 1)[0], "recruitRank": round(float(rng.uniform(0, 99)), 1),
+            "team": team, "conf": team_conf[team], "g": int(rng.integers(10, 36)),
+            "role": str(rng.choice(ROLES)), "minPct": round(float(rng.uniform(10, 95)), 1),
+            "prpg": round(float(rng.normal(2.4, 0.8)), 1), "dPrpg": round(float(rng.normal(2.4, 0.8)), 1),
+            "bpm": round(float(rng.normal(2.1, 3.0)), 1), "obpm": round(float(rng.normal(2.0, 2.0)), 1),
+            "dbpm": round(float(rng.normal(0.1, 1.8)), 1), "ortg": round(float(rng.normal(112, 12)), 1),
+            "drtg": round(float(rng.normal(106, 7)), 1), "usg": round(float(rng.normal(22.5, 4.7)), 1),
+            "efg": round(float(rng.normal(53.9, 8)), 1), "ts": round(float(rng.normal(57.3, 7)), 1),
+            "or": round(float(rng.uniform(0, 15)), 1), "dr": round(float(rng.uniform(5, 25)), 1),
+            "ast": round(float(rng.uniform(2, 35)), 1), "to": round(float(rng.uniform(8, 22)), 1),
+            "aTo": round(float(rng.uniform(0.3, 3)), 1), "blk": round(float(rng.uniform(0, 8)), 1),
+            "stl": round(float(rng.uniform(0.5, 4)), 1), "ftr": round(float(rng.uniform(10, 70)), 1),
+            "fc40": round(float(rng.uniform(1, 6)), 1), "dunks": "5-5", "dunksPct": 1.0,
+            "close2": f"{made2}-{att2}", "close2Pct": round(made2 / att2, 3), "far2": "20-60",
+            "far2Pct": 0.333, "ft": f"{made1}-{att1}", "ftPct": round(made1 / att1, 3),
+            "twoP": f"{made2}-{att2}", "twoPPct": round(made2 / att2, 3),
+            "threePr": round(float(rng.uniform(0, 70)), 1), "threeP100": round(float(rng.uniform(0, 15)), 1),
+            "threeP": f"{made3}-{att3}", "threePPct": round(made3 / att3, 3),
+        })
+    dump(f"transfer-players-{year + 1}.json", players)
+
+    rated = rng.choice(n_players - 1, n_players // 2, replace=False)
+    dump(f"transfers-247sports-{year + 1}.json", [
+        {"name": names[i], "rating": round(float(rng.uniform(0.8, 0.97)), 4),
+         "position": str(rng.choice(["PG", "SG", "CG", "SF", "PF", "C"])), "height": _height(rng, 1)[0],
+         "weight": int(rng.integers(170, 260)), "status": str(rng.choice(["Committed", "Enrolled", ""])),
+         "imageUrl": "", "playerUrl": ""} for i in sorted(rated)])
+
+    dump(f"illinois-roster-{year}.json", [
+        {"name": f"Illini {i}", "role": ROLES[i % len(ROLES)], "height": _height(rng, 1)[0],
+         "minPct": round(float(rng.uniform(4, 80)), 1), "bpm": round(float(rng.normal(2, 3)), 1),
+         "ortg": round(float(rng.normal(108, 10)), 1), "usg": round(float(rng.normal(19, 5)), 1),
+         "efg": round(float(rng.normal(52, 5)), 1), "ts": round(float(rng.normal(54, 4)), 1),
+         "twopPct": round(float(rng.uniform(0.4, 0.6)), 3), "threepPct": round(float(rng.uniform(0.29, 0.4)), 3),
+         "leftAfterSeason": bool(i % 2 == 0)} for i in range(14)])
+    return data_dir
+
+
+class Fixture:
+    def __init__(self, year: int = 2025, data_dir: str | Path = "data"):
+        self.year = year
+        self.data_dir = Path(data_dir)
+        self.players_fp = self.data_dir / f"transfer-players-{year + 1}.json"
+        self.roster_fp  = self.data_dir / f"illinois-roster-{year}.json"
+        self.rating_fp  = self.data_dir / f"transfers-247sports-{year + 1}.json"
+        self.year_files = {y: self.data_dir / f"team-data-{y}.json" for y in range(year - 3, year + 1)}
+
+    @cached_property
+    def players(self) -> pd.DataFrame:
+        df = pd.read_json(self.players_fp)
+        df["year"] = self.year
+        return df.rename(columns={"twoPPct": "twopPct", "threePPct": "threepPct"})
+
+    @cached_property
+    def ill_pos_means(self) -> Dict[str, pd.Series]:
+        ill = pd.read_json(self.roster_fp).rename(columns={"twoPPct": "twopPct", "threePPct": "threepPct"})
+        ill[qs.CORE_STATS] = ill[qs.CORE_STATS].apply(pd.to_numeric, errors="coerce")
+        ill["posBucket"] = ill["role"].apply(qs.map_role)
+        means = {pos: grp[qs.CORE_STATS].mean() for pos, grp in ill.groupby("posBucket")}
+        means["ALL"] = ill[qs.CORE_STATS].mean()
+        return means
+
+    @cached_property
+    def df_247(self) -> pd.DataFrame:
+        return pd.read_json(self.rating_fp)
+
+    @cached_property
+    def df_team(self) -> pd.DataFrame:
+        return pd.read_json(self.year_files[self.year])
+
+    @cached_property
+    def teams_df(self) -> pd.DataFrame:
+        return sf.concat_team_stats(self.year_files)
+
+    @cached_property
+    def model(self) -> sf.StyleModel:
+        model = sf.StyleModel()
+        model.fit(self.teams_df)
+        return model
+
+    @cached_property
+    def ill_mean_row(self) -> pd.Series:
+        return self.teams_df[self.teams_df["team"] == "Illinois"][sf.FEATURES].mean()
+
+    @cached_property
+    def style_rows(self) -> pd.DataFrame:
+        """Transfers joined to their origin team-season, as rank_transfers does."""
+        tr = pd.read_json(self.players_fp).assign(year=self.year, origYear=self.year)
+        return tr.merge(self.teams_df, how="left", left_on=["team", "origYear"],
+                        right_on=["team", "year"], suffixes=("", "_team"))
+
+    @cached_property
+    def pillars(self):
+        """Pillar outputs and base frame exactly as aggregate_player_data.main builds them."""
+        quality_df = qs.score_quality(self.year, self.data_dir)
+        sf.ill_ref_vec = sf.illinois_reference(self.teams_df, self.model)
+        style_df = sf.rank_transfers(self.teams_df, self.players_fp, self.ill_mean_row, self.model)
+        need_df = tn.score_transfers(self.roster_fp, self.players_fp)
+        for df in (quality_df, style_df, need_df):
+            df["player_lc"] = df["player"].str.lower()
+        base_df = pd.read_json(self.players_fp)
+        base_df["player_lc"] = base_df["player"].str.lower()
+        return base_df, quality_df, style_df, need_df, agg.load_247_data(self.rating_fp)
+
+
+# ------------------------------------------------------------------------
+# 3.  Cases: reference vs fast path
+# ------------------------------------------------------------------------
+def _style_scores(model: sf.StyleModel, df: pd.DataFrame, ill_ref: np.ndarray) -> np.ndarray:
+    V = model.vectors(df)
+    return sf.to_0_1(V @ ill_ref / (np.linalg.norm(V, axis=1) * np.linalg.norm(ill_ref)))
+
+
+# The row-loop quality components as first committed are the golden reference:
+# they are loaded from git history, not copied here.
+def _reputation_loop(df_players: pd.DataFrame, df_247: pd.DataFrame) -> np.ndarray:
+    """Baseline merge on the first 247 rating per name: the one intended
+    change (a repeated name used to duplicate the player row)."""
+    dedup = df_247[~df_247["name"].str.lower().duplicated()]
+    return baseline_module("quality_score").build_reputation(df_players.copy(), dedup).to_numpy()
+
+
+def _production_loop(df_players: pd.DataFrame) -> np.ndarray:
+    return baseline_module("quality_score").production_index(df_players.copy()).to_numpy()
+
+
+def _competition_loop(df_players: pd.DataFrame, df_team: pd.DataFrame) -> np.ndarray:
+    return baseline_module("quality_score").competition_strength(df_players, df_team).to_numpy()
+
+
+def _quality_parts(players, df_247, df_team) -> np.ndarray:
+    return np.column_stack([qs.build_reputation(players, df_247), qs.production_index(players),
+                            qs.competition_strength(players, df_team)])
+
+
+def case_quality_components(fx: Fixture, repeat: int):
+    df, r247, team = fx.players, fx.df_247, fx.df_team
+    columns = list(df.columns)
+    ref, t_ref = _best_time(lambda: np.column_stack([_reputation_loop(df, r247), _production_loop(df),
+                                                     _competition_loop(df, team)]), repeat)
+    fast, t_fast = _best_time(lambda: _quality_parts(df, r247, team), repeat)
+    w = np.array([qs.WEIGHTS["Rep"], qs.WEIGHTS["Prod"], qs.WEIGHTS["Comp"]])
+    out = compare_scores(np.nan_to_num(ref) @ w, np.nan_to_num(fast) @ w)
+    out["scoresOk"] &= all(compare_scores(ref[:, j], fast[:, j])["scoresOk"] for j in range(3))
+    out["inputUnchanged"] = list(df.columns) == columns           # no helper columns left behind
+    return out, t_ref, t_fast
+
+
+def case_quality_multi_season(fx: Fixture, repeat: int):
+    """Per-season reference calls vs one call on the stacked seasons."""
+    seasons = [fx.year - 1, fx.year]
+    team = pd.concat([fx.df_team.assign(year=y) for y in seasons], ignore_index=True)
+    stacked = pd.concat([fx.players.assign(year=y) for y in seasons], ignore_index=True)
+
+    def ref_fn():
+        return np.vstack([_quality_parts(stacked[stacked["year"] == y].reset_index(drop=True),
+                                         fx.df_247, team[team["year"] == y]) for y in seasons])
+
+    ref, t_ref = _best_time(ref_fn, repeat)
+    fast, t_fast = _best_time(lambda: _quality_parts(stacked, fx.df_247, team), repeat)
+    return compare_scores(np.nan_to_num(ref).sum(axis=1), np.nan_to_num(fast).sum(axis=1)), t_ref, t_fast
+
+
+def _sw_delta(df: pd.DataFrame, means: Dict[str, pd.Series]) -> Callable[[int, str], float]:
+    """|stat − Illinois positional mean| for row i: the strengths/weaknesses sort key."""
+    def delta(i, stat):
+        pos = qs.map_role(df["role"].iloc[i])
+        if pos not in means:
+            pos = "SG" if pos == "PG" and "SG" in means else "ALL"
+        return abs(pd.to_numeric(df[stat].iloc[i], errors="coerce") - means[pos][stat])
+    return delta
+
+
+def case_strengths_weaknesses(fx: Fixture, repeat: int):
+    df, means = fx.players, fx.ill_pos_means
+    ref, t_ref = _best_time(lambda: [qs.strengths_weaknesses(r, means) for _, r in df.iterrows()], repeat)
+    fast, t_fast = _best_time(lambda: qs.strengths_weaknesses_matrix(df, means), repeat)
+
+    delta = _sw_delta(df, means)
+    s = compare_lists([r[0] for r in ref], fast[0], delta)
+    w = compare_lists([r[1] for r in ref], fast[1], delta)
+    return {"n": s["n"], "listsExact": min(s["listsExact"], w["listsExact"]),
+            "tieOnly": s["tieOnly"] + w["tieOnly"], "listsOk": s["listsOk"] and w["listsOk"]}, t_ref, t_fast
+
+
+def case_explain_stats(fx: Fixture, repeat: int):
+    df, mean_row = fx.style_rows, fx.ill_mean_row
+    ref, t_ref = _best_time(lambda: [sf.explain_stats(r, mean_row) for _, r in df.iterrows()], repeat)
+    fast, t_fast = _best_time(lambda: sf.explain_stats_matrix(df, mean_row), repeat)
+
+    X = df[sf.FEATURES].to_numpy(dtype=float)
+    ref_vals = mean_row[sf.FEATURES].to_numpy(dtype=float)
+    col = {f: j for j, f in enumerate(sf.FEATURES)}
+    delta = lambda i, f: abs(X[i, col[f]] - ref_vals[col[f]])
+
+    c = compare_lists([r[0] for r in ref], fast[0], delta)
+    d = compare_lists([r[1] for r in ref], fast[1], delta)
+    return {"n": c["n"], "listsExact": min(c["listsExact"], d["listsExact"]),
+            "tieOnly": c["tieOnly"] + d["tieOnly"], "listsOk": c["listsOk"] and d["listsOk"]}, t_ref, t_fast
+
+
+def case_production(fx: Fixture, repeat: int):
+    df = fx.players
+    ref, t_ref = _best_time(lambda: qs.production_index(df).to_numpy(), repeat)
+
+    def fast_fn():
+        num = df[["bpm", "ortg", "usg"]].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        buckets = df["role"].apply(qs.map_role).to_numpy()
+        return qs.production_matrix(num[:, 0], num[:, 1], num[:, 2], buckets)
+
+    fast, t_fast = _best_time(fast_fn, repeat)
+    return compare_scores(ref, fast), t_ref, t_fast
+
+
+def case_style_vectors(fx: Fixture, repeat: int):
+    df, model = fx.style_rows, fx.model
+    ill_ref = sf.illinois_reference(fx.teams_df, model)
+
+    def ref_fn():
+        out = []
+        for _, row in df.iterrows():
+            v = model.vector(row)
+            out.append(np.nan if v is None else sf.to_0_1(sf.cosine(v, ill_ref)))
+        return np.array(out)
+
+    ref, t_ref = _best_time(ref_fn, repeat)
+    fast, t_fast = _best_time(lambda: _style_scores(model, df, ill_ref), repeat)
+    return compare_scores(ref, fast), t_ref, t_fast
+
+
+def case_style_fit_streaming(fx: Fixture, repeat: int):
+    teams = fx.teams_df
+
+    def scores(fit):
+        model = sf.StyleModel()
+        fit(model)
+        return _style_scores(model, teams, sf.illinois_reference(teams, model))
+
+    ref, t_ref = _best_time(lambda: scores(lambda m: m.fit(teams)), repeat)
+    fast, t_fast = _best_time(
+        lambda: scores(lambda m: m.fit_streaming(lambda: sf.iter_team_stats(fx.year_files))), repeat)
+    return compare_scores(ref, fast, tol=1e-6), t_ref, t_fast
+
+
+def case_need_scenarios(fx: Fixture, repeat: int):
+    ref, t_ref = _best_time(lambda: tn.score_transfers(fx.roster_fp, fx.players_fp), repeat)
+
+    def fast_fn():
+        ns = tn.NeedScenarios(fx.roster_fp, fx.players_fp)
+        return ns.evaluate(ns.baseline)
+
+    fast, t_fast = _best_time(fast_fn, repeat)
+    fast = fast.reindex(ref.index)
+    out = compare_scores(ref["needScore"], fast["needScore"])
+    out.update(compare_lists([[m] for m in ref["matchedTo"]], [[m] for m in fast["matchedTo"]]))
+    out["n"] = len(ref)
+    return out, t_ref, t_fast
+
+
+SWEEP_GRID = {"weights": [tn.FEAT_WEIGHTS, dict(zip(tn.FEATURES, [0.40, 0.10, 0.20, 0.20, 0.10]))],
+              "urgency_powers": [0.5, 1.0], "min_pcts": [5.0, 10.0]}
+
+
+def case_need_sweep(fx: Fixture, repeat: int):
+    """score_transfers once per grid point (module constants swapped) vs one sweep."""
+    g = SWEEP_GRID
+
+    def ref_fn():
+        saved = tn.FEAT_WEIGHTS, tn.URGENCY_POWER, tn.MIN_MIN_PCT
+        need, matched = [], []
+        try:
+            for w in g["weights"]:
+                for t in g["min_pcts"]:
+                    for p in g["urgency_powers"]:
+                        tn.FEAT_WEIGHTS, tn.URGENCY_POWER, tn.MIN_MIN_PCT = w, p, t
+                        df = tn.score_transfers(fx.roster_fp, fx.players_fp).sort_index()
+                        need.append(df["needScore"].to_numpy())
+                        matched.append([[m] for m in df["matchedTo"]])
+        finally:
+            tn.FEAT_WEIGHTS, tn.URGENCY_POWER, tn.MIN_MIN_PCT = saved
+        return np.concatenate(need), sum(matched, []), df.index
+
+    def fast_fn():
+        sweep = nsw.NeedSweep(fx.roster_fp, fx.players_fp, min_pcts=g["min_pcts"])
+        return sweep.run(g["weights"], g["urgency_powers"], g["min_pcts"])
+
+    (ref, ref_matched, idx), t_ref = _best_time(ref_fn, repeat)
+    (need, matched), t_fast = _best_time(fast_fn, repeat)
+    n_p = len(g["urgency_powers"])
+    fast_matched = [[m] for m in np.repeat(matched[..., idx], n_p, axis=1).reshape(-1, len(idx)).ravel()]
+    per = [compare_scores(r, f) for r, f in zip(np.split(ref, len(ref) // len(idx)),
+                                                need[..., idx].reshape(-1, len(idx)))]
+    out = {"n": len(ref), "maxAbsDiff": max(c["maxAbsDiff"] for c in per),
+           "tau": min(c["tau"] for c in per), "topKOverlap": min(c["topKOverlap"] for c in per),
+           "scoresOk": all(c["scoresOk"] for c in per)}
+    out.update(compare_lists([[None if pd.isna(m[0]) else m[0]] for m in ref_matched], fast_matched))
+    return out, t_ref, t_fast
+
+
+def case_merge(fx: Fixture, repeat: int):
+    frames = fx.pillars
+    ref, t_ref = _best_time(lambda: agg.merge_pillars_loop(*frames), repeat)
+    fast, t_fast = _best_time(lambda: agg.merge_pillars(*frames), repeat)
+
+    same = len(ref) == len(fast) and all(
+        _records_equal(agg.to_python_type(a), agg.to_python_type(b)) for a, b in zip(ref, fast))
+    out = compare_scores([agg.calc_fit(r) for r in ref], [agg.calc_fit(r) for r in fast])
+    out.update({"listsExact": 1.0 if same else 0.0, "tieOnly": 0, "listsOk": same})
+    return out, t_ref, t_fast
+
+
+def _incremental_scorer(fx: Fixture) -> inc.IncrementalScorer:
+    return inc.IncrementalScorer(fx.year, fx.df_247, fx.df_team.assign(year=fx.year),
+                                 pd.read_json(fx.roster_fp), fx.teams_df, fx.model)
+
+
+def case_incremental(fx: Fixture, repeat: int):
+    """Seed on the whole pool vs seed on part of it (some entries with stale
+    stats), add_player() the rest / the updates, then rescore(). Held-out
+    and updated players have unique names, so both sides see the same pool."""
+    records = pd.read_json(fx.players_fp).to_dict("records")
+    keys = pd.Series([str(r.get("player", "")).lower() for r in records])
+    unique = np.flatnonzero(~keys.duplicated(keep=False).to_numpy())
+    held, updated = set(unique[5::10]), set(unique[::10])
+    old = {i: dict(records[i], bpm=records[i]["bpm"] - 4.0, usg=records[i]["usg"] + 3.0) for i in updated}
+
+    def ref_fn():
+        scorer = _incremental_scorer(fx)
+        scorer.seed(records)
+        return scorer
+
+    def fast_fn():
+        scorer = _incremental_scorer(fx)
+        scorer.seed([old.get(i, r) for i, r in enumerate(records) if i not in held])
+        for i in sorted(held | updated):
+            scorer.add_player(records[i])
+        scorer.rescore()
+        return scorer
+
+    ref, t_ref = _best_time(ref_fn, repeat)
+    fast, t_fast = _best_time(fast_fn, repeat)
+    order = [fast.index[k] for k in ref.scores()["player"].str.lower()]
+    R, F = ref.scores(), fast.scores().iloc[order].reset_index(drop=True)
+    out = compare_scores(R["fitScore"], F["fitScore"], tol=0)
+    out["maxAbsDiff"] = max(out["maxAbsDiff"], *(compare_scores(R[c], F[c])["maxAbsDiff"]
+                                                   for c in ("qualityScore", "styleScore", "needScore")))
+    out["scoresOk"] &= out["maxAbsDiff"] <= SCORE_TOL
+    out.update(compare_lists([[p.get("matchedTo")] for p in ref.players],
+                             [[fast.players[i].get("matchedTo")] for i in order]))
+    out["listsOk"] &= not fast.stale()
+    out["n"] = len(R)
+    return out, t_ref, t_fast
+
+
+BASELINE_NAMES = {"players": "transfer-players-2026.json", "roster": "illinois-roster-2025.json",
+                  "247": "transfers-247sports-2026.json"}
+
+
+def _run_baseline_pipeline(fx: Fixture, model_dir: Path, work: Path) -> List[Dict]:
+    """First-commit aggregate_player_data.py in a subprocess; it hardcodes
+    data/ and 2025, so the fixture's files are linked in under those names."""
+    data = work / "data"
+    data.mkdir(parents=True, exist_ok=True)
+    links = {BASELINE_NAMES["players"]: fx.players_fp, BASELINE_NAMES["roster"]: fx.roster_fp,
+             BASELINE_NAMES["247"]: fx.rating_fp,
+             **{f"team-data-{2025 - fx.year + y}.json": fp for y, fp in fx.year_files.items()}}
+    for name, fp in links.items():
+        (data / name).unlink(missing_ok=True)
+        (data / name).symlink_to(Path(fp).resolve())
+    env = {**os.environ, "PYTHONPATH": str(model_dir)}
+    subprocess.run([sys.executable, str(model_dir / "aggregate_player_data.py")], cwd=work, env=env,
+                   capture_output=True, text=True, check=True)
+    with open(data / "transfer-players-2026-merged.json") as f:
+        return json.load(f)
+
+
+def _run_pipeline(fx: Fixture, out_fp: Path) -> List[Dict]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        agg.main(fx.year, fx.data_dir, output_fp=out_fp)
+    with open(out_fp) as f:
+        return json.load(f)
+
+
+def case_pipeline(fx: Fixture, repeat: int):
+    """score_quality → rank_transfers → score_transfers → merged fitScore,
+    end to end against the first-commit pipeline (reference time includes
+    its interpreter start-up)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        model_dir = baseline_tree(tmp / "baseline")
+        ref, t_ref = _best_time(lambda: _run_baseline_pipeline(fx, model_dir, tmp / "run"), repeat)
+        fast, t_fast = _best_time(lambda: _run_pipeline(fx, tmp / "merged.json"), repeat)
+
+    cols = ["qualityScore", "styleScore", "needScore", "fitScore"]
+    def grid(recs):
+        return np.array([[np.nan if r.get(c) is None else r[c] for c in cols] for r in recs], dtype=float)
+    R, F = grid(ref), grid(fast)
+    if len(ref) != len(fast):
+        return {"n": len(ref), "scoresOk": False, "listsOk": False}, t_ref, t_fast
+    out = compare_scores(R[:, 3], F[:, 3], tol=0)
+    out["maxAbsDiff"] = max(out["maxAbsDiff"], *(compare_scores(R[:, j], F[:, j])["maxAbsDiff"] for j in range(3)))
+    out["scoresOk"] &= out["maxAbsDiff"] <= SCORE_TOL
+
+    # explanation lists: ties may order differently, judged on the rows the
+    # pillars matched (first row with the same lower-cased name)
+    df, means = fx.players, fx.ill_pos_means
+    first = {n: i for i, n in reversed(list(enumerate(df["player"].str.lower())))}
+    rows = [first[r["player"].lower()] for r in ref]
+    sw_delta = _sw_delta(df, means)
+    X = fx.style_rows[sf.FEATURES].to_numpy(dtype=float)
+    ill = fx.ill_mean_row[sf.FEATURES].to_numpy(dtype=float)
+    col = {f: j for j, f in enumerate(sf.FEATURES)}
+    style_delta = lambda i, f: abs(X[rows[i], col[f]] - ill[col[f]])
+    checks = [compare_lists([r.get(k) or [] for r in ref], [r.get(k) or [] for r in fast], value)
+              for k, value in [("strengths", lambda i, x: sw_delta(rows[i], x)),
+                               ("weaknesses", lambda i, x: sw_delta(rows[i], x)),
+                               ("similarStats", style_delta), ("dissimilarStats", style_delta)]]
+    checks.append(compare_lists([[r.get("matchedTo")] for r in ref], [[r.get("matchedTo")] for r in fast]))
+    out.update({"listsExact": min(c["listsExact"] for c in checks),
+                "tieOnly": sum(c["tieOnly"] for c in checks),
+                "listsOk": all(c["listsOk"] for c in checks)})
+    return out, t_ref, t_fast
+
+
+CASES = {
+    "strengths-weaknesses": case_strengths_weaknesses,
+    "explain-stats":        case_explain_stats,
+    "production":           case_production,
+    "quality-components":   case_quality_components,
+    "quality-multi-season": case_quality_multi_season,
+    "style-vectors":        case_style_vectors,
+    "style-fit-streaming":  case_style_fit_streaming,
+    "need-scenarios":       case_need_scenarios,
+    "need-sweep":           case_need_sweep,
+    "merge":                case_merge,
+    "incremental":          case_incremental,
+    "pipeline":             case_pipeline,
+}
+
+
+# ------------------------------------------------------------------------
+# 4.  Runner
+# ------------------------------------------------------------------------
+def run_cases(fx: Fixture, names: Optional[List[str]] = None, repeat: int = REPEAT) -> pd.DataFrame:
+    rows = []
+    for name in names or CASES:
+        metrics, t_ref, t_fast = CASES[name](fx, repeat)
+        ok = all(metrics.get(k, True) for k in ("scoresOk", "listsOk", "inputUnchanged"))
+        rows.append({"case": name, **metrics, "refMs": 1000 * t_ref, "fastMs": 1000 * t_fast,
+                     "speedup": t_ref / t_fast if t_fast > 0 else np.inf, "passed": ok})
+    cols = ["case", "n", "maxAbsDiff", "tau", "topKOverlap", "listsExact", "tieOnly", "inputUnchanged",
+            "refMs", "fastMs", "speedup", "passed"]
+    return pd.DataFrame(rows).reindex(columns=cols)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reference vs fast-path equivalence checks.")
+    parser.add_argument("--year", type=int, default=2025, help="Season of team/roster data (default: 2025)")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--case", action="append", choices=list(CASES), help="Run only this case (repeatable)")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Timing runs per side, best kept (default: 3)")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Run on a small seeded data set in a temp dir instead of --data-dir")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.synthetic:
+            args.data_dir = synthetic_data(tmp, args.year)
+        fx = Fixture(args.year, args.data_dir)
+        missing = [str(fp) for fp in (fx.players_fp, fx.roster_fp, fx.rating_fp, *fx.year_files.values())
+                   if not fp.exists()]
+        if missing:
+            parser.error(f"missing {', '.join(missing)} (use --synthetic to run without data/)")
+        report = run_cases(fx, args.case, args.repeat)
+    with pd.option_context("display.width", 200, "display.float_format", "{:.4g}".format):
+        print(report.to_string(index=False))
+    failed = report.loc[~report["passed"], "case"].tolist()
+    if failed:
+        print(f"\nFAILED: {', '.join(failed)}")
+        sys.exit(1)
+    return report
+
+
+# ------------------------------------------------------------------------
+# 5.  Example driver
+# ------------------------------------------------------------------------
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+# incremental.py  – Online scoring of new portal entries
+# -------------------------------------------------------------
+#   • Seeded once from the same files as aggregate_player_data
+#   • Keeps the running normalisation state of all three pillars
+#       – pool size (Torvik percentile), per-position BPM mean/std
+#       – barthag percentile tables per season
+#       – per-pillar maxima of the raw scores
+#   • add_player() scores one entry in constant time and reports
+#     which pillars' maximum moved (→ renormalise the pool); updating
+#     the current maximum holder recomputes that pillar's maximum
+#   • scores() rescales every stored raw score in one vector pass
+#
+#   Running statistics move as players are added. Each stored quality
+#   score records the pool statistics it used (pool size, its bucket's
+#   BPM stats version); need scores use the pool z-score reference of
+#   the last seed / rescore. stale() lists scores whose statistics
+#   moved and rescore() recomputes them → identical to a batch rescore.
+# -------------------------------------------------------------
+import math
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import quality_score as qs
+import style_fit as sf
+import team_need as tn
+from calc_fit_score import FIT_WEIGHTS
+
+PILLARS = ["quality", "style", "need"]
+
+
+# ------------------------------------------------------------------------
+# 1.  Running statistics
+# ------------------------------------------------------------------------
+class _Welford:
+    """Running mean / sample std (ddof=1, NaN skipped like pandas)."""
+    def __init__(self):
+        self.n, self.mean, self.m2 = 0, 0.0, 0.0
+
+    def add(self, x: float):
+        if pd.isna(x):
+            return
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+
+    def remove(self, x: float):
+        """Undo add(x)."""
+        if pd.isna(x):
+            return
+        if self.n <= 1:
+            self.n, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        prev = (self.n * self.mean - x) / (self.n - 1)
+        self.m2 = max(self.m2 - (x - prev) * (x - self.mean), 0.0)
+        self.n, self.mean = self.n - 1, prev
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else np.nan
+
+
+def _num(val) -> float:
+    v = pd.to_numeric(val, errors="coerce")
+    return float(v) if pd.notna(v) else np.nan
+
+
+# ------------------------------------------------------------------------
+# 2.  Incremental scorer
+# ------------------------------------------------------------------------
+class IncrementalScorer:
+    """Score newly entered portal players against a fixed, pre-loaded context."""
+
+    def __init__(self, year: int,
+                 df_247: pd.DataFrame,
+                 df_team: pd.DataFrame,
+                 ill_roster: pd.DataFrame,
+                 teams_df: pd.DataFrame,
+                 style_model: sf.StyleModel,
+                 feat_stats: Optional[Dict[str, tuple]] = None):
+        self.year = year
+
+        # Quality: 247 ratings, barthag tables, Illinois positional means
+        ratings = df_247.assign(name_lc=df_247["name"].str.lower())
+        ratings = ratings.drop_duplicates("name_lc")
+        self.rating = dict(zip(ratings["name_lc"], ratings["rating"].astype(float)))
+
+        self.barthag: Dict[tuple, float] = {}
+        self.barthag_sorted: Dict[int, np.ndarray] = {}
+        self.barthag_count: Dict[int, int] = {}
+        for yr, grp in df_team.groupby("year"):
+            vals = pd.to_numeric(grp["barthag"], errors="coerce")
+            self.barthag.update(zip(zip(grp["team"], grp["year"]), vals))
+            self.barthag_sorted[yr] = np.sort(vals.dropna().to_numpy(dtype=float))
+            self.barthag_count[yr] = len(vals)
+
+        ill = ill_roster.rename(columns={"twoPPct": "twopPct", "threePPct": "threepPct"})
+        ill[qs.CORE_STATS] = ill[qs.CORE_STATS].apply(pd.to_numeric, errors="coerce")
+        ill["posBucket"] = ill["role"].apply(qs.map_role)
+        self.ill_pos_means = {pos: grp[qs.CORE_STATS].mean() for pos, grp in ill.groupby("posBucket")}
+        self.ill_pos_means["ALL"] = ill[qs.CORE_STATS].mean()
+
+        # Style: Illinois reference + origin team-season feature rows
+        self.style_model = style_model
+        self.ill_ref_vec = sf.illinois_reference(teams_df, style_model)
+        self.ill_mean_row = teams_df[teams_df["team"] == "Illinois"][sf.FEATURES].mean()
+        self.team_rows = {
+            key: grp.iloc[0][sf.FEATURES]
+            for key, grp in teams_df.groupby(["team", "year"], sort=False)
+        }
+
+        # Need: departures, urgency, z-score reference stats
+        roster = ill_roster.copy()
+        num_cols = ["minPct", "bpm", "ortg", "usg", "efg"]
+        roster[num_cols] = roster[num_cols].apply(pd.to_numeric, errors="coerce")
+        roster["heightIn"] = roster["height"].apply(tn._to_inches)
+        roster["posBucket"] = roster["role"].apply(tn.map_role)
+        roster["bpm"] = roster["bpm"].fillna(0)
+        dep = tn.departures(roster)
+        self.departed = dep
+        self.urgency = (dep.groupby("posBucket")["importance"].sum() /
+                        dep["importance"].sum()).to_dict()
+        self.dep_by_bucket = {b: grp.reset_index(drop=True) for b, grp in dep.groupby("posBucket")}
+        # None → transfers + departures as in score_transfers, taken from
+        # the seeded pool (departures only until seed() runs)
+        self._auto_feat_stats = feat_stats is None
+        self.feat_stats = feat_stats or self._need_stats([])
+        self.pool_version = self.feat_version = 0
+
+        # Pool state
+        self.n_players = 0
+        self.need_rows: List[dict] = []        # z-reference rows, counted like n_players
+        self.need_pos: Dict[str, int] = {}
+        self.bpm_stats: Dict[str, _Welford] = {}
+        self.index: Dict[str, int] = {}
+        self.players: List[dict] = []
+        self.raw = {p: [] for p in PILLARS}
+        self.maxima = {p: 0.0 for p in PILLARS}
+        # quality depends on n_players and the bucket's BPM stats
+        self.bpm_version: Dict[str, int] = {}
+        self.deps: List[tuple] = []            # (n_players, bucket, bpm_version) per player
+
+    # ---------------------------------------------------------------------
+    @classmethod
+    def from_files(cls, year: int = 2025, data_dir: str | Path = "data") -> "IncrementalScorer":
+        """Load context + current pool from the files aggregate_player_data reads."""
+        data_dir = Path(data_dir)
+        players_fp = data_dir / f"transfer-players-{year + 1}.json"
+        year_files = {y: data_dir / f"team-data-{y}.json" for y in range(year - 3, year + 1)}
+
+        teams_df = sf.concat_team_stats(year_files)
+        model = sf.StyleModel()
+        model.fit(teams_df)
+        df_team = pd.read_json(data_dir / f"team-data-{year}.json")
+        df_team["year"] = year
+
+        scorer = cls(
+            year,
+            df_247=pd.read_json(data_dir / f"transfers-247sports-{year + 1}.json"),
+            df_team=df_team,
+            ill_roster=pd.read_json(data_dir / f"illinois-roster-{year}.json"),
+            teams_df=teams_df,
+            style_model=model,
+        )
+        scorer.seed(pd.read_json(players_fp).to_dict("records"))
+        return scorer
+
+    def seed(self, players: List[dict]):
+        """Bulk-load a pool: statistics are taken over the whole pool first,
+        so seeded raw scores match the batch pipeline."""
+        for p in players:
+            self._observe(p)
+        if self._auto_feat_stats:
+            self.feat_stats, self.feat_version = self._need_stats(self.need_rows), self.pool_version
+        for p in players:
+            self._store(p, self._score(p))
+        self._refresh_maxima()
+
+    # ---------------------------------------------------------------------
+    def add_player(self, player: dict) -> dict:
+        """Insert / update one player. Returns its normalised scores plus
+        `renormalize`: the pillars whose maximum moved (stored scores of
+        everyone else changed by a constant factor)."""
+        i = self.index.get(self._key(player))
+        old = None if i is None else {p: self.raw[p][i] for p in PILLARS}
+        self._observe(player)
+        raw = self._score(player)
+        self._store(player, raw)
+
+        moved = []
+        for p in PILLARS:
+            before = self.maxima[p]
+            if old is not None and old[p] is not None and old[p] >= before and \
+                    (raw[p] is None or raw[p] < old[p]):
+                self._refresh_maxima([p])               # the max holder went down
+            elif raw[p] is not None and raw[p] > before:
+                self.maxima[p] = raw[p]
+            if self.maxima[p] != before:
+                moved.append(p)
+        out = self._normalise_one(raw)
+        out.update(player=player.get("player"), renormalize=moved)
+        return out
+
+    def scores(self) -> pd.DataFrame:
+        """Current pool with every stored raw score rescaled by the current maxima."""
+        df = pd.DataFrame({
+            "player": [p.get("player") for p in self.players],
+            "team":   [p.get("team") for p in self.players],
+        })
+        cols = {"quality": "qualityScore", "style": "styleScore", "need": "needScore"}
+        for p in PILLARS:
+            raw = np.array([np.nan if v is None else v for v in self.raw[p]], dtype=float)
+            df[cols[p]] = raw / (self.maxima[p] or 1.0)
+        fit = sum(FIT_WEIGHTS[p] * df[cols[p]].fillna(0) for p in PILLARS)
+        df["fitScore"] = np.round(fit * 99).astype(int)
+        df["stale"] = self._stale_mask()
+        return df
+
+    def stale(self) -> List[str]:
+        """Players whose stored quality score used pool statistics that have moved."""
+        return [p.get("player") for p, s in zip(self.players, self._stale_mask()) if s]
+
+    def rescore(self) -> List[str]:
+        """Batch renormalisation: recompute every stale quality score with the
+        current pool statistics, then the maxima. Returns the pillars whose
+        maximum moved."""
+        need_stale = self._need_stale()
+        stale = self._stale_mask()          # before the need reference moves
+        if need_stale:
+            self.feat_stats, self.feat_version = self._need_stats(self.need_rows), self.pool_version
+        for i in np.flatnonzero(stale):
+            player = self.players[i]
+            self.raw["quality"][i] = self._quality(player)
+            self.deps[i] = self._deps(player)
+            if need_stale and player.get("team") != "Illinois":
+                self.raw["need"][i], self.players[i]["matchedTo"] = self._need(player)
+        before = dict(self.maxima)
+        self._refresh_maxima()
+        return [p for p in PILLARS if self.maxima[p] != before[p]]
+
+    # ---------------------------------------------------------------------
+    def _key(self, player: dict) -> str:
+        return str(player.get("player", "")).lower()
+
+    def _observe(self, player: dict):
+        """Update pool-level statistics; an update replaces the player's old
+        BPM contribution instead of adding a second one."""
+        key = self._key(player)
+        i = self.index.get(key)
+        if i is None:
+            self.n_players += 1
+            self.need_pos[key] = len(self.need_rows)
+            self.need_rows.append(player)
+        else:
+            self.need_rows[self.need_pos[key]] = player
+            old = self.players[i]
+            old_bucket = qs.map_role(old.get("role"))
+            self.bpm_stats[old_bucket].remove(_num(old.get("bpm")))
+            self.bpm_version[old_bucket] = self.bpm_version.get(old_bucket, 0) + 1
+        bucket = qs.map_role(player.get("role"))
+        self.bpm_stats.setdefault(bucket, _Welford()).add(_num(player.get("bpm")))
+        self.bpm_version[bucket] = self.bpm_version.get(bucket, 0) + 1
+        self.pool_version += 1
+
+    def _deps(self, player: dict) -> tuple:
+        bucket = qs.map_role(player.get("role"))
+        return self.n_players, bucket, self.bpm_version.get(bucket, 0)
+
+    def _need_stale(self) -> bool:
+        return self._auto_feat_stats and self.feat_version != self.pool_version
+
+    def _stale_mask(self) -> np.ndarray:
+        if self._need_stale():
+            return np.ones(len(self.deps), dtype=bool)
+        return np.array([d != (self.n_players, d[1], self.bpm_version.get(d[1], 0))
+                         for d in self.deps], dtype=bool)
+
+    def _need_stats(self, players: List[dict]) -> Dict[str, tuple]:
+        """z-score reference of the need pillar: pool + departures."""
+        pool = pd.DataFrame({f: [_num(p.get(f)) for p in players] for f in tn.FEATURES if f != "heightIn"})
+        pool["heightIn"] = [tn._to_inches(p.get("height")) for p in players]
+        ref = pd.concat([pool[tn.FEATURES], self.departed[tn.FEATURES]], ignore_index=True)
+        return {f: (ref[f].mean(skipna=True), ref[f].std(skipna=True)) for f in tn.FEATURES}
+
+    def _store(self, player: dict, raw: dict):
+        key = self._key(player)
+        if key in self.index:
+            i = self.index[key]
+        else:
+            i = self.index[key] = len(self.players)
+            self.players.append(None)
+            self.deps.append(None)
+            for p in PILLARS:
+                self.raw[p].append(None)
+        for p in PILLARS:
+            self.raw[p][i] = raw[p]
+        self.players[i] = dict(player, **raw["details"])
+        self.deps[i] = self._deps(player)
+
+    def _refresh_maxima(self, pillars=PILLARS):
+        for p in pillars:
+            vals = [v for v in self.raw[p] if v is not None]
+            self.maxima[p] = max(vals) if vals else 0.0
+
+    def _normalise_one(self, raw: dict) -> dict:
+        return {
+            f"{p}Score": None if raw[p] is None else raw[p] / (self.maxima[p] or 1.0)
+            for p in PILLARS
+        }
+
+    # ---------------------------------------------------------------------
+    def _score(self, player: dict) -> dict:
+        row = pd.Series(player).rename({"twoPPct": "twopPct", "threePPct": "threepPct"})
+        strengths, weaknesses = qs.strengths_weaknesses(row, self.ill_pos_means)
+        details = {"strengths": strengths, "weaknesses": weaknesses}
+
+        quality = self._quality(player)
+        if player.get("team") == "Illinois":
+            return {"quality": quality, "style": None, "need": None, "details": details}
+
+        style, similar, dissim = self._style(player)
+        need, matched = self._need(player)
+        details.update(similarStats=similar, dissimilarStats=dissim, matchedTo=matched)
+        return {"quality": quality, "style": style, "need": need, "details": details}
+
+    def _quality(self, player: dict) -> float:
+        # Reputation
+        a = self.rating.get(self._key(player), np.nan)
+        rk = _num(player.get("rk"))
+        b = qs.torvik_percentile(rk, self.n_players) if self.n_players > 1 else np.nan
+        if pd.notna(a) and pd.notna(b):
+            rep = (a + b) / 2
+        else:
+            rep = max(a if pd.notna(a) else 0, b if pd.notna(b) else 0)
+
+        # Production
+        st = self.bpm_stats.get(qs.map_role(player.get("role")), _Welford())
+        sd = st.std
+        bpm_z = (_num(player.get("bpm")) - st.mean) / (sd if sd else 1)
+        ortg, usg = _num(player.get("ortg")), _num(player.get("usg"))
+        eff = (ortg - 100) / 25
+        usage_pen = max(abs(usg - 20) - 5, 0) / 15 if pd.notna(usg) else np.nan
+        prod = qs.sigmoid(0.3 * bpm_z + 0.04 * eff - 2 * usage_pen)
+
+        # Competition
+        bar_val = self.barthag.get((player.get("team"), self.year), np.nan)
+        if pd.isna(bar_val):
+            comp = 0.5
+        else:
+            table = self.barthag_sorted[self.year]
+            comp = np.searchsorted(table, bar_val, side="left") / self.barthag_count[self.year]
+
+        parts = {"Rep": rep, "Prod": prod, "Comp": comp}
+        return float(sum(qs.WEIGHTS[k] * (0 if pd.isna(v) else v) for k, v in parts.items()))
+
+    def _style(self, player: dict):
+        row = self.team_rows.get((player.get("team"), self.year))
+        row = pd.Series(np.nan, index=sf.FEATURES) if row is None else row.copy()
+        # player columns named like a team feature win the merge in rank_transfers
+        for f in sf.FEATURES:
+            if f in player:
+                row[f] = _num(player[f])
+        vec = self.style_model.vector(row)
+        if vec is None:
+            return 0.0, [], []
+        similar, dissim = sf.explain_stats(row, self.ill_mean_row)
+        return sf.to_0_1(sf.cosine(vec, self.ill_ref_vec)), similar, dissim
+
+    def _need(self, player: dict):
+        bucket = tn.map_role(player.get("role"))
+        urg_raw = self.urgency.get(bucket, 0.0)
+        if urg_raw == 0 or bucket not in self.dep_by_bucket:
+            return 0.0, None
+
+        tr = pd.Series({f: _num(player.get(f)) for f in tn.FEATURES if f != "heightIn"})
+        tr["heightIn"] = tn._to_inches(player.get("height"))
+        deps = self.dep_by_bucket[bucket]
+        sims = [tn._sim_row_to_row(tr, dep, self.feat_stats) for _, dep in deps.iterrows()]
+        best = int(np.argmax(sims))
+        return urg_raw ** tn.URGENCY_POWER * sims[best], deps.loc[best, "name"]
+
+
+# ------------------------------------------------------------------------
+# 3.  Example driver
+# ------------------------------------------------------------------------
+if __name__ == "__main__":
+    import sys
+
+    scorer = IncrementalScorer.from_files(2025, data_dir="data")
+    print(f"Seeded {scorer.n_players} players")
+    if len(sys.argv) > 1:
+        new_players = pd.read_json(sys.argv[1]).to_dict("records")
+        for p in new_players:
+            res = scorer.add_player(p)
+            flag = f"  → renormalise {res['renormalize']}" if res["renormalize"] else ""
+            print(f"{res['player']}: Q={res['qualityScore']:.3f}{flag}")
+        print(f"{len(scorer.stale())} stale scores → rescore, maxima moved: {scorer.rescore()}")
+    print(scorer.scores().sort_values("fitScore", ascending=False).head(25).to_string(index=False))
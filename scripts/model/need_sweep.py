@@ -0,0 +1,163 @@
+# need_sweep.py  – FEAT_WEIGHTS × URGENCY_POWER × MIN_MIN_PCT sweep
+# -------------------------------------------------------------
+#   • |za − zb| = |a − b| / σ, so the (transfer × candidate × feature)
+#     tensor of raw |Δstat| is built ONCE (NaN → masked to 0); a minutes
+#     threshold only changes σ (z-score reference = transfers + that
+#     threshold's departures) and which candidates count as departed
+#   • Similarity for every (weights, threshold) pair is one contraction
+#       exp(−Σ_f A[r,c,f] · w_f / σ_f(t))
+#     chunked over weight vectors to bound memory
+#   • Each chunk is scored by team_need.aggregate_need with the
+#     weight vectors as scenarios (one call per urgency power)
+#   • Report per setting: Kendall τ / top-K overlap of the need scores
+#     and matchedTo agreement vs the current constants
+# -------------------------------------------------------------
+import itertools
+from pathlib import Path
+from typing import Iterable, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import kendalltau
+
+import team_need as tn
+
+TOP_K = 50
+CHUNK = 64              # weight vectors per contraction
+MIN_PCTS = (5.0, 10.0, 15.0)
+
+
+def weight_grid(step: float = 0.05, features: Sequence[str] = tn.FEATURES) -> np.ndarray:
+    """Every weight vector on the simplex with the given step (rows sum to 1)."""
+    n = round(1 / step)
+    rows = [c for c in itertools.product(range(n + 1), repeat=len(features) - 1) if sum(c) <= n]
+    return np.array([list(c) + [n - sum(c)] for c in rows], dtype=float) / n
+
+
+def _as_matrix(weights) -> np.ndarray:
+    """List of {feature: w} dicts or an (n × FEATURES) array → array."""
+    if isinstance(weights, np.ndarray):
+        return np.atleast_2d(weights).astype(float)
+    return np.array([[w[f] for f in tn.FEATURES] for w in weights], dtype=float)
+
+
+class NeedSweep:
+    """Team-Need scores for a grid of weights, urgency powers and minutes
+    thresholds, sharing one per-feature distance tensor."""
+    def __init__(self, departed_roster_path, transfer_path, min_pcts: Iterable[float] = MIN_PCTS):
+        self.roster    = tn.load_df(departed_roster_path, roster=True)
+        self.transfers = tn.load_df(transfer_path)
+        self.lowest = min([*min_pcts, tn.MIN_MIN_PCT])
+
+        cand = self.roster.loc[self.roster["minPct"] >= self.lowest].reset_index(drop=True)
+        cand["importance"] = cand["minPct"]/100 * cand["bpm"].clip(lower=0)
+        self.candidates = cand
+        self.names = cand["name"].to_numpy(dtype=object)
+
+        X = self.transfers[tn.FEATURES].to_numpy(dtype=float)
+        Y = cand[tn.FEATURES].to_numpy(dtype=float)
+        self.A = np.nan_to_num(np.abs(X[:, None, :] - Y[None, :, :]), nan=0.0)
+
+        buckets = sorted(set(cand["posBucket"]))
+        index = {b: i for i, b in enumerate(buckets)}
+        cand_b = cand["posBucket"].map(index).to_numpy()
+        self.cand_onehot = np.eye(len(buckets))[cand_b] if len(cand) else np.zeros((0, 0))
+        self.tr_b = self.transfers["role"].apply(tn.map_role).map(index).fillna(-1).astype(int).to_numpy()
+        self.same_bucket = self.tr_b[:, None] == cand_b[None, :]
+        self.keep = (self.transfers["team"] != "Illinois").to_numpy()
+
+    # ------------------------------------------------------------------
+    def _threshold(self, t: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(departed mask over candidates, σ per feature) for one threshold."""
+        dep = tn.departures(self.roster, t)
+        ref = pd.concat([self.transfers[tn.FEATURES], dep[tn.FEATURES]], ignore_index=True)
+        sd = ref.std(skipna=True).to_numpy(dtype=float)
+        left = self.candidates["leftAfterSeason"] == True
+        return (left & (self.candidates["minPct"] >= t)).to_numpy(), sd
+
+    def run(self, weights=None, urgency_powers: Iterable[float] = (tn.URGENCY_POWER,),
+            min_pcts: Iterable[float] = (tn.MIN_MIN_PCT,), chunk: int = CHUNK):
+        """need [weights × thresholds × powers × transfers] (normalised like
+        score_transfers, Illinois rows included) and matchedTo
+        [weights × thresholds × transfers]."""
+        W = _as_matrix([tn.FEAT_WEIGHTS] if weights is None else weights)
+        P = np.asarray(list(urgency_powers), dtype=float)
+        T = list(min_pcts)
+        if min(T) < self.lowest:
+            raise ValueError(f"min_pct {min(T)} below the {self.lowest} the sweep was built for")
+        n_r = len(self.transfers)
+        need = np.zeros((len(W), len(T), len(P), n_r))
+        matched = np.full((len(W), len(T), n_r), None, dtype=object)
+        if not len(self.names):
+            return need, matched
+
+        importance = self.candidates["importance"].to_numpy()
+        for ti, t in enumerate(T):
+            M, sd = self._threshold(t)
+            inv_sd = np.divide(1.0, sd, out=np.zeros_like(sd), where=sd > 0)
+
+            for lo in range(0, len(W), chunk):
+                sim = np.exp(-np.einsum("rcf,wf->wrc", self.A, W[lo:lo + chunk] * inv_sd))
+                Mw = np.broadcast_to(M, (len(sim), len(M)))                    # weights as scenarios
+                for pi, p in enumerate(P):                  # matchedTo does not depend on p
+                    need[lo:lo + chunk, ti, pi], matched[lo:lo + chunk, ti] = tn.aggregate_need(
+                        Mw, sim, importance, self.cand_onehot, self.names, self.tr_b,
+                        self.same_bucket, self.keep, urgency_power=p)
+        return need, matched
+
+    def frame(self, need: np.ndarray, matched: np.ndarray) -> pd.DataFrame:
+        """One setting's scores in the shape of score_transfers."""
+        out = self.transfers.assign(needScore=need, matchedTo=matched)[self.keep]
+        cols = ["player", "team", "role", "heightIn", "bpm", "needScore", "matchedTo"]
+        return out.sort_values("needScore", ascending=False)[cols]
+
+    # ------------------------------------------------------------------
+    def report(self, weights=None, urgency_powers: Iterable[float] = (0.25, 0.5, 0.75, 1.0),
+               min_pcts: Iterable[float] = MIN_PCTS, top_k: int = TOP_K) -> pd.DataFrame:
+        """Ranking stability of every setting vs the current constants."""
+        W = _as_matrix([tn.FEAT_WEIGHTS] if weights is None else weights)
+        base_w = _as_matrix([tn.FEAT_WEIGHTS])
+        if not (np.abs(W - base_w).max(axis=1) < 1e-12).any():
+            W = np.vstack([base_w, W])
+        P = sorted(set(urgency_powers) | {tn.URGENCY_POWER})
+        T = sorted(set(min_pcts) | {tn.MIN_MIN_PCT})
+        need, matched = self.run(W, P, T)
+        need, matched = need[..., self.keep], matched[..., self.keep]
+
+        bw = int(np.argmin(np.abs(W - base_w).max(axis=1)))
+        ref = need[bw, T.index(tn.MIN_MIN_PCT), P.index(tn.URGENCY_POWER)]
+        ref_match = matched[bw, T.index(tn.MIN_MIN_PCT)]
+        top = set(np.argsort(-ref, kind="stable")[:top_k])
+
+        rows = []
+        for wi, ti, pi in itertools.product(range(len(W)), range(len(T)), range(len(P))):
+            s = need[wi, ti, pi]
+            tau = kendalltau(ref, s).statistic if len(s) > 1 else 1.0
+            rows.append({
+                **{f"w_{f}": W[wi, j] for j, f in enumerate(tn.FEATURES)},
+                "urgencyPower": P[pi], "minMinPct": T[ti],
+                "tau": float(tau),
+                "topKOverlap": len(top & set(np.argsort(-s, kind="stable")[:top_k])) / max(len(top), 1),
+                "matchedSame": float(np.mean(matched[wi, ti] == ref_match)) if len(s) else 1.0,
+                "current": (wi, ti, pi) == (bw, T.index(tn.MIN_MIN_PCT), P.index(tn.URGENCY_POWER)),
+            })
+        return pd.DataFrame(rows)
+
+
+def sweep_from_files(year: int = 2025, data_dir: str | Path = "data", min_pcts=MIN_PCTS, **kw):
+    data_dir = Path(data_dir)
+    ns = NeedSweep(data_dir / f"illinois-roster-{year}.json",
+                   data_dir / f"transfer-players-{year + 1}.json", min_pcts=min_pcts)
+    return ns.report(min_pcts=min_pcts, **kw)
+
+
+# ------------------------------------------------------------------------
+# Example driver
+# ------------------------------------------------------------------------
+if __name__ == "__main__":
+    import time
+
+    t = time.perf_counter()
+    report = sweep_from_files(2025, "data", weights=weight_grid(0.25))
+    print(report.sort_values("tau").to_string(index=False))
+    print(f"\n{len(report)} settings in {time.perf_counter() - t:.2f}s")
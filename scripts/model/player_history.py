@@ -0,0 +1,242 @@
+# player_history.py  – Multi-season player history store
+# -------------------------------------------------------------
+#   • Append-only: every ingest writes one immutable segment
+#     (uncompressed .npz, one array per column) + a manifest entry;
+#     nothing already written is rewritten
+#   • Stable player id across seasons: normalised name, then the
+#     closest season before or after (same team preferred, height
+#     ±2 in) → the same ids whatever order seasons are ingested in
+#   • A season ingested again (re-scrape) supersedes older rows for
+#     the same (player id, season): latest segment wins
+#   • Indexes built on open:
+#       – (pid, season) sorted keys   → vectorised range reads
+#       – (team, season)              → row ids
+#       – position bucket             → row ids
+#   • transfer-players-{Y}.json holds season Y-1 stats (the pipeline's
+#     `year`), which is the season recorded by default
+# -------------------------------------------------------------
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from compact import split_made_att
+from team_need import load_df
+
+SEASON_MUL    = 10_000        # sort key = pid · SEASON_MUL + season
+HEIGHT_TOL    = 2.0           # inches; larger jumps → different player
+STRING_COLS   = ["player", "team", "conf", "role", "playerClass", "height", "pick", "posBucket"]
+MANIFEST      = "manifest.json"
+
+
+def norm_name(name) -> str:
+    if not isinstance(name, str):
+        return ""
+    return " ".join(re.sub(r"[.'’`]", "", name.lower()).split())
+
+
+def season_of(path: str | Path) -> int:
+    """transfer-players-2026.json → 2025 (the season the stats are from)."""
+    m = re.search(r"(\d{4})", Path(path).name)
+    if not m:
+        raise ValueError(f"no year in {path}")
+    return int(m.group(1)) - 1
+
+
+def _atomic_write(path: Path, write):
+    tmp = path.with_name(path.name + ".tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+class PlayerHistory:
+    """Season stat rows for every player ever ingested, keyed by a stable id."""
+    def __init__(self, root: str | Path = "data/history"):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        fp = self.root / MANIFEST
+        self.manifest = json.loads(fp.read_text()) if fp.exists() else {"segments": []}
+        frames = [self._read_segment(s["file"]) for s in self.manifest["segments"]]
+        self._set_rows(pd.concat(frames, ignore_index=True) if frames else
+                       pd.DataFrame({"pid": np.array([], dtype=np.int64),
+                                     "season": np.array([], dtype=np.int64),
+                                     "segment": np.array([], dtype=np.int64)}))
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def _read_segment(self, name: str) -> pd.DataFrame:
+        with np.load(self.root / name, allow_pickle=False) as z:
+            return pd.DataFrame({k: z[k] for k in z.files})
+
+    def _write_segment(self, df: pd.DataFrame, name: str):
+        cols = {}
+        for c, s in df.items():
+            if c in STRING_COLS or not pd.api.types.is_numeric_dtype(s):
+                cols[c] = s.fillna("").astype(str).to_numpy(dtype=str)
+            else:
+                cols[c] = (s.astype(float) if s.isna().any() else s).to_numpy()
+
+        def write(tmp):
+            with open(tmp, "wb") as f:            # file object: np.savez keeps the name
+                np.savez(f, **cols)
+        _atomic_write(self.root / name, write)
+
+    def _set_rows(self, rows: pd.DataFrame):
+        """Keep the latest row per (pid, season) and rebuild the indexes."""
+        rows = (rows.sort_values(["pid", "season", "segment"], kind="stable")
+                    .drop_duplicates(["pid", "season"], keep="last")
+                    .reset_index(drop=True))
+        for c in STRING_COLS:
+            if c in rows:
+                rows[c] = rows[c].replace("", np.nan)
+        self.rows = rows
+        self.keys = rows["pid"].to_numpy(np.int64) * SEASON_MUL + rows["season"].to_numpy(np.int64)
+        self.by_team_season: Dict[Tuple[str, int], np.ndarray] = (
+            {k: np.asarray(v) for k, v in rows.groupby(["team", "season"]).indices.items()}
+            if len(rows) else {})
+        self.by_bucket: Dict[str, np.ndarray] = (
+            {k: np.asarray(v) for k, v in rows.groupby("posBucket").indices.items()}
+            if len(rows) else {})
+        self.by_pid: Dict[int, np.ndarray] = rows.groupby("pid").indices if len(rows) else {}
+        names = rows["player"].map(norm_name) if len(rows) else pd.Series(dtype=str)
+        self.by_name: Dict[str, np.ndarray] = {
+            k: np.unique(rows["pid"].to_numpy()[v]) for k, v in names.groupby(names).indices.items()}
+
+    # ------------------------------------------------------------------
+    # Identity
+    # ------------------------------------------------------------------
+    def _resolve(self, df: pd.DataFrame, season: int) -> np.ndarray:
+        """Player id for every row of a new season frame."""
+        next_pid = int(self.rows["pid"].max()) + 1 if len(self.rows) else 0
+        season_col = self.rows["season"].to_numpy()
+        out, taken = np.empty(len(df), dtype=np.int64), set()
+        for i, (name, team, h) in enumerate(zip(df["player"].map(norm_name), df["team"], df["heightIn"])):
+            best, best_rank = None, None
+            for pid in self.by_name.get(name, ()):
+                if pid in taken:
+                    continue
+                mine = self.by_pid[pid]
+                seasons = season_col[mine]
+                if season in seasons:
+                    row = mine[seasons == season][0]
+                    if self.rows["team"].iat[row] != team:
+                        continue                 # another player of that name, same season
+                    rank = (0, 0)                # re-scrape of the same row
+                else:
+                    # nearest season before or after: identity must not
+                    # depend on the order seasons are ingested in
+                    gap = np.abs(seasons - season)
+                    rank = None
+                    for row in mine[gap == gap.min()]:
+                        h0 = self.rows["heightIn"].iat[row] if "heightIn" in self.rows else np.nan
+                        if pd.notna(h) and pd.notna(h0) and abs(h - h0) > HEIGHT_TOL:
+                            continue
+                        r = (1, gap.min() - (self.rows["team"].iat[row] == team))
+                        rank = r if rank is None else min(rank, r)
+                    if rank is None:
+                        continue
+                if best_rank is None or rank < best_rank:
+                    best, best_rank = pid, rank
+            if best is None:
+                best, next_pid = next_pid, next_pid + 1
+            taken.add(best)
+            out[i] = best
+        return out
+
+    def player_id(self, name: str, season: Optional[int] = None, team: Optional[str] = None) -> int:
+        pids = self.by_name.get(norm_name(name), np.array([], dtype=np.int64))
+        if season is not None or team is not None:
+            m = np.isin(self.rows["pid"].to_numpy(), pids)
+            if season is not None:
+                m &= self.rows["season"].to_numpy() == season
+            if team is not None:
+                m &= (self.rows["team"] == team).to_numpy()
+            pids = np.unique(self.rows["pid"].to_numpy()[m])
+        if len(pids) != 1:
+            raise KeyError(f"{name!r}: {len(pids)} matching players")
+        return int(pids[0])
+
+    # ------------------------------------------------------------------
+    # Append
+    # ------------------------------------------------------------------
+    def ingest(self, path: str | Path, season: Optional[int] = None) -> int:
+        """Append one transfer-players snapshot; returns rows written
+        (0 if this exact file was ingested before)."""
+        path = Path(path)
+        season = season_of(path) if season is None else season
+        digest = hashlib.sha1(path.read_bytes()).hexdigest()
+        if any(s["sha1"] == digest and s["season"] == season for s in self.manifest["segments"]):
+            return 0
+        return self.append(split_made_att(load_df(path)), season, source=path.name, sha1=digest)
+
+    def append(self, df: pd.DataFrame, season: int, source: str = "", sha1: str = "") -> int:
+        seg_no = len(self.manifest["segments"])
+        df = df.reset_index(drop=True).assign(pid=self._resolve(df, season), season=season, segment=seg_no)
+        name = f"segment-{seg_no:05d}.npz"
+        self._write_segment(df, name)
+        self.manifest["segments"].append({"file": name, "season": season, "rows": len(df),
+                                          "source": source, "sha1": sha1})
+        _atomic_write(self.root / MANIFEST,
+                      lambda tmp: tmp.write_text(json.dumps(self.manifest, indent=2)))
+        self._set_rows(pd.concat([self.rows, self._read_segment(name)], ignore_index=True))
+        return len(df)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def history(self, pids: Iterable[int], last: int = 3, through: Optional[int] = None,
+                columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Up to `last` most recent seasons (≤ `through`) for every pid, in
+        pid order then season order. One searchsorted per bound, no scans."""
+        pids = np.asarray(list(pids), dtype=np.int64)
+        hi_season = SEASON_MUL - 1 if through is None else through
+        hi = np.searchsorted(self.keys, pids * SEASON_MUL + hi_season, side="right")
+        lo = np.maximum(np.searchsorted(self.keys, pids * SEASON_MUL, side="left"), hi - last)
+        counts = np.maximum(hi - lo, 0)
+        idx = np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        out = self.rows.iloc[idx]
+        return (out if columns is None else out[["pid", "season"] + columns]).reset_index(drop=True)
+
+    def history_for(self, df: pd.DataFrame, season: int, last: int = 3,
+                    columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Prior seasons (< `season`) for the players of a season frame, e.g.
+        the quality or need model's transfers; unknown players are skipped."""
+        pids = self._match(df, season)
+        hist = self.history(pids[pids >= 0], last=last, through=season - 1, columns=columns)
+        lookup = dict(zip(pids, df["player"]))
+        return hist.assign(currentPlayer=hist["pid"].map(lookup))
+
+    def _match(self, df: pd.DataFrame, season: int) -> np.ndarray:
+        rows = self.rows[self.rows["season"] == season]
+        ix = dict(zip(zip(rows["player"].map(norm_name), rows["team"]), rows["pid"]))
+        return np.array([ix.get((norm_name(p), t), -1) for p, t in zip(df["player"], df["team"])],
+                        dtype=np.int64)
+
+    def team_season(self, team: str, season: int) -> pd.DataFrame:
+        return self.rows.iloc[self.by_team_season.get((team, season), [])].reset_index(drop=True)
+
+    def bucket(self, bucket: str, seasons: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        out = self.rows.iloc[self.by_bucket.get(bucket, [])]
+        if seasons is not None:
+            out = out[out["season"].isin(list(seasons))]
+        return out.reset_index(drop=True)
+
+
+# ------------------------------------------------------------------------
+# Example driver
+# ------------------------------------------------------------------------
+if __name__ == "__main__":
+    import sys
+
+    store = PlayerHistory("data/history")
+    for fp in sorted(Path("data").glob("transfer-players-[0-9][0-9][0-9][0-9].json")):
+        print(f"{fp.name}: +{store.ingest(fp)} rows")
+    if len(sys.argv) > 1:
+        pid = store.player_id(sys.argv[1])
+        print(store.history([pid], last=10).to_string(index=False))
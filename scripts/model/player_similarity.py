@@ -0,0 +1,168 @@
+# player_similarity.py  – "Players like X" nearest-neighbour index
+# -------------------------------------------------------------
+#   • Same distance as team_need._sim_row_to_row:
+#       Σ w_f · |z_a − z_b|   (weighted L1 on z-scores)
+#     → weights folded into the vectors, Manhattan KD-tree per
+#       position bucket
+#   • Missing stats are imputed at the mean (z = 0)
+#   • Top-k queries, bucket filters, incremental adds
+#     (new rows searched brute-force until the bucket is rebuilt)
+#   • Several seasons per player: a query skips every row of the
+#     queried player (history `pid` if given, else normalised name)
+#   • Similarity reported as exp(−dist), 1 → identical
+# -------------------------------------------------------------
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+from player_history import norm_name
+from team_need import FEATURES, FEAT_WEIGHTS, load_df
+
+META_COLS = ["player", "team", "year", "posBucket", "playerId"]
+
+
+class PlayerIndex:
+    """KD-tree index over standardised player stat vectors."""
+    def __init__(self, weights: Dict[str, float] = FEAT_WEIGHTS,
+                 leaf_size: int = 40, rebuild_frac: float = 0.1):
+        self.features = list(weights)
+        self.w = np.array([weights[f] for f in self.features], dtype=float)
+        self.leaf_size = leaf_size
+        self.rebuild_frac = rebuild_frac
+
+        self.mu: Optional[np.ndarray] = None
+        self.sd: Optional[np.ndarray] = None
+        self.X = np.empty((0, len(self.features)))
+        self.meta = pd.DataFrame(columns=META_COLS)
+        self.trees: Dict[str, tuple] = {}          # bucket → (tree, global ids)
+        self.pending: Dict[str, List[int]] = {}    # bucket → ids not in tree yet
+        self.by_name: Dict[str, List[int]] = {}    # normalised name → row ids
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_files(cls, year_files: Dict[int, str | Path], **kw) -> "PlayerIndex":
+        """Index several transfer-players-{year}.json snapshots at once."""
+        frames = []
+        for y, p in year_files.items():
+            df = load_df(p)
+            df["year"] = y
+            frames.append(df)
+        return cls(**kw).fit(pd.concat(frames, ignore_index=True))
+
+    @classmethod
+    def from_dir(cls, data_dir: str | Path = "data", through: Optional[int] = None, **kw) -> "PlayerIndex":
+        """Every transfer-players-{year}.json under `data_dir` (up to `through`)."""
+        files = {int(fp.stem.rsplit("-", 1)[1]): fp
+                 for fp in sorted(Path(data_dir).glob("transfer-players-[0-9][0-9][0-9][0-9].json"))}
+        return cls.from_files({y: fp for y, fp in files.items() if through is None or y <= through}, **kw)
+
+    def fit(self, df: pd.DataFrame) -> "PlayerIndex":
+        """(Re)build from scratch; z-score μ/σ are taken from `df`."""
+        F = df[self.features].to_numpy(dtype=float)
+        self.mu = np.nanmean(F, axis=0)
+        sd = np.nanstd(F, axis=0, ddof=1)
+        self.sd = np.where(sd > 0, sd, 1.0)
+        self.X = self._embed(F)
+        self.meta = self._meta(df)
+        self.trees, self.pending, self.by_name = {}, {}, {}
+        self._index_names(self.meta, 0)
+        for b in self.meta["posBucket"].unique():
+            self._rebuild(b)
+        return self
+
+    def add(self, df: pd.DataFrame):
+        """Append rows; they are queryable immediately and folded into the
+        bucket tree once the pending set grows past `rebuild_frac`."""
+        if self.mu is None:
+            raise RuntimeError("PlayerIndex.add() before fit(): no z-score reference yet")
+        start = len(self.X)
+        meta = self._meta(df)
+        self.X = np.vstack([self.X, self._embed(df[self.features].to_numpy(dtype=float))])
+        self.meta = pd.concat([self.meta, meta], ignore_index=True)
+        self._index_names(meta, start)
+        for i, b in enumerate(df["posBucket"].to_numpy(), start):
+            self.pending.setdefault(b, []).append(i)
+        for b, ids in self.pending.items():
+            size = len(self.trees[b][1]) if b in self.trees else 0
+            if len(ids) > max(self.rebuild_frac * size, 64):
+                self._rebuild(b)
+
+    @staticmethod
+    def _meta(df: pd.DataFrame) -> pd.DataFrame:
+        meta = df.reindex(columns=META_COLS).reset_index(drop=True)
+        ids = df["pid"] if "pid" in df else df["player"].map(norm_name)
+        meta["playerId"] = ids.to_numpy()
+        return meta
+
+    def _index_names(self, meta: pd.DataFrame, start: int):
+        for i, name in enumerate(meta["player"].map(norm_name), start):
+            self.by_name.setdefault(name, []).append(i)
+
+    def _embed(self, F: np.ndarray) -> np.ndarray:
+        Z = (F - self.mu) / self.sd
+        return np.nan_to_num(Z, nan=0.0) * self.w
+
+    def _rebuild(self, bucket: str):
+        ids = np.flatnonzero(self.meta["posBucket"].to_numpy() == bucket)
+        self.trees[bucket] = (KDTree(self.X[ids], leaf_size=self.leaf_size, metric="manhattan"), ids)
+        self.pending[bucket] = []
+
+    # ------------------------------------------------------------------
+    def vector_of(self, player: str, year: Optional[int] = None) -> int:
+        """Row id of `player` (latest season unless `year` is given)."""
+        ids = np.asarray(self.by_name.get(norm_name(player), []), dtype=int)
+        years = self.meta["year"].to_numpy()[ids]
+        if year is not None:
+            ids, years = ids[years == year], years[years == year]
+        if not len(ids):
+            raise KeyError(player)
+        return int(ids[np.argmax(years)])
+
+    def query(self, player: str, k: int = 10, year: Optional[int] = None,
+              buckets: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Top-k players most similar to `player`, optionally restricted to
+        position buckets. Every season of the player is excluded."""
+        i = self.vector_of(player, year)
+        own = set(np.flatnonzero(self.meta["playerId"].to_numpy() == self.meta["playerId"].iat[i]).tolist())
+        return self.query_vector(self.X[i], k, buckets, exclude=own)
+
+    def query_vector(self, x: np.ndarray, k: int = 10,
+                     buckets: Optional[Iterable[str]] = None,
+                     exclude: frozenset | set = frozenset()) -> pd.DataFrame:
+        if buckets is None:                        # incl. buckets with only pending rows
+            buckets = dict.fromkeys([*self.trees, *self.pending])
+        dist, ids = [], []
+        for b in buckets:
+            if b in self.trees:
+                tree, tree_ids = self.trees[b]
+                kk = min(k + len(exclude), len(tree_ids))
+                d, j = tree.query(x.reshape(1, -1), k=kk)
+                dist.append(d[0]); ids.append(tree_ids[j[0]])
+            extra = self.pending.get(b, [])
+            if extra:
+                dist.append(np.abs(self.X[extra] - x).sum(axis=1)); ids.append(np.array(extra))
+        if not ids:
+            return self.meta.iloc[:0].assign(similarity=[])
+
+        dist, ids = np.concatenate(dist), np.concatenate(ids)
+        keep = ~np.isin(ids, list(exclude))
+        dist, ids = dist[keep], ids[keep]
+        order = np.argsort(dist, kind="stable")[:k]
+        out = self.meta.iloc[ids[order]].copy()
+        out["similarity"] = np.exp(-dist[order])
+        return out.reset_index(drop=True)
+
+
+# ------------------------------------------------------------------------
+# Example driver
+# ------------------------------------------------------------------------
+if __name__ == "__main__":
+    import sys
+
+    index = PlayerIndex.from_dir("data")
+    name = sys.argv[1] if len(sys.argv) > 1 else index.meta["player"].iloc[0]
+    print(f"Players most similar to {name}:")
+    print(index.query(name, k=10).to_string(index=False))
@@ -12,6 +12,9 @@ import numpy as np
 import pandas as pd
 
 import re
+
+from compact import read_frame
+from topk import k_smallest
 # ---------------------------------------------------------------------
 # 0.  Global config & weights
 # ---------------------------------------------------------------------
@@ -42,6 +45,18 @@ def map_role(role: str) -> str:
     return "Unknown"
 
 
+def _season_key(df: pd.DataFrame) -> List[str]:
+    """Frames holding several seasons are partitioned by `year`."""
+    return ["year"] if "year" in df else []
+
+
+def position_buckets(roles: pd.Series) -> pd.Series:
+    """`map_role` for a whole column; the regexes run once per distinct role."""
+    codes, uniques = pd.factorize(roles)
+    lookup = np.array([map_role(r) for r in uniques] + ["Unknown"], dtype=object)
+    return pd.Series(lookup[codes], index=roles.index)
+
+
 def torvik_percentile(rank: float, n_players: int) -> float:
     if pd.isna(rank):
         return np.nan
@@ -56,55 +71,83 @@ def sigmoid(x: float) -> float:
 # ---------------------------------------------------------------------
 
 def build_reputation(df_players: pd.DataFrame, df_247: pd.DataFrame) -> pd.Series:
-    df_247 = df_247.copy()
-    df_247["name_lc"] = df_247["name"].str.lower()
-    df_players["name_lc"] = df_players["player"].str.lower()
-    merged = df_players.merge(df_247[["name_lc", "rating"]], on="name_lc", how="left")
-
-    n_players = len(df_players)
-    p_rank = merged["rk"].apply(lambda r: torvik_percentile(r, n_players))
-    r247 = merged["rating"].astype(float)
-
-    rep_vals = []
-    for a, b in zip(r247, p_rank):
-        if pd.notna(a) and pd.notna(b):
-            rep_vals.append((a + b) / 2)
-        else:
-            rep_vals.append(max(a if pd.notna(a) else 0, b if pd.notna(b) else 0))
-    return pd.Series(rep_vals, index=merged.index, name="Rep")
+    """Mean of the 247 rating and the Torvik rank percentile (within the
+    player's season), or whichever one exists. Does not modify `df_players`.
+    A name listed twice by 247 uses its first rating; the original merge
+    duplicated that player's row, which shifted every later player's Rep
+    by one row when joined back on the index."""
+    keys = ["name_lc"] + [k for k in _season_key(df_players) if k in df_247]
+    ratings = (df_247.assign(name_lc=df_247["name"].str.lower())[keys + ["rating"]]
+                     .drop_duplicates(keys))
+    left = pd.DataFrame({"name_lc": df_players["player"].str.lower(),
+                         **{k: df_players[k] for k in keys[1:]}}, index=df_players.index)
+    r247 = left.merge(ratings, on=keys, how="left")["rating"].to_numpy(dtype=float)
+
+    season = _season_key(df_players)
+    n_players = (df_players.groupby(season)["player"].transform("size") if season
+                 else pd.Series(len(df_players), index=df_players.index)).to_numpy(dtype=float)
+    rk = pd.to_numeric(df_players["rk"], errors="coerce").to_numpy(dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p_rank = 1 - (rk - 1) / (n_players - 1)
+
+    both = ~np.isnan(r247) & ~np.isnan(p_rank)
+    rep = np.where(both, (r247 + p_rank) / 2,
+                   np.maximum(np.nan_to_num(r247, nan=0.0), np.nan_to_num(p_rank, nan=0.0)))
+    return pd.Series(rep, index=df_players.index, name="Rep")
 
 # ---------------------------------------------------------------------
 # 3.  Production index
 # ---------------------------------------------------------------------
 
 def production_index(df_players: pd.DataFrame) -> pd.Series:
-    df = df_players.copy()
-    df[["bpm", "ortg", "usg"]] = df[["bpm", "ortg", "usg"]].apply(pd.to_numeric, errors="coerce")
-    df["posBucket"] = df["role"].apply(map_role)
-    bpm_z = pd.Series(index=df.index, dtype=float)
-    for pos, grp in df.groupby("posBucket"):
-        mu, sd = grp["bpm"].mean(), grp["bpm"].std()
-        bpm_z.loc[grp.index] = (grp["bpm"] - mu) / (sd if sd else 1)
+    # read-only: work on the three stat columns, not a copy of the frame
+    df = df_players[["bpm", "ortg", "usg"]].apply(pd.to_numeric, errors="coerce")
+    keys = [df_players[k] for k in _season_key(df_players)] + [position_buckets(df_players["role"])]
+    grp = df["bpm"].groupby(keys)
+    mu, sd = grp.transform("mean"), grp.transform("std")
+    bpm_z = (df["bpm"] - mu) / sd.mask(sd == 0, 1)
     eff = (df["ortg"] - 100) / 25
     usage_pen = ((df["usg"] - 20).abs() - 5).clip(lower=0) / 15
     prod_raw = 0.3 * bpm_z + 0.04 * eff - 2 * usage_pen
     return sigmoid(prod_raw).rename("Prod")
 
+def production_matrix(bpm: np.ndarray, ortg: np.ndarray, usg: np.ndarray,
+                      buckets: np.ndarray) -> np.ndarray:
+    """`production_index` on raw arrays. Leading axes are replicates, the
+    last axis is players; `buckets` holds one position label per player."""
+    bpm_z = np.full(np.shape(bpm), np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for pos in np.unique(buckets):
+            m = buckets == pos
+            grp = bpm[..., m]
+            cnt = np.sum(~np.isnan(grp), axis=-1, keepdims=True)
+            mu = np.nansum(grp, axis=-1, keepdims=True) / cnt
+            sd = np.sqrt(np.nansum((grp - mu) ** 2, axis=-1, keepdims=True) / (cnt - 1))
+            sd = np.where(cnt > 1, sd, np.nan)             # pandas std of one value
+            bpm_z[..., m] = (grp - mu) / np.where(sd == 0, 1, sd)
+    eff = (ortg - 100) / 25
+    usage_pen = np.clip(np.abs(usg - 20) - 5, 0, None) / 15
+    return sigmoid(0.3 * bpm_z + 0.04 * eff - 2 * usage_pen)
+
 # ---------------------------------------------------------------------
 # 4.  Competition strength
 # ---------------------------------------------------------------------
 
 def competition_strength(df_players: pd.DataFrame, df_team: pd.DataFrame) -> pd.Series:
-    comp_vals = []
-    for _, row in df_players.iterrows():
-        bar_row = df_team.loc[(df_team["team"] == row["team"]) & (df_team["year"] == row["year"]), "barthag"]
-        if bar_row.empty or pd.isna(bar_row.iloc[0]):
-            comp_vals.append(0.5)
-            continue
-        bar_val = bar_row.iloc[0]
-        pct = (df_team[df_team["year"] == row["year"]]["barthag"] < bar_val).mean()
-        comp_vals.append(float(pct))
-    return pd.Series(comp_vals, index=df_players.index, name="Comp")
+    """Share of that season's teams with a lower barthag than the player's
+    team; 0.5 when the team-season is missing."""
+    bar = (df_team.drop_duplicates(["team", "year"])
+                  .set_index(["team", "year"])["barthag"].astype(float))
+    own = bar.reindex(pd.MultiIndex.from_arrays([df_players["team"], df_players["year"]])).to_numpy()
+
+    years = df_players["year"].to_numpy()
+    comp = np.full(len(df_players), 0.5)
+    for y, season in df_team.groupby("year")["barthag"]:
+        m = (years == y) & ~np.isnan(own)
+        vals = np.sort(season.dropna().to_numpy(dtype=float))
+        # NaN barthag rows count in the denominator, never as "lower"
+        comp[m] = np.searchsorted(vals, own[m], side="left") / len(season)
+    return pd.Series(comp, index=df_players.index, name="Comp")
 
 # ---------------------------------------------------------------------
 # 5.  Strengths & weaknesses helper
@@ -121,20 +164,64 @@ def strengths_weaknesses(row: pd.Series, ill_pos_means: Dict[str, pd.Series], k:
     deltas = (player_vals - base).abs().sort_values()
     return deltas.index[:k].tolist(), deltas.index[-k:].tolist()
 
+
+def strengths_weaknesses_matrix(df_players: pd.DataFrame,
+                                ill_pos_means: Dict[str, pd.Series],
+                                k: int = 3) -> Tuple[List[List[str]], List[List[str]]]:
+    """Same output as `strengths_weaknesses`, computed for every player at once
+    over the (player × CORE_STATS) delta matrix."""
+    n = len(df_players)
+    k = min(k, len(CORE_STATS))
+    if n == 0 or k <= 0:
+        return [[] for _ in range(n)], [[] for _ in range(n)]
+
+    roles = df_players["role"] if "role" in df_players else pd.Series("", index=df_players.index)
+    pos = roles.map(map_role).to_numpy(dtype=object)
+    known = np.isin(pos, list(ill_pos_means))
+    fallback = np.where((pos == "PG") & ("SG" in ill_pos_means), "SG", "ALL")
+    pos = np.where(known, pos, fallback)
+
+    # one baseline row per bucket (+ a trailing NaN row for "no baseline")
+    buckets = list(ill_pos_means)
+    base = np.vstack([ill_pos_means[b].reindex(CORE_STATS).to_numpy(dtype=float) for b in buckets]
+                     + [np.full(len(CORE_STATS), np.nan)])
+    bucket_idx = {b: i for i, b in enumerate(buckets)}
+    rows = np.array([bucket_idx.get(p, len(buckets)) for p in pos])
+    has_base = rows < len(buckets)
+
+    X = df_players[CORE_STATS].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    deltas = np.abs(X - base[rows])
+    # NaN sorts last, exactly like Series.sort_values
+    key = np.where(np.isnan(deltas), np.inf, deltas)
+
+    names = np.array(CORE_STATS, dtype=object)
+    strong = names[k_smallest(key, k)]
+    # largest k in ascending order, ties kept in column order (as deltas.index[-k:])
+    weak = names[(len(CORE_STATS) - 1 - k_smallest(-key[:, ::-1], k))[:, ::-1]]
+
+    strengths = [s.tolist() if ok else [] for s, ok in zip(strong, has_base)]
+    weaknesses = [w.tolist() if ok else [] for w, ok in zip(weak, has_base)]
+    return strengths, weaknesses
+
 # ---------------------------------------------------------------------
 # 6.  Main scoring function
 # ---------------------------------------------------------------------
 
-def score_quality(year: int, data_dir: str | Path = "data") -> pd.DataFrame:
+def score_quality(year: int, data_dir: str | Path = "data", compact: bool = False,
+                  inputs: Dict[str, pd.DataFrame] | None = None) -> pd.DataFrame:
+    """`inputs` may hold already-parsed "players", "247", "team" and "roster"
+    frames (used instead of reading the files)."""
     players_fp = Path(data_dir) / f"transfer-players-{year + 1}.json"
     team_fp    = Path(data_dir) / f"team-data-{year}.json"
     rating_fp  = Path(data_dir) / f"transfers-247sports-{year + 1}.json"
     ill_fp     = Path(data_dir) / f"illinois-roster-{year}.json"
 
-    df_players = pd.read_json(players_fp)
+    inputs = inputs or {}
+    read = lambda key, fp, copy=True: read_frame(inputs.get(key, fp), compact, copy)
+    df_players = read("players", players_fp)
     df_players["year"] = year
-    df_247  = pd.read_json(rating_fp)
-    df_team = pd.read_json(team_fp)
+    df_247  = read("247", rating_fp, copy=False)         # only read below
+    df_team = read("team", team_fp, copy=False)
     
     
     df_players = df_players.join(build_reputation(df_players, df_247))
@@ -148,7 +235,7 @@ def score_quality(year: int, data_dir: str | Path = "data") -> pd.DataFrame:
     )
 
     # Illinois positional baselines
-    ill = pd.read_json(ill_fp)
+    ill = read("roster", ill_fp)
     
     # after loading df_players = pd.read_json(players_fp)
     df_players.rename(columns={
@@ -167,8 +254,9 @@ def score_quality(year: int, data_dir: str | Path = "data") -> pd.DataFrame:
     ill_pos_means = {pos: grp[CORE_STATS].mean() for pos, grp in ill.groupby("posBucket")}
     ill_pos_means["ALL"] = ill[CORE_STATS].mean() 
 
-    strengths, weaknesses = zip(*df_players.apply(lambda r: strengths_weaknesses(r, ill_pos_means), axis=1))
-    df_players["strengths"], df_players["weaknesses"] = strengths, weaknesses
+    strengths, weaknesses = strengths_weaknesses_matrix(df_players, ill_pos_means)
+    df_players["strengths"] = pd.Series(strengths, index=df_players.index)
+    df_players["weaknesses"] = pd.Series(weaknesses, index=df_players.index)
 
     # Normalise to 0‑1
     hi = df_players["quality_raw"].max() or 1.0
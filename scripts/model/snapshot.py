@@ -0,0 +1,225 @@
+# snapshot.py  – Versioned, memory-mapped score snapshot
+# -------------------------------------------------------------
+#   • One binary file per published version:
+#       magic │ header length │ JSON header │ 64-byte aligned blocks
+#     blocks:
+#       – numeric columns        float64 / int64 / bool, one per field
+#                                (bool with nulls → float64 1 / 0 / NaN)
+#       – string columns         int32 codes into one shared dictionary
+#                                (-1 = null)
+#       – string dictionary      utf-8 bytes + uint64 offsets
+#       – detail blobs           every player's full JSON record,
+#                                concatenated + uint64 offsets
+#   • Readers mmap the file read-only and take np.frombuffer views:
+#     nothing is parsed or copied, so N worker processes share one
+#     copy in the page cache
+#   • publish() writes v{N+1} under a temporary name, renames it, then
+#     swaps the CURRENT pointer (os.replace) → readers see either the
+#     old or the new version, never a partial one; refresh() remaps
+#     only when CURRENT moved
+#   • Superseded files are deleted after `keep` versions; on POSIX a
+#     reader still mapping one keeps its pages until it refreshes
+# -------------------------------------------------------------
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MAGIC     = b"PFSNAP1\0"
+ALIGN     = 64
+POINTER   = "CURRENT"
+KEEP      = 3
+
+
+def _file_name(version: int) -> str:
+    return f"scores-v{version:06d}.snap"
+
+
+def _atomic_write(path: Path, write):
+    tmp = path.with_name(path.name + ".tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def current_version(root: str | Path) -> int:
+    fp = Path(root) / POINTER
+    return json.loads(fp.read_text())["version"] if fp.exists() else 0
+
+
+# ------------------------------------------------------------------------
+# 1.  Writer
+# ------------------------------------------------------------------------
+def _column_kind(values: List) -> Optional[str]:
+    """bool / int / float / str for scalar fields, None for lists & dicts."""
+    present = [v for v in values if v is not None and not (isinstance(v, float) and v != v)]
+    kinds = {type(v) for v in present}
+    if not kinds:
+        return "float"
+    if kinds == {bool}:
+        return "bool" if len(present) == len(values) else "float"   # 1.0 / 0.0 / NaN
+    if kinds <= {int}:
+        return "int" if len(present) == len(values) else "float"
+    if kinds <= {int, float}:
+        return "float"
+    if kinds == {str}:
+        return "str"
+    return None
+
+
+def _encode(records: List[Dict]) -> Tuple[Dict[str, np.ndarray], Dict[str, str]]:
+    fields = list(dict.fromkeys(k for r in records for k in r))
+    strings: Dict[str, int] = {}
+    blocks: Dict[str, np.ndarray] = {}
+    kinds: Dict[str, str] = {}
+    for f in fields:
+        vals = [r.get(f) for r in records]
+        kind = _column_kind(vals)
+        if kind is None:
+            continue                                     # detail blobs only
+        kinds[f] = kind
+        if kind == "str":
+            blocks[f] = np.array([strings.setdefault(v, len(strings)) if isinstance(v, str) else -1
+                                  for v in vals], dtype=np.int32)
+        elif kind == "bool":
+            blocks[f] = np.array([bool(v) for v in vals], dtype=np.bool_)
+        elif kind == "int":
+            blocks[f] = np.array(vals, dtype=np.int64)
+        else:
+            blocks[f] = np.array([np.nan if v is None else v for v in vals], dtype=np.float64)
+
+    words = [s.encode() for s in strings]
+    blocks["__strings__"] = np.frombuffer(b"".join(words), dtype=np.uint8)
+    blocks["__string_offsets__"] = np.concatenate([[0], np.cumsum([len(w) for w in words])]).astype(np.uint64)
+    details = [json.dumps(r, separators=(",", ":")).encode() for r in records]
+    blocks["__details__"] = np.frombuffer(b"".join(details), dtype=np.uint8)
+    blocks["__detail_offsets__"] = np.concatenate([[0], np.cumsum([len(d) for d in details])]).astype(np.uint64)
+    return blocks, kinds
+
+
+def write_snapshot(path: str | Path, records: List[Dict], version: int, source: str = ""):
+    blocks, kinds = _encode(records)
+    layout, offset = {}, 0
+    for name, arr in blocks.items():
+        layout[name] = {"dtype": arr.dtype.str, "offset": offset, "count": int(arr.size)}
+        offset += -(-arr.nbytes // ALIGN) * ALIGN
+    header = json.dumps({"version": version, "rows": len(records), "source": source,
+                         "kinds": kinds, "blocks": layout}).encode()
+    data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGN) * ALIGN
+
+    def write(tmp):
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + struct.pack("<Q", len(header)) + header)
+            for name, arr in blocks.items():
+                f.seek(data_start + layout[name]["offset"])
+                f.write(arr.tobytes())
+            f.truncate(data_start + offset)
+            f.flush()
+            os.fsync(f.fileno())
+    _atomic_write(Path(path), write)
+
+
+def publish(records: List[Dict], root: str | Path = "data/serving", source: str = "",
+            keep: int = KEEP) -> int:
+    """Write the next version and swap CURRENT to it; returns the version.
+    The newest `keep` (≥ 1, the current one included) files are kept."""
+    if keep < 1:
+        raise ValueError(f"keep={keep}: the current snapshot must be kept")
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    version = current_version(root) + 1
+    write_snapshot(root / _file_name(version), records, version, source)
+    _atomic_write(root / POINTER, lambda tmp: tmp.write_text(
+        json.dumps({"version": version, "file": _file_name(version)})))
+    for old in sorted(root.glob("scores-v*.snap"))[:-keep]:
+        old.unlink(missing_ok=True)
+    return version
+
+
+# ------------------------------------------------------------------------
+# 2.  Reader
+# ------------------------------------------------------------------------
+class ScoreSnapshot:
+    """Zero-copy view of the CURRENT snapshot under `root`."""
+    def __init__(self, root: str | Path = "data/serving"):
+        self.root = Path(root)
+        self.version = 0
+        self._mm = None
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Remap if a newer version was published; True if it changed."""
+        pointer = json.loads((self.root / POINTER).read_text())
+        if pointer["version"] == self.version:
+            return False
+        with open(self.root / pointer["file"], "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{pointer['file']}: not a score snapshot")
+        (hlen,) = struct.unpack_from("<Q", mm, len(MAGIC))
+        header = json.loads(mm[len(MAGIC) + 8:len(MAGIC) + 8 + hlen])
+        start = -(-(len(MAGIC) + 8 + hlen) // ALIGN) * ALIGN
+        self._blocks = {name: np.frombuffer(mm, dtype=b["dtype"], count=b["count"], offset=start + b["offset"])
+                                if b["count"] else np.empty(0, dtype=b["dtype"])
+                        for name, b in header["blocks"].items()}
+        self._mm, self.header = mm, header                # old map is released with its views
+        self.version, self.kinds, self.rows = header["version"], header["kinds"], header["rows"]
+        self._labels = None
+        return True
+
+    def __len__(self) -> int:
+        return self.rows
+
+    # -- columns -------------------------------------------------------
+    def codes(self, name: str) -> np.ndarray:
+        """Raw block: numbers, or dictionary codes for string columns."""
+        return self._blocks[name]
+
+    def string(self, code: int) -> Optional[str]:
+        if code < 0:
+            return None
+        off = self._blocks["__string_offsets__"]
+        return bytes(self._blocks["__strings__"][off[code]:off[code + 1]]).decode()
+
+    def column(self, name: str) -> np.ndarray:
+        if self.kinds[name] != "str":
+            return self._blocks[name]
+        if self._labels is None:
+            n = len(self._blocks["__string_offsets__"]) - 1
+            self._labels = np.array([self.string(i) for i in range(n)] + [None], dtype=object)
+        return self._labels[self._blocks[name]]            # code -1 → trailing None
+
+    def frame(self, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        return pd.DataFrame({c: self.column(c) for c in (columns or self.kinds)})
+
+    # -- records -------------------------------------------------------
+    def record(self, i: int) -> Dict:
+        off = self._blocks["__detail_offsets__"]
+        return json.loads(bytes(self._blocks["__details__"][off[i]:off[i + 1]]))
+
+    def top(self, k: int = 25, by: str = "fitScore") -> List[Dict]:
+        order = np.argsort(-np.nan_to_num(self.column(by).astype(float), nan=-np.inf), kind="stable")
+        return [self.record(i) for i in order[:k]]
+
+    def find(self, player: str) -> List[int]:
+        names = self.column("player")
+        return np.flatnonzero(names == player).tolist()
+
+
+# ------------------------------------------------------------------------
+# Example driver
+# ------------------------------------------------------------------------
+if __name__ == "__main__":
+    import sys
+
+    src = sys.argv[1] if len(sys.argv) > 1 else "data/transfer-players-2026-merged.json"
+    with open(src) as f:
+        v = publish(json.load(f), source=Path(src).name)
+    snap = ScoreSnapshot()
+    print(f"published v{v}: {len(snap)} players, {len(snap.kinds)} columns")
+    for rec in snap.top(10):
+        print(f"{rec['fitScore']:>3}  {rec['player']} ({rec['team']})")
@@ -6,15 +6,16 @@
 #   • Illinois reference = 4‑season mean (2022‑25)
 #   • Outputs similarity & dissimilarity feature lists
 # -------------------------------------------------------------
+import hashlib
 import warnings
-warnings.filterwarnings("ignore")
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
+
+from compact import read_frame
+from topk import k_smallest
 
 
 # -------------------------------------------------------------------------
@@ -39,17 +40,29 @@ MIN_FEAT_COVERAGE = 16   # require at least 16/18 non‑NA to build vector
 # -------------------------------------------------------------------------
 # 1.  Load & clean team‑season stats
 # -------------------------------------------------------------------------
-def load_team_year(path: str | Path, year: int) -> pd.DataFrame:
-    df = pd.read_json(path)
+def load_team_year(path: str | Path | pd.DataFrame, year: int, compact: bool = False) -> pd.DataFrame:
+    df = read_frame(path)
     df["year"] = year
-    df = df[["team", "year"] + FEATURES].copy()
+    df = df[["team", "year"] + FEATURES]          # column selection is already a new frame
     df[FEATURES] = df[FEATURES].apply(pd.to_numeric, errors="coerce")
+    if compact:
+        df[FEATURES] = df[FEATURES].astype(np.float32)
+        df["year"] = df["year"].astype(np.int16)
     return df
 
 
-def concat_team_stats(year_files: Dict[int, str | Path]) -> pd.DataFrame:
-    frames = [load_team_year(p, y) for y, p in year_files.items()]
-    return pd.concat(frames, ignore_index=True)
+def iter_team_stats(year_files: Dict[int, str | Path], compact: bool = False) -> Iterator[pd.DataFrame]:
+    """One season frame at a time (for StyleModel.fit_streaming)."""
+    for y, p in year_files.items():
+        yield load_team_year(p, y, compact)
+
+
+def concat_team_stats(year_files: Dict[int, str | Path], compact: bool = False) -> pd.DataFrame:
+    frames = [load_team_year(p, y, compact) for y, p in year_files.items()]
+    df = pd.concat(frames, ignore_index=True)
+    if compact:
+        df["team"] = df["team"].astype("category")
+    return df
 
 
 # -------------------------------------------------------------------------
@@ -58,14 +71,68 @@ def concat_team_stats(year_files: Dict[int, str | Path]) -> pd.DataFrame:
 class StyleModel:
     """Fit PCA on league‑wide data, keep μ/σ for z‑scoring per feature."""
     def __init__(self, n_pcs: int = N_PCS):
+        # sklearn is only needed once a model is built
+        from sklearn.decomposition import PCA
+        from sklearn.preprocessing import StandardScaler
+        self.n_pcs  = n_pcs
         self.scaler = StandardScaler()
         self.pca    = PCA(n_components=n_pcs)
 
     def fit(self, df_all: pd.DataFrame):
         X = df_all[FEATURES].fillna(df_all[FEATURES].mean())
-        self.scaler.fit(X)
-        Xz = self.scaler.transform(X)
-        self.pca.fit(Xz)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            self.scaler.fit(X)
+            Xz = self.scaler.transform(X)
+            self.pca.fit(Xz)
+
+    def fit_streaming(self, chunks: Callable[[], Iterable[pd.DataFrame]],
+                      min_batch: int = 256, exact: bool = True):
+        """Out-of-core `fit`: `chunks()` must return a fresh iterator of frames
+        (e.g. lambda: iter_team_stats(year_files)); only one chunk plus one
+        PCA batch is held at a time.
+
+        Pass 1 – running column means (NaN skipped, as DataFrame.mean)
+        Pass 2 – scaler.partial_fit on mean-filled chunks
+        Pass 3 – IncrementalPCA.partial_fit on the z-scored chunks
+
+        With `exact`, all components are tracked (vectors use the first
+        n_pcs), which reproduces the in-memory PCA; otherwise IncrementalPCA
+        keeps only n_pcs between batches (approximate, cheaper for very wide
+        inputs). The fitted model is a drop-in replacement for `fit` when
+        scoring.
+        """
+        from sklearn.decomposition import IncrementalPCA
+        from sklearn.preprocessing import StandardScaler
+        n_pcs = self.n_pcs
+        self.scaler = StandardScaler()              # partial_fit would extend a previous fit
+
+        total = np.zeros(len(FEATURES))
+        count = np.zeros(len(FEATURES))
+        for df in chunks():
+            X = df[FEATURES].to_numpy(dtype=float)
+            total += np.nansum(X, axis=0)
+            count += (~np.isnan(X)).sum(axis=0)
+        fill = dict(zip(FEATURES, total / np.where(count > 0, count, 1)))
+
+        n_track = len(FEATURES) if exact else n_pcs
+        ipca = IncrementalPCA(n_components=n_track)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for df in chunks():
+                self.scaler.partial_fit(df[FEATURES].fillna(fill))
+
+            # hold one full batch back so the last partial_fit is never too small
+            ready, buf = None, []
+            for df in chunks():
+                buf.append(self.scaler.transform(df[FEATURES].fillna(fill)))
+                if sum(len(b) for b in buf) >= max(min_batch, n_track):
+                    if ready is not None:
+                        ipca.partial_fit(ready)
+                    ready, buf = np.vstack(buf), []
+            ipca.partial_fit(np.vstack(([ready] if ready is not None else []) + buf))
+        self.pca = ipca
+        return self
 
     def vector(self, row: pd.Series) -> np.ndarray:
         """Return PCA vector (shape n_pcs,) or None if insufficient data."""
@@ -73,8 +140,22 @@ class StyleModel:
             return None
         mean_dict = dict(zip(FEATURES, self.scaler.mean_))
         x = row[FEATURES].fillna(mean_dict).values.reshape(1, -1)
-        xz = self.scaler.transform(x)
-        return self.pca.transform(xz).flatten()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")     # fitted with feature names
+            xz = self.scaler.transform(x)
+            return self.pca.transform(xz)[0, :self.n_pcs]
+
+    def vectors(self, df: pd.DataFrame) -> np.ndarray:
+        """`vector` for every row at once → (n, n_pcs); NaN rows where
+        coverage is insufficient."""
+        feats = df[FEATURES].apply(pd.to_numeric, errors="coerce")
+        ok = (feats.count(axis=1) >= MIN_FEAT_COVERAGE).to_numpy()
+        X = feats.fillna(dict(zip(FEATURES, self.scaler.mean_))).to_numpy(dtype=float)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            V = self.pca.transform(self.scaler.transform(X))[:, :self.n_pcs]
+        V[~ok] = np.nan
+        return V
 
 
 # -------------------------------------------------------------------------
@@ -111,14 +192,40 @@ def explain_stats(orig_row: pd.Series,
     return closest, furthest
 
 
+def explain_stats_matrix(df: pd.DataFrame,
+                         ill_mean_row: pd.Series,
+                         k: int = 3) -> Tuple[List[List[str]], List[List[str]]]:
+    """`explain_stats` for every row of `df` at once (team × FEATURES deltas).
+    NaN deltas are skipped, as nsmallest / nlargest do."""
+    n = len(df)
+    k = min(k, len(FEATURES))
+    if n == 0 or k <= 0:
+        return [[] for _ in range(n)], [[] for _ in range(n)]
+
+    X = df[FEATURES].to_numpy(dtype=float)
+    ref = ill_mean_row[FEATURES].to_numpy(dtype=float)
+    deltas = np.abs(X - ref)
+    missing = np.isnan(deltas)
+
+    near_idx = k_smallest(np.where(missing, np.inf, deltas), k)
+    far_idx = k_smallest(np.where(missing, np.inf, -deltas), k)
+    near_ok = ~np.take_along_axis(missing, near_idx, axis=1)
+    far_ok = ~np.take_along_axis(missing, far_idx, axis=1)
+
+    names = np.array(FEATURES, dtype=object)
+    closest = [names[i[ok]].tolist() for i, ok in zip(near_idx, near_ok)]
+    furthest = [names[i[ok]].tolist() for i, ok in zip(far_idx, far_ok)]
+    return closest, furthest
+
+
 # -------------------------------------------------------------------------
 # 6.  Main ranking function
 # -------------------------------------------------------------------------
 def rank_transfers(style_data: pd.DataFrame,
-                   transfers_path: str | Path,
+                   transfers_path: str | Path | pd.DataFrame,
                    ill_year_mean: pd.Series,
                    model: StyleModel) -> pd.DataFrame:
-    transfers = pd.read_json(transfers_path)
+    transfers = read_frame(transfers_path)
     transfers["year"] = transfers["origYear"] = transfers["rk"].apply(
         lambda _: 2025)   # <-- if your JSON lacks year col, set manually
 
@@ -131,23 +238,21 @@ def rank_transfers(style_data: pd.DataFrame,
         suffixes=("", "_team"),
     )
 
-    scores, similar, dissim = [], [], []
-
-    for _, row in merged.iterrows():
-        vec_orig = model.vector(row)
-        if vec_orig is None:
-            scores.append(0.0); similar.append([]); dissim.append([]); continue
+    # PCA vectors for every row in one transform; no vector → score 0
+    V = model.vectors(merged)
+    has_vec = ~np.isnan(V).any(axis=1)
+    with np.errstate(invalid="ignore"):
+        cos = V @ ill_ref_vec / (np.linalg.norm(V, axis=1) * np.linalg.norm(ill_ref_vec))
+    scores = np.where(has_vec, to_0_1(cos), 0.0)
 
-        score = to_0_1(cosine(vec_orig, ill_ref_vec))
-        scores.append(score)
-
-        sim_stats, diff_stats = explain_stats(row, ill_year_mean)
-        similar.append(sim_stats)
-        dissim.append(diff_stats)
+    # Explanations for all rows in one pass; rows without a vector get none
+    sim_stats, diff_stats = explain_stats_matrix(merged, ill_year_mean)
+    similar = [s if ok else [] for s, ok in zip(sim_stats, has_vec)]
+    dissim  = [d if ok else [] for d, ok in zip(diff_stats, has_vec)]
 
     merged["styleScore_raw"] = scores
-    merged["similarStats"]   = similar
-    merged["dissimilarStats"] = dissim
+    merged["similarStats"]   = pd.Series(similar, index=merged.index)
+    merged["dissimilarStats"] = pd.Series(dissim, index=merged.index)
 
     # Filter out Illinois players
     merged = merged[merged["team"] != "Illinois"].copy()
@@ -162,7 +267,137 @@ def rank_transfers(style_data: pd.DataFrame,
 
 
 # -------------------------------------------------------------------------
-# 7.  Example driver  (adjust file paths)
+# 7.  Team-season similarity matrix  (built once, cached on disk)
+# -------------------------------------------------------------------------
+class StyleSimilarity:
+    """Cosine similarity between every pair of team-seasons in PCA space.
+
+    Built with one normalised matrix product and kept as float32, either
+    full (n × n) or packed upper triangle. Each team-season also stores its
+    `max_k` nearest neighbours in descending order, so top-k lookups only
+    slice a precomputed list. from_files() caches the result next to the
+    team data, keyed on the input files, build options and model code.
+    """
+    def __init__(self, teams: np.ndarray, years: np.ndarray, sim: np.ndarray,
+                 neighbors: np.ndarray, packed: bool = False, fingerprint: str = ""):
+        self.teams, self.years = teams, years
+        self.sim, self.neighbors, self.packed = sim, neighbors, packed
+        self.fingerprint = fingerprint
+        self.n = len(teams)
+        self.index = {(t, int(y)): i for i, (t, y) in enumerate(zip(teams, years))}
+
+    @classmethod
+    def build(cls, teams_df: pd.DataFrame, model: StyleModel,
+              max_k: int = 50, packed: bool = False) -> "StyleSimilarity":
+        V = model.vectors(teams_df)
+        ok = ~np.isnan(V).any(axis=1)
+        V = V[ok]
+        U = (V / np.linalg.norm(V, axis=1, keepdims=True)).astype(np.float32)
+        S = U @ U.T
+
+        # neighbour table: top max_k per row, self excluded, best first
+        max_k = max(min(max_k, len(S) - 1), 0)
+        R = S.copy()
+        np.fill_diagonal(R, -np.inf)
+        if max_k > 0:
+            top = np.argpartition(-R, max_k - 1, axis=1)[:, :max_k]
+            order = np.argsort(-np.take_along_axis(R, top, axis=1), axis=1, kind="stable")
+            neighbors = np.take_along_axis(top, order, axis=1).astype(np.int32)
+        else:
+            neighbors = np.empty((len(S), 0), dtype=np.int32)
+
+        sim = S[np.triu_indices(len(S))] if packed else S
+        return cls(teams_df["team"].to_numpy()[ok].astype(str),
+                   teams_df["year"].to_numpy()[ok].astype(np.int32),
+                   sim, neighbors, packed)
+
+    @staticmethod
+    def fingerprint_of(year_files: Dict[int, str | Path], **options) -> str:
+        """SHA-1 of the team-data files, build options, PCA settings and this module."""
+        h = hashlib.sha1()
+        for y, p in sorted(year_files.items()):
+            h.update(str(y).encode())
+            h.update(Path(p).read_bytes())
+        h.update(repr(sorted(options.items())).encode())
+        h.update(Path(__file__).read_bytes())
+        return h.hexdigest()
+
+    @classmethod
+    def from_files(cls, year_files: Dict[int, str | Path], cache: str | Path | None = None,
+                   max_k: int = 50, packed: bool = False, n_pcs: int = N_PCS) -> "StyleSimilarity":
+        """Load the cached matrix if its inputs are unchanged, else fit and rebuild it.
+        Default cache: style-similarity.npz beside the newest team-data file."""
+        fp = cls.fingerprint_of(year_files, max_k=max_k, packed=packed, n_pcs=n_pcs)
+        cache = Path(cache) if cache else Path(year_files[max(year_files)]).parent / "style-similarity.npz"
+        if cache.exists():
+            sim = cls.load(cache)
+            if sim.fingerprint == fp:
+                return sim
+        teams_df = concat_team_stats(year_files)
+        model = StyleModel(n_pcs)
+        model.fit(teams_df)
+        sim = cls.build(teams_df, model, max_k=max_k, packed=packed)
+        sim.fingerprint = fp
+        sim.save(cache)
+        return sim
+
+    # --- persistence -----------------------------------------------------
+    def save(self, path: str | Path):
+        with open(path, "wb") as f:
+            np.savez(f, teams=self.teams, years=self.years, sim=self.sim,
+                     neighbors=self.neighbors, packed=self.packed,
+                     fingerprint=np.array(self.fingerprint))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "StyleSimilarity":
+        with np.load(path, allow_pickle=False) as z:
+            fp = str(z["fingerprint"]) if "fingerprint" in z.files else ""
+            return cls(z["teams"], z["years"], z["sim"], z["neighbors"], bool(z["packed"]), fp)
+
+    # --- lookups ---------------------------------------------------------
+    def _at(self, i: int, j: int) -> float:
+        if not self.packed:
+            return float(self.sim[i, j])
+        if i > j:
+            i, j = j, i
+        return float(self.sim[i * self.n - i * (i - 1) // 2 + (j - i)])
+
+    def _row(self, i: int) -> np.ndarray:
+        if not self.packed:
+            return self.sim[i].astype(float)
+        j = np.arange(self.n)
+        lo, hi = np.minimum(i, j), np.maximum(i, j)
+        return self.sim[lo * self.n - lo * (lo - 1) // 2 + (hi - lo)].astype(float)
+
+    def similarity(self, a: Tuple[str, int], b: Tuple[str, int]) -> float:
+        """Similarity (0‑1) between two (team, year) seasons."""
+        return to_0_1(self._at(self.index[a], self.index[b]))
+
+    def most_similar(self, team: str, year: int, k: int = 10,
+                     other_programs: bool = True) -> List[Tuple[str, int, float]]:
+        """Top-k (team, year, similarity 0‑1) for `team` in `year`.
+        With `other_programs`, the team's own other seasons are skipped."""
+        i = self.index[(team, year)]
+        out = []
+        for j in self.neighbors[i]:
+            if other_programs and self.teams[j] == team:
+                continue
+            out.append((str(self.teams[j]), int(self.years[j]), to_0_1(self._at(i, j))))
+            if len(out) == k:
+                return out
+
+        # precomputed list exhausted → fall back to a scan of the full row
+        row = self._row(i)
+        row[i] = -np.inf
+        if other_programs:
+            row[self.teams == team] = -np.inf
+        order = np.argsort(-row, kind="stable")[:k]
+        return [(str(self.teams[j]), int(self.years[j]), to_0_1(float(row[j])))
+                for j in order if np.isfinite(row[j])]
+
+
+# -------------------------------------------------------------------------
+# 8.  Example driver  (adjust file paths)
 # -------------------------------------------------------------------------
 if __name__ == "__main__":
     YEAR_FILES = {
@@ -186,21 +421,17 @@ if __name__ == "__main__":
     # 3. Illinois reference vector in PCA space
     ill_ref_vec = illinois_reference(teams_df, style_model)
 
-    # Output teams ranked by similarity to Illinois
-    team_vectors = []
-    for _, row in teams_df.iterrows():
-        if row["team"] == "Illinois":
-            continue
-        vec = style_model.vector(row)
-        if vec is not None:
-            sim = to_0_1(cosine(vec, ill_ref_vec))
-            team_vectors.append((row["team"], sim))
-    # Get the most recent year for each team
-    team_latest = {}
-    for team, sim in team_vectors:
-        if team not in team_latest or sim > team_latest[team]:
-            team_latest[team] = sim
-    sorted_teams = sorted(team_latest.items(), key=lambda x: x[1], reverse=True)
+    # Output teams ranked by similarity to Illinois (best season per team)
+    V = style_model.vectors(teams_df)
+    sims = to_0_1(V @ ill_ref_vec / (np.linalg.norm(V, axis=1) * np.linalg.norm(ill_ref_vec)))
+    team_sims = (
+        pd.Series(sims, index=teams_df["team"])
+        .drop("Illinois", errors="ignore")
+        .dropna()
+        .groupby(level=0, sort=False).max()
+        .sort_values(ascending=False, kind="stable")
+    )
+    sorted_teams = list(team_sims.items())
     print("Top 25 teams most similar to Illinois (by style):")
     for team, sim in sorted_teams[:25]:
         print(f"{team}: {sim:.3f}")
@@ -218,6 +449,12 @@ if __name__ == "__main__":
     else:
         print("\nUSC not found in the team similarity list.")
 
+    # Cached season-to-season matrix for "programs like X in year Y"
+    similarity = StyleSimilarity.from_files(YEAR_FILES)
+    print("\nPrograms most similar to Illinois 2025:")
+    for team, yr, sim in similarity.most_similar("Illinois", 2025, k=10):
+        print(f"{team} {yr}: {sim:.3f}")
+
     # 4. Rank 2025 portal players
     ranked = rank_transfers(
         teams_df,
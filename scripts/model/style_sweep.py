@@ -0,0 +1,138 @@
+# style_sweep.py  – N_PCS × MIN_FEAT_COVERAGE sweep from one SVD
+# -------------------------------------------------------------
+#   • Standardise the team-season matrix exactly like StyleModel.fit
+#     (mean-fill, z-score) and take ONE full SVD
+#   • Every component count n is a slice of the same right singular
+#     vectors: projections, the Illinois reference and the norms are
+#     cumulative sums over components → cosine for all n in one pass
+#   • Coverage only decides which rows get a vector (transfers and the
+#     Illinois seasons feeding the reference) → a mask per setting
+#   • Report per (n_pcs, coverage):
+#       explained variance, players scored, Kendall τ / top-K overlap
+#       and worst top-K rank shift vs the current setting
+#     A coverage no Illinois season reaches has no reference vector:
+#     flagged (illinoisSeasons = 0), metrics left NaN
+# -------------------------------------------------------------
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import kendalltau
+
+import style_fit as sf
+
+TOP_K = 50
+
+
+def standardize(teams_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(Xz, mean, scale) as StandardScaler on the mean-filled features."""
+    X = teams_df[sf.FEATURES].to_numpy(dtype=float)
+    mean = np.nanmean(X, axis=0)
+    Xf = np.where(np.isnan(X), mean, X)
+    scale = Xf.std(axis=0)
+    scale = np.where(scale > 0, scale, 1.0)
+    return (Xf - mean) / scale, mean, scale
+
+
+def sweep_scores(teams_df: pd.DataFrame, rows: pd.DataFrame,
+                 n_pcs: Iterable[int], coverages: Iterable[int]) -> Dict:
+    """Raw style cosines of `rows` (origin team-season features) for every
+    (coverage, n_pcs) setting → dict with arrays shaped (coverage, n, rows)."""
+    n_pcs, coverages = list(n_pcs), list(coverages)
+    Xz, mean, scale = standardize(teams_df)
+    centre = Xz.mean(axis=0)
+    _, S, Vt = np.linalg.svd(Xz - centre, full_matrices=False)
+    explained = np.cumsum(S ** 2) / np.sum(S ** 2)
+
+    def project(df):
+        F = df[sf.FEATURES].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+        count = (~np.isnan(F)).sum(axis=1)
+        Z = (np.where(np.isnan(F), mean, F) - mean) / scale
+        return (Z - centre) @ Vt.T, count
+
+    P, count = project(rows)
+    P_ill, count_ill = project(teams_df[teams_df["team"] == "Illinois"])
+    cum_norm = np.sqrt(np.cumsum(P ** 2, axis=1))
+
+    cos = np.full((len(coverages), len(n_pcs), len(rows)), np.nan)
+    ill_seasons = [int((count_ill >= c).sum()) for c in coverages]
+    for ci, c in enumerate(coverages):
+        if not ill_seasons[ci]:
+            continue                                    # no reference → no scores
+        ref = P_ill[count_ill >= c].mean(axis=0)
+        dots = np.cumsum(P * ref, axis=1)
+        denom = cum_norm * np.sqrt(np.cumsum(ref ** 2))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            all_n = dots / denom
+        all_n[count < c] = np.nan
+        cos[ci] = all_n[:, np.array(n_pcs) - 1].T
+    return {"cos": cos, "n_pcs": n_pcs, "coverages": coverages, "illinoisSeasons": ill_seasons,
+            "explained": explained[np.array(n_pcs) - 1]}
+
+
+def style_scores(cos: np.ndarray, keep: np.ndarray) -> np.ndarray:
+    """rank_transfers normalisation over the last axis: no vector → 0, ÷ max of kept rows."""
+    raw = np.nan_to_num(sf.to_0_1(cos))
+    hi = raw[..., keep].max(axis=-1, keepdims=True)
+    return raw / np.where(hi > 0, hi, 1.0)
+
+
+def sweep(teams_df: pd.DataFrame, rows: pd.DataFrame, keep: np.ndarray,
+          n_pcs: Iterable[int] = range(2, 13), coverages: Iterable[int] = range(12, 18),
+          base: Tuple[int, int] = (sf.N_PCS, sf.MIN_FEAT_COVERAGE),
+          top_k: int = TOP_K) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Report + style scores (coverage × n_pcs × kept rows) for every setting."""
+    n_pcs, coverages = sorted(set(n_pcs) | {base[0]}), sorted(set(coverages) | {base[1]})
+    res = sweep_scores(teams_df, rows, n_pcs, coverages)
+    if not res["illinoisSeasons"][coverages.index(base[1])]:
+        raise ValueError(f"no Illinois season has {base[1]} features: no reference for the current setting")
+    scores = style_scores(res["cos"], keep)[..., keep]
+
+    ref = scores[coverages.index(base[1]), n_pcs.index(base[0])]
+    ref_rank = np.empty(len(ref), dtype=int)
+    ref_rank[np.argsort(-ref, kind="stable")] = np.arange(len(ref))
+    top = np.argsort(-ref, kind="stable")[:top_k]
+
+    report = []
+    for ci, c in enumerate(coverages):
+        for ni, n in enumerate(n_pcs):
+            row = {"n_pcs": n, "coverage": c, "explainedVar": res["explained"][ni],
+                   "illinoisSeasons": res["illinoisSeasons"][ci]}
+            if not row["illinoisSeasons"]:
+                report.append({**row, "scored": 0, "tau": np.nan, "topKOverlap": np.nan,
+                               "maxTopKShift": np.nan, "current": False})
+                continue
+            s = scores[ci, ni]
+            rank = np.empty(len(s), dtype=int)
+            rank[np.argsort(-s, kind="stable")] = np.arange(len(s))
+            tau = kendalltau(ref, s).statistic if len(s) > 1 else 1.0
+            report.append({
+                **row,
+                "scored": int(np.isfinite(res["cos"][ci, ni][keep]).sum()),
+                "tau": float(tau),
+                "topKOverlap": len(set(top) & set(np.flatnonzero(rank < top_k))) / max(len(top), 1),
+                "maxTopKShift": int(np.abs(rank[top] - ref_rank[top]).max()) if len(top) else 0,
+                "current": (n, c) == tuple(base),
+            })
+    return pd.DataFrame(report), scores
+
+
+def sweep_from_files(year: int = 2025, data_dir: str | Path = "data", **kw):
+    """Transfers joined to their origin team-season as rank_transfers does."""
+    data_dir = Path(data_dir)
+    teams_df = sf.concat_team_stats({y: data_dir / f"team-data-{y}.json" for y in range(year - 3, year + 1)})
+    tr = pd.read_json(data_dir / f"transfer-players-{year + 1}.json")
+    rows = tr.assign(origYear=year).merge(teams_df, how="left", left_on=["team", "origYear"],
+                                          right_on=["team", "year"], suffixes=("", "_team"))
+    keep = (rows["team"] != "Illinois").to_numpy()
+    report, scores = sweep(teams_df, rows, keep, **kw)
+    return report, scores, rows.loc[keep, "player"].to_numpy()
+
+
+# ------------------------------------------------------------------------
+# Example driver
+# ------------------------------------------------------------------------
+if __name__ == "__main__":
+    report, _, _ = sweep_from_files(2025, "data")
+    print(report.to_string(index=False))
@@ -13,6 +13,8 @@ from typing import Dict, List
 import numpy as np
 import pandas as pd
 
+from compact import read_frame
+
 # ------------------------------------------------------------------------
 # 0.  Configuration
 # ------------------------------------------------------------------------
@@ -50,18 +52,19 @@ def map_role(role: str) -> str:
             return bucket
     return "Unknown"
 
-def load_df(path: str | Path, roster=False) -> pd.DataFrame:
-    df = pd.read_json(path)
+def load_df(path: str | Path | pd.DataFrame, roster=False, compact=False) -> pd.DataFrame:
+    df = read_frame(path, compact)
     num_cols = ["minPct", "bpm", "ortg", "usg", "efg"]
     df[num_cols] = df[num_cols].apply(pd.to_numeric, errors="coerce")
-    df["heightIn"] = df["height"].apply(_to_inches)
+    df["heightIn"] = df["height"].apply(_to_inches).astype(float)
     df["posBucket"] = df["role"].apply(map_role)
     if roster:
         df["bpm"] = df["bpm"].fillna(0)
     return df
 
-def departures(roster: pd.DataFrame) -> pd.DataFrame:
-    mask = (roster["leftAfterSeason"] == True) & (roster["minPct"] >= MIN_MIN_PCT)
+def departures(roster: pd.DataFrame, min_min_pct: float | None = None) -> pd.DataFrame:
+    min_min_pct = MIN_MIN_PCT if min_min_pct is None else min_min_pct
+    mask = (roster["leftAfterSeason"] == True) & (roster["minPct"] >= min_min_pct)
     dep = roster.loc[mask].copy()
     dep["importance"] = dep["minPct"]/100 * dep["bpm"].clip(lower=0)
     return dep
@@ -85,8 +88,8 @@ def _sim_row_to_row(a: pd.Series, b: pd.Series, stats) -> float:
 # ------------------------------------------------------------------------
 # 3.  Main scoring routine
 # ------------------------------------------------------------------------
-def score_transfers(departed_roster_path, transfer_path):
-    roster      = load_df(departed_roster_path, roster=True)
+def score_transfers(departed_roster_path, transfer_path, compact=False):
+    roster      = load_df(departed_roster_path, roster=True, compact=compact)
     dep_players = departures(roster)
 
     # Positional urgency (sums to 1.0)
@@ -96,7 +99,7 @@ def score_transfers(departed_roster_path, transfer_path):
     ).to_dict()
 
     # Combine transfers + departures to get reference mean/std for z-scores
-    transfers   = load_df(transfer_path)
+    transfers   = load_df(transfer_path, compact=compact)
     ref_stats   = pd.concat([transfers[FEATURES], dep_players[FEATURES]],
                             ignore_index=True)
     feat_stats  = {f: (ref_stats[f].mean(skipna=True),
@@ -143,7 +146,142 @@ def score_transfers(departed_roster_path, transfer_path):
     return transfers.sort_values("needScore", ascending=False)[cols]
 
 # ------------------------------------------------------------------------
-# 4.  Example driver  (adjust paths as needed)
+# 4.  What-if departure scenarios
+# ------------------------------------------------------------------------
+def aggregate_need(M: np.ndarray, sim: np.ndarray, importance: np.ndarray,
+                   cand_onehot: np.ndarray, names: np.ndarray, tr_b: np.ndarray,
+                   same_bucket: np.ndarray, keep: np.ndarray,
+                   urgency_power: float = URGENCY_POWER):
+    """Core of NeedScenarios.evaluate_many on plain arrays.
+    M: (scenario × candidate) departed mask; sim: (transfer × candidate),
+    or (scenario × transfer × candidate) when it differs per scenario."""
+    imp   = M * importance
+    total = imp.sum(axis=1, keepdims=True)
+    urg_b = np.divide(imp @ cand_onehot, total,
+                      out=np.zeros((len(M), cand_onehot.shape[1])), where=total > 0)
+    urg   = np.where(tr_b >= 0, urg_b[:, np.clip(tr_b, 0, None)], 0.0)
+
+    eligible = M[:, None, :] & same_bucket[None, :, :]
+    masked   = np.where(eligible, sim if sim.ndim == 3 else sim[None, :, :], -np.inf)
+    best_idx = masked.argmax(axis=2)
+    best_sim = np.take_along_axis(masked, best_idx[..., None], axis=2)[..., 0]
+
+    valid   = (urg > 0) & eligible.any(axis=2)
+    raw     = np.where(valid, urg ** urgency_power * np.where(valid, best_sim, 0.0), 0.0)
+    matched = np.where(valid, names[best_idx], None)
+
+    hi = np.where(keep, raw, -np.inf).max(axis=1, keepdims=True)
+    hi = np.where(hi > 0, hi, 1.0)
+    return raw / hi, matched
+
+
+class NeedScenarios:
+    """Re-score Team-Need for alternative sets of departures.
+
+    Similarity of every transfer to every roster player who could leave
+    (minPct ≥ MIN_MIN_PCT) is computed once. A scenario then only needs the
+    positional urgency and a max over its departed players' columns. The
+    z-score reference (transfers + the roster file's departures) is kept
+    fixed across scenarios.
+    """
+    def __init__(self, departed_roster_path, transfer_path):
+        roster    = load_df(departed_roster_path, roster=True)
+        transfers = load_df(transfer_path)
+        base_dep  = departures(roster)
+
+        ref_stats  = pd.concat([transfers[FEATURES], base_dep[FEATURES]], ignore_index=True)
+        feat_stats = {f: (ref_stats[f].mean(skipna=True),
+                          ref_stats[f].std(skipna=True)) for f in FEATURES}
+
+        cand = roster.loc[roster["minPct"] >= MIN_MIN_PCT].reset_index(drop=True)
+        cand["importance"] = cand["minPct"]/100 * cand["bpm"].clip(lower=0)
+        self.candidates = cand
+        self.baseline   = set(base_dep["name"])
+        self.roster_names = set(roster["name"])
+        self.transfers  = transfers
+
+        # (transfer × candidate) similarity, NaN features skipped pairwise
+        self.feat_stats = feat_stats
+        self.zc  = self._z(cand[FEATURES].to_numpy(dtype=float), feat_stats)
+        self.sim = self.similarity(transfers[FEATURES].to_numpy(dtype=float))
+
+        self.buckets   = sorted(set(cand["posBucket"]))
+        cand_b         = cand["posBucket"].map({b: i for i, b in enumerate(self.buckets)}).to_numpy()
+        self.cand_onehot = np.eye(len(self.buckets))[cand_b] if len(cand) else np.zeros((0, 0))
+        tr_bucket      = transfers["role"].apply(map_role)
+        self.tr_b      = tr_bucket.map({b: i for i, b in enumerate(self.buckets)}).fillna(-1).astype(int).to_numpy()
+        self.same_bucket = self.tr_b[:, None] == cand_b[None, :]
+        self.keep      = (transfers["team"] != "Illinois").to_numpy()
+
+    @staticmethod
+    def _z(X: np.ndarray, feat_stats) -> np.ndarray:
+        cols = []
+        for j, f in enumerate(FEATURES):
+            mu, sd = feat_stats[f]
+            x = X[:, j]
+            cols.append((x - mu) / sd if sd > 0 else np.where(np.isnan(x), np.nan, 0.0))
+        return np.column_stack(cols)
+
+    def distances(self, X: np.ndarray) -> np.ndarray:
+        """(transfer × candidate × feature) |Δz| for raw transfer stats X
+        (rows aligned with self.transfers, columns = FEATURES); NaN where
+        either side is missing."""
+        return np.abs(self._z(X, self.feat_stats)[:, None, :] - self.zc[None, :, :])
+
+    @staticmethod
+    def similarity_from(D: np.ndarray, weights: Dict[str, float] | None = None) -> np.ndarray:
+        """exp(−Σ w·|Δz|) over the last axis of a distance tensor, NaN skipped."""
+        weights = FEAT_WEIGHTS if weights is None else weights
+        w = np.array([weights[f] for f in FEATURES])
+        return np.exp(-np.nansum(D * w, axis=-1))
+
+    def similarity(self, X: np.ndarray, weights: Dict[str, float] | None = None) -> np.ndarray:
+        """(transfer × candidate) similarity for raw transfer stats X."""
+        return self.similarity_from(self.distances(X), weights)
+
+    def departed_set(self, returning=(), leaving=()) -> set:
+        """Baseline departures with `returning` removed and `leaving` added.
+        Names must be on the roster; fringe players below MIN_MIN_PCT are
+        accepted but do not change the scores."""
+        unknown = sorted((set(returning) | set(leaving)) - self.roster_names)
+        if unknown:
+            raise KeyError(f"not on the roster: {', '.join(unknown)}")
+        return (self.baseline - set(returning)) | set(leaving)
+
+    def evaluate_many(self, scenarios: List[set], sim: np.ndarray | None = None,
+                      urgency_power: float = URGENCY_POWER):
+        """Need scores for many departure sets at once.
+        Returns (needScore [n_scen × n_transfers], matchedTo names, same shape).
+        `sim` overrides the cached similarity matrix (e.g. perturbed stats)."""
+        sim = self.sim if sim is None else sim
+        names = self.candidates["name"].to_numpy()
+        shape = (len(scenarios), len(self.transfers))
+        if not len(names):
+            return np.zeros(shape), np.full(shape, None, dtype=object)
+        # (scenario, name) pairs in one sorted lookup; non-candidate names are ignored
+        uniq, inv = np.unique(names.astype(str), return_inverse=True)
+        flat = np.array([n for sc in scenarios for n in sc], dtype=str)
+        rows = np.repeat(np.arange(len(scenarios)), [len(sc) for sc in scenarios])
+        pos  = np.minimum(np.searchsorted(uniq, flat), len(uniq) - 1)
+        hit  = uniq[pos] == flat
+        M = np.zeros((len(scenarios), len(uniq)), dtype=bool)
+        M[rows[hit], pos[hit]] = True
+        M = M[:, inv]
+        return aggregate_need(M, sim, self.candidates["importance"].to_numpy(), self.cand_onehot,
+                              names, self.tr_b, self.same_bucket, self.keep, urgency_power)
+
+    def evaluate(self, departed: set) -> pd.DataFrame:
+        """One scenario, in the same shape as score_transfers."""
+        need, matched = self.evaluate_many([departed])
+        out = self.transfers.assign(needScore=need[0], matchedTo=matched[0])
+        out = out[self.keep]
+        cols = ["player", "team", "role", "heightIn", "bpm",
+                "needScore", "matchedTo"]
+        return out.sort_values("needScore", ascending=False)[cols]
+
+
+# ------------------------------------------------------------------------
+# 5.  Example driver  (adjust paths as needed)
 # ------------------------------------------------------------------------
 if __name__ == "__main__":
     ranked = score_transfers(
@@ -60,12 +60,14 @@ def _add_ppg(player: dict) -> dict:
 # Main
 # ──────────────────────────────────────────────────────────────────────────────
 
-def main() -> None:
-    if len(sys.argv) != 2:
-        print("Usage: python add_ppg.py path/to/players.json")
-        sys.exit(1)
-
-    path = Path(sys.argv[1])
+def main(path: str | None = None) -> None:
+    if path is None:
+        if len(sys.argv) != 2:
+            print("Usage: python add_ppg.py path/to/players.json")
+            sys.exit(1)
+        path = sys.argv[1]
+
+    path = Path(path)
     if not path.exists():
         sys.exit(f"Error: {path} not found.")
 
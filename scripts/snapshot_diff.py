@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+snapshot_diff.py – what changed between two scrapes of the portal files
+
+Usage:
+    python scripts/snapshot_diff.py [--year 2026] [--data-dir data] [--state-dir data/snapshots] [--no-rotate]
+                                    [--keep 48]
+
+- Compares data/transfer-players-{year}.json and data/transfers-247sports-{year}.json
+  with the copies kept from the previous run in --state-dir, keyed by player.
+- Writes a compact change set to <state-dir>/changes-<UTC timestamp>.json:
+    added / removed keys, status or commitment changes (247), and
+    field-level stat corrections.
+- Then rotates the new snapshots into --state-dir (skip with --no-rotate).
+- Only the newest --keep change sets are kept.
+- A key that repeats within one file is reported with a warning; the
+  first record wins.
+- The first run (no previous snapshot) reports every player as added.
+- Standard library only.
+"""
+import argparse
+import json
+import math
+import shutil
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Key = Tuple[str, str]
+
+SOURCES = {
+    # name → (file pattern, key fields, status fields)
+    "transfer-players": ("transfer-players-{year}.json", ("player", "team"), ()),
+    "transfers-247sports": ("transfers-247sports-{year}.json", ("name", "sourceSchool"),
+                            ("status", "destinationSchool")),
+}
+FLOAT_TOL = 1e-9
+KEEP = 48                        # change sets kept, like the delta feed's patches
+
+
+def _norm(v: Any) -> str:
+    return " ".join(str(v or "").lower().split())
+
+
+def key_fn(fields: Tuple[str, str]) -> Callable[[Dict], Key]:
+    return lambda rec: tuple(_norm(rec.get(f)) for f in fields)
+
+
+def _same(a: Any, b: Any) -> bool:
+    if isinstance(a, float) and isinstance(b, float):
+        if math.isnan(a) and math.isnan(b):
+            return True
+        return abs(a - b) <= FLOAT_TOL * max(1.0, abs(a), abs(b))
+    return a == b
+
+
+def index_records(records: List[Dict], key: Callable[[Dict], Key]) -> Dict[Key, Dict]:
+    """Key → record; the first record wins if a key repeats (with a warning)."""
+    out: Dict[Key, Dict] = {}
+    dup: List[Key] = []
+    for rec in records:
+        k = key(rec)
+        if k in out:
+            dup.append(k)
+        else:
+            out[k] = rec
+    if dup:
+        warnings.warn(f"{len(dup)} repeated key(s), first record kept: "
+                      f"{', '.join('/'.join(k) for k in dup[:5])}{' …' if len(dup) > 5 else ''}",
+                      stacklevel=2)
+    return out
+
+
+def diff_records(old: List[Dict], new: List[Dict], key: Callable[[Dict], Key],
+                 status_fields: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """Change set between two snapshots of the same source."""
+    old_ix, new_ix = index_records(old, key), index_records(new, key)
+
+    added = [k for k in new_ix if k not in old_ix]
+    removed = [k for k in old_ix if k not in new_ix]
+    status, stats = [], []
+    for k, rec in new_ix.items():
+        prev = old_ix.get(k)
+        if prev is None:
+            continue
+        changed = {f: [prev.get(f), rec.get(f)]
+                   for f in set(prev) | set(rec)
+                   if not _same(prev.get(f), rec.get(f))}
+        st = {f: changed.pop(f) for f in status_fields if f in changed}
+        if st:
+            status.append({"key": list(k), "changes": st})
+        if changed:
+            stats.append({"key": list(k), "changes": changed})
+
+    return {
+        "added": [new_ix[k] for k in added],
+        "removed": [list(k) for k in removed],
+        "statusChanges": status,
+        "statCorrections": stats,
+        "counts": {"old": len(old_ix), "new": len(new_ix), "added": len(added),
+                   "removed": len(removed), "statusChanges": len(status),
+                   "statCorrections": len(stats)},
+    }
+
+
+def changed_names(changes: Dict[str, Dict]) -> set:
+    """Lower-cased player names touched by a change set (all sources)."""
+    names = set()
+    for cs in changes.values():
+        for rec in cs["added"]:
+            names.add(_norm(rec.get("player") or rec.get("name")))
+        for part in ("statusChanges", "statCorrections"):
+            names.update(item["key"][0] for item in cs[part])
+        names.update(k[0] for k in cs["removed"])
+    return names
+
+
+def _load(path: Path) -> Optional[List[Dict]]:
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def diff_snapshots(year: int, data_dir: Path, state_dir: Path) -> Dict[str, Dict]:
+    changes = {}
+    for name, (pattern, key_fields, status_fields) in SOURCES.items():
+        new = _load(data_dir / pattern.format(year=year))
+        if new is None:
+            continue
+        old = _load(state_dir / pattern.format(year=year)) or []
+        changes[name] = diff_records(old, new, key_fn(key_fields), status_fields)
+    return changes
+
+
+def rotate(year: int, data_dir: Path, state_dir: Path):
+    for pattern, _, _ in SOURCES.values():
+        src = data_dir / pattern.format(year=year)
+        if src.exists():
+            shutil.copy2(src, state_dir / src.name)
+
+
+def prune(state_dir: Path, keep: int = KEEP):
+    """Delete all but the newest `keep` change sets (names sort by time)."""
+    for old in sorted(state_dir.glob("changes-*.json"))[:-keep]:
+        old.unlink(missing_ok=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff scraped portal snapshots against the previous run.")
+    parser.add_argument("--year", type=int, default=2026, help="Portal class year (default: 2026)")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--state-dir", default="data/snapshots")
+    parser.add_argument("--no-rotate", action="store_true", help="Keep the previous snapshots in place")
+    parser.add_argument("--keep", type=int, default=KEEP, help=f"Change sets kept (default: {KEEP})")
+    args = parser.parse_args(argv)
+    if args.keep < 1:
+        parser.error("--keep must be at least 1")
+
+    data_dir, state_dir = Path(args.data_dir), Path(args.state_dir)
+    state_dir.mkdir(parents=True, exist_ok=True)
+    changes = diff_snapshots(args.year, data_dir, state_dir)
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    out_fp = state_dir / f"changes-{stamp}.json"
+    with open(out_fp, "w", encoding="utf-8") as f:
+        json.dump(changes, f, indent=2, ensure_ascii=False)
+
+    for name, cs in changes.items():
+        c = cs["counts"]
+        print(f"{name}: +{c['added']} -{c['removed']} status {c['statusChanges']} "
+              f"stats {c['statCorrections']} ({c['old']} → {c['new']})")
+    print(f"Wrote change set to {out_fp}")
+    prune(state_dir, args.keep)
+
+    if not args.no_rotate:
+        rotate(args.year, data_dir, state_dir)
+    return changes
+
+
+if __name__ == "__main__":
+    main()
@@ -3,21 +3,31 @@ summarize_players.py
 
 Usage:
     python summarize_players.py [path/to/players.json] [--model MODEL] [--examples path/to/examples.jsonl]
+                                [--priority fitScore] [--tier-size 25] [--max-calls N] [--max-cost USD]
+                                [--deadline SECONDS]
 
 - Modifies the input JSON file in-place, adding Illini fit summaries for each player lacking them.
 - If no path is given, defaults to frontend/public/transfer-players-2026-merged.json
+- Players are summarised highest --priority first (default: fitScore); the file is
+  re-published after every --tier-size summaries, so the top tier is live first.
+- Stops early (publishing what is done) at --max-calls, --max-cost (estimated from
+  token usage) or --deadline seconds after start.
+- Bulk mode (no live calls, no API key needed):
+    --bulk-write requests.jsonl   one chat-completions request per pending player
+                                  (Batch API format, custom_id = hash of player/team;
+                                  a repeated player/team is requested once)
+    --bulk-ingest results.jsonl   parse the batch output and merge it in one pass
 - Requires the environment variable OPENAI_API_KEY to be set.
 - Only standard library and openai are required (see requirements.txt).
 - Exits non-zero on bad CLI args or missing key.
 """
 import argparse
+import hashlib
 import json
 import os
 import sys
 import time
-from typing import List, Dict, Any, Optional
-
-import openai
+from typing import Callable, List, Dict, Any, Optional, Tuple
 
 TEAM_CONTEXT = (
     "Illinois runs 5‑out ‘air‑raid’ spacing (47 % 3PA) with heavy rim pressure & O‑boards.\n"
@@ -39,18 +49,33 @@ PAUSE_BETWEEN_CALLS = 0.4
 MODEL_DEFAULT = "gpt-4o-mini"
 DEFAULT_JSON_PATH = "frontend/public/transfer-players-2026-merged.json"
 
+PRIORITY_DEFAULT = "fitScore"
+TIER_SIZE = 25
+# USD per 1M tokens (input, output), for --max-cost
+PRICES = {"gpt-4o-mini": (0.15, 0.60), "gpt-4o": (2.50, 10.00)}
+
 
 def fail(msg: str, code: int = 1):
     print(f"Error: {msg}", file=sys.stderr)
     sys.exit(code)
 
 
-def parse_args():
+def parse_args(argv: Optional[List[str]] = None):
     parser = argparse.ArgumentParser(description="Generate Illini fit summaries for players.")
     parser.add_argument("json_path", nargs="?", default=DEFAULT_JSON_PATH, help="Path to players.json (default: frontend/public/transfer-players-2026-merged.json)")
     parser.add_argument("--model", default=MODEL_DEFAULT, help="OpenAI model (default: gpt-4o-mini)")
     parser.add_argument("--examples", help="Optional path to examples.jsonl")
-    return parser.parse_args()
+    parser.add_argument("--priority", default=PRIORITY_DEFAULT, help="Numeric player field, highest first (default: fitScore)")
+    parser.add_argument("--tier-size", type=int, default=TIER_SIZE, help="Publish after this many summaries (default: 25)")
+    parser.add_argument("--max-calls", type=int, help="Stop after this many API calls")
+    parser.add_argument("--max-cost", type=float, help="Stop once the estimated spend reaches this many USD")
+    parser.add_argument("--price", type=float, nargs=2, metavar=("IN", "OUT"),
+                        help="USD per 1M input / output tokens (default: known model prices)")
+    parser.add_argument("--deadline", type=float, help="Stop starting new calls after this many seconds")
+    bulk = parser.add_mutually_exclusive_group()
+    bulk.add_argument("--bulk-write", metavar="REQUESTS_JSONL", help="Write pending prompts as a batch request file and exit")
+    bulk.add_argument("--bulk-ingest", metavar="RESULTS_JSONL", help="Merge a batch results file into the players JSON")
+    return parser.parse_args(argv)
 
 
 def load_json(path: str) -> Any:
@@ -59,8 +84,11 @@ def load_json(path: str) -> Any:
 
 
 def save_json(path: str, data: Any):
-    with open(path, "w", encoding="utf-8") as f:
+    # write-then-rename: readers never see a half-written file
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
 
 
 def load_examples(path: str) -> List[Dict[str, Any]]:
@@ -91,14 +119,17 @@ def build_messages(player: Dict[str, Any], examples: Optional[List[Dict[str, Any
     return messages
 
 
-def call_openai(messages: List[Dict[str, str]], model: str) -> str:
-    response = openai.chat.completions.create(
-        model=model,
-        messages=messages,
-        temperature=0.2,
-        max_tokens=256,
-    )
-    return response.choices[0].message.content.strip()
+def completion_body(messages: List[Dict[str, str]], model: str) -> Dict[str, Any]:
+    return {"model": model, "messages": messages, "temperature": 0.2, "max_tokens": 256}
+
+
+def complete(messages: List[Dict[str, str]], model: str) -> Tuple[str, int, int]:
+    """Summary text plus (prompt, completion) token counts."""
+    import openai  # deferred: only live calls need the client
+    response = openai.chat.completions.create(**completion_body(messages, model))
+    usage = response.usage
+    return (response.choices[0].message.content.strip(),
+            getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0)
 
 
 def parse_bullets(raw: str) -> List[Dict[str, str]]:
@@ -124,9 +155,165 @@ def parse_bullets(raw: str) -> List[Dict[str, str]]:
     return bullets
 
 
-def main():
-    args = parse_args()
-    api_key = API_KEY
+def has_summary(player: Dict[str, Any]) -> bool:
+    return "fitSummary" in player and "fitSummaryStruct" in player
+
+
+def schedule(players: List[Dict[str, Any]], priority: str = PRIORITY_DEFAULT) -> List[int]:
+    """Indices of players still lacking a summary, highest `priority` first
+    (missing / non-numeric priority last, file order breaks ties)."""
+    def key(idx):
+        v = players[idx].get(priority)
+        numeric = isinstance(v, (int, float)) and not isinstance(v, bool) and v == v
+        return -v if numeric else float("inf")
+    return sorted((i for i, p in enumerate(players) if not has_summary(p)), key=key)
+
+
+class Budget:
+    """Call / spend / wall-clock limits; `exhausted()` before each call."""
+    def __init__(self, max_calls: Optional[int] = None, max_cost: Optional[float] = None,
+                 price: Optional[Tuple[float, float]] = None, deadline: Optional[float] = None):
+        self.max_calls, self.max_cost, self.price = max_calls, max_cost, price
+        self.stop_at = time.monotonic() + deadline if deadline is not None else None
+        self.calls, self.cost, self.last_cost = 0, 0.0, 0.0
+
+    def charge(self, tokens_in: int, tokens_out: int):
+        self.calls += 1
+        if self.price:
+            self.last_cost = (tokens_in * self.price[0] + tokens_out * self.price[1]) / 1e6
+            self.cost += self.last_cost
+
+    def exhausted(self) -> Optional[str]:
+        if self.max_calls is not None and self.calls >= self.max_calls:
+            return f"call budget ({self.max_calls}) reached"
+        # stop if the next call, costed like the last one, would overshoot
+        if self.max_cost is not None and self.cost + self.last_cost > self.max_cost:
+            return f"cost budget (${self.max_cost:.2f}) reached"
+        if self.stop_at is not None and time.monotonic() >= self.stop_at:
+            return "deadline reached"
+        return None
+
+
+def summarize(players: List[Dict[str, Any]], model: str,
+              examples: Optional[List[Dict[str, Any]]] = None,
+              priority: str = PRIORITY_DEFAULT, tier_size: int = TIER_SIZE,
+              budget: Optional[Budget] = None,
+              publish: Callable[[List[Dict[str, Any]]], None] = lambda players: None,
+              call: Callable[[List[Dict[str, str]], str], Tuple[str, int, int]] = complete) -> Dict[str, Any]:
+    """Summarise in priority order, calling `publish(players)` after every
+    completed tier and once more when stopping (budget, deadline or error)."""
+    budget = budget or Budget()
+    queue = schedule(players, priority)
+    done, unpublished, stopped, error = 0, 0, None, None
+    for idx in queue:
+        stopped = budget.exhausted()
+        if stopped:
+            break
+        player = players[idx]
+        name = player.get("player") or player.get("name") or player.get("fullName") or f"index {idx}"
+        print(f"Generating summary for: {name} ...", flush=True)
+        try:
+            raw, tokens_in, tokens_out = call(build_messages(player, examples), model)
+        except Exception as e:
+            error = f"OpenAI API error: {e}"
+            break
+        budget.charge(tokens_in, tokens_out)
+        player["fitSummary"] = raw
+        player["fitSummaryStruct"] = parse_bullets(raw)
+        done, unpublished = done + 1, unpublished + 1
+        if unpublished >= tier_size:
+            publish(players)
+            print(f"Published tier: {done}/{len(queue)} summaries", flush=True)
+            unpublished = 0
+        time.sleep(PAUSE_BETWEEN_CALLS)
+    if unpublished:
+        publish(players)
+    return {"queued": len(queue), "done": done, "calls": budget.calls, "cost": budget.cost,
+            "stopped": stopped, "error": error}
+
+
+def custom_id(player: Dict[str, Any]) -> str:
+    """Request id from (name, team) only, so it does not depend on file order."""
+    key = f"{str(player.get('player') or player.get('name') or '').lower()}|{str(player.get('team') or '').lower()}"
+    return "fit-" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def write_bulk_requests(path: str, players: List[Dict[str, Any]], model: str,
+                        examples: Optional[List[Dict[str, Any]]] = None,
+                        priority: str = PRIORITY_DEFAULT) -> int:
+    """Phase 1: one Batch API line per player/team lacking a summary, priority order."""
+    queue, seen = [], set()
+    for idx in schedule(players, priority):
+        cid = custom_id(players[idx])
+        if cid not in seen:
+            seen.add(cid)
+            queue.append((cid, idx))
+    with open(path, "w", encoding="utf-8") as f:
+        for cid, idx in queue:
+            f.write(json.dumps({
+                "custom_id": cid,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": completion_body(build_messages(players[idx], examples), model),
+            }, ensure_ascii=False) + "\n")
+    return len(queue)
+
+
+def read_bulk_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """custom_id → {"content": str} or {"error": str} from a Batch API output file."""
+    results = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError as e:
+                fail(f"{path}:{n}: bad JSON ({e})")
+            cid = obj.get("custom_id")
+            resp = obj.get("response") or {}
+            body = resp.get("body") or {}
+            if obj.get("error") or resp.get("status_code", 200) != 200 or not body.get("choices"):
+                err = obj.get("error") or body.get("error") or f"status {resp.get('status_code')}"
+                results[cid] = {"error": json.dumps(err) if not isinstance(err, str) else err}
+                continue
+            results[cid] = {"content": (body["choices"][0]["message"].get("content") or "").strip()}
+    return results
+
+
+def ingest_bulk_results(players: List[Dict[str, Any]], results: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+    """Phase 2: merge parsed results into players lacking a summary (every
+    row sharing the result's player/team)."""
+    rows: Dict[str, List[int]] = {}
+    for i, p in enumerate(players):
+        rows.setdefault(custom_id(p), []).append(i)
+    stats = {"merged": 0, "already": 0, "errors": 0, "unknown": 0}
+    for cid, res in results.items():
+        if cid not in rows:
+            stats["unknown"] += 1
+        elif "error" in res or not res["content"]:
+            stats["errors"] += 1
+        else:
+            for idx in rows[cid]:
+                if has_summary(players[idx]):
+                    stats["already"] += 1
+                else:
+                    players[idx]["fitSummary"] = res["content"]
+                    players[idx]["fitSummaryStruct"] = parse_bullets(res["content"])
+                    stats["merged"] += 1
+    return stats
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    live = not (args.bulk_write or args.bulk_ingest)
+    if live and not os.environ.get("OPENAI_API_KEY"):
+        fail("OPENAI_API_KEY is not set.")
+    try:
+        players = load_json(args.json_path)
+    except Exception as e:
+        fail(f"Failed to read {args.json_path}: {e}")
     if not isinstance(players, list):
         fail("Input JSON must be an array of player objects.")
 
@@ -137,27 +324,39 @@ def main():
         except Exception as e:
             fail(f"Failed to load examples: {e}")
 
-    updated = False
-    for idx, player in enumerate(players):
-        if "fitSummary" in player and "fitSummaryStruct" in player:
-            continue
-        name = player.get("name") or player.get("fullName") or f"index {idx}"
-        print(f"Generating summary for: {name} ...", flush=True)
-        messages = build_messages(player, examples)
-        try:
-            raw = call_openai(messages, args.model)
-        except Exception as e:
-            fail(f"OpenAI API error: {e}")
-        player["fitSummary"] = raw
-        player["fitSummaryStruct"] = parse_bullets(raw)
-        updated = True
-        time.sleep(PAUSE_BETWEEN_CALLS)
+    if args.bulk_write:
+        n = write_bulk_requests(args.bulk_write, players, args.model, examples, args.priority)
+        print(f"Wrote {n} requests to {args.bulk_write}")
+        return {"queued": n}
+    if args.bulk_ingest:
+        stats = ingest_bulk_results(players, read_bulk_results(args.bulk_ingest))
+        if stats["merged"]:
+            try:
+                save_json(args.json_path, players)
+            except Exception as e:
+                fail(f"Failed to write JSON: {e}")
+        print("Bulk ingest: " + ", ".join(f"{k} {v}" for k, v in stats.items()))
+        return stats
 
-    if updated:
+    price = tuple(args.price) if args.price else PRICES.get(args.model)
+    if args.max_cost is not None and price is None:
+        fail(f"No price known for {args.model}; pass --price IN OUT with --max-cost.")
+    budget = Budget(args.max_calls, args.max_cost, price, args.deadline)
+
+    def publish(data):
         try:
-            save_json(args.json_path, players)
+            save_json(args.json_path, data)
         except Exception as e:
             fail(f"Failed to write JSON: {e}")
 
+    stats = summarize(players, args.model, examples, args.priority, args.tier_size, budget, publish)
+    print(f"Summarised {stats['done']}/{stats['queued']} players "
+          f"({stats['calls']} calls, ~${stats['cost']:.4f})"
+          + (f"; stopped: {stats['stopped']}" if stats["stopped"] else ""))
+    if stats["error"]:
+        fail(stats["error"])
+    return stats
+
+
 if __name__ == "__main__":
     main()
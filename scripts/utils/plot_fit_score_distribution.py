@@ -1,29 +1,35 @@
 #!/usr/bin/env python
 """
 plot_fit_score_distribution.py – Visualize and analyze fit scores for all players
-usage: python plot_fit_score_distribution.py
+usage: python plot_fit_score_distribution.py [players.json]
+       python plot_fit_score_distribution.py [players.json] --batch OUT_DIR [--jobs N]
+
+--batch writes one PNG per slice (position bucket, conference, origin team,
+all players) × score pillar, plus stats.csv. Statistics for every slice come
+from one groupby; charts are rendered headlessly in a process pool, and
+slices whose scores are unchanged since the last run are skipped.
 """
+import argparse
+import hashlib
 import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy import stats
 
-# Fit score weights (must sum to 1)
-WEIGHTS = dict(quality=0.34, style=0.33, need=0.33)
-
-def calc_fit(p):
-    """0‑1 composite, then scale to 0‑99 integer."""
-    q = p.get("qualityScore", 0)
-    s = p.get("styleScore",   0)
-    n = p.get("needScore",    0)
-    raw = (WEIGHTS["quality"]*q +
-           WEIGHTS["style"]  *s +
-           WEIGHTS["need"]   *n)
-    return int(round(raw * 99))
-
-def main():
-    inp = "data/transfer-players-2026-merged.json"
+MODEL_DIR = str(Path(__file__).resolve().parent.parent / "model")
+if MODEL_DIR not in sys.path:
+    sys.path.insert(0, MODEL_DIR)
+
+from calc_fit_score import calc_fit     # 0‑99 fit score, the model's weights
+
+def main(inp="data/transfer-players-2026-merged.json"):
     with open(inp) as f:
         players = json.load(f)
     fit_scores = [calc_fit(p) for p in players]
@@ -58,5 +64,121 @@ def main():
     plt.tight_layout()
     plt.show()
 
+# ---------------------------------------------------------------------
+# Batch report mode
+# ---------------------------------------------------------------------
+PILLARS = {"fit": "fitScore", "quality": "qualityScore",
+           "style": "styleScore", "need": "needScore"}
+SLICES = {"position": "posBucket", "conf": "conf", "team": "team"}
+MIN_COUNT = 5            # no chart for slices smaller than this
+
+
+def slice_frame(players):
+    """Long frame: one row per (slice, key, pillar, player)."""
+    import pandas as pd
+    from team_need import map_role          # the Team-Need position buckets
+    df = pd.DataFrame(players)
+    df["fitScore"] = [calc_fit(p) for p in players]
+    df["posBucket"] = df["role"].map(map_role) if "role" in df else "Unknown"
+    df["all"] = "all"
+    long = df.melt(id_vars=["all"] + [c for c in SLICES.values() if c in df],
+                   value_vars=[c for c in PILLARS.values() if c in df],
+                   var_name="pillar", value_name="value").dropna(subset=["value"])
+    long["pillar"] = long["pillar"].map({v: k for k, v in PILLARS.items()})
+    parts = []
+    for name, col in {"all": "all", **SLICES}.items():
+        if col in long:
+            parts.append(long[[col, "pillar", "value"]]
+                         .rename(columns={col: "key"}).assign(slice=name))
+    return pd.concat(parts, ignore_index=True).dropna(subset=["key"])
+
+
+def slice_stats(long):
+    """Count / mean / median / std / min / max / deciles for every slice at once."""
+    g = long.groupby(["slice", "key", "pillar"])["value"]
+    out = g.agg(["count", "mean", "median", "std", "min", "max"])
+    q = g.quantile([0.10, 0.25, 0.75, 0.90]).unstack()
+    q.columns = ["p10", "p25", "p75", "p90"]
+    return out.join(q).reset_index()
+
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "-", str(text)).strip("-") or "blank"
+
+
+def _render(job):
+    path, values, title, xlabel, mean, median = job
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.histplot(values, bins=30, kde=len(set(values)) > 1, color='skyblue',
+                 stat='density', edgecolor='black', ax=ax)
+    ax.axvline(mean, color='red', linestyle='--', label=f'Mean: {mean:.2f}')
+    ax.axvline(median, color='green', linestyle=':', label=f'Median: {median:.2f}')
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel('Density')
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+    return path
+
+
+def _init_headless():
+    plt.switch_backend("Agg")
+
+
+def batch_report(inp, out_dir, jobs=None, min_count=MIN_COUNT, force=False):
+    """Write stats.csv and one histogram per slice × pillar into out_dir."""
+    with open(inp) as f:
+        players = json.load(f)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    long = slice_frame(players)
+    table = slice_stats(long)
+    table.to_csv(out_dir / "stats.csv", index=False)
+
+    manifest_fp = out_dir / "manifest.json"
+    manifest = json.loads(manifest_fp.read_text()) if manifest_fp.exists() else {}
+    todo, fresh = [], {}                    # rebuilt each run: only this run's slices
+    for (sl, key, pillar), grp in long.groupby(["slice", "key", "pillar"]):
+        values = np.sort(grp["value"].to_numpy(dtype=float))
+        if len(values) < min_count:
+            continue
+        path = out_dir / f"{sl}_{_slug(key)}_{pillar}.png"
+        digest = hashlib.sha1(values.tobytes()).hexdigest()
+        fresh[path.name] = digest
+        if not force and manifest.get(path.name) == digest and path.exists():
+            continue
+        title = f"{PILLARS[pillar]} distribution – {key}" if sl != "all" \
+            else f"{PILLARS[pillar]} distribution – all players"
+        todo.append((str(path), values, title, PILLARS[pillar],
+                     float(values.mean()), float(np.median(values))))
+
+    if todo:
+        workers = jobs or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers, initializer=_init_headless) as ex:
+            list(ex.map(_render, todo, chunksize=max(1, len(todo) // (4 * workers))))
+    for stale in manifest.keys() - fresh.keys():
+        (out_dir / stale).unlink(missing_ok=True)
+    manifest_fp.write_text(json.dumps(fresh, indent=2))
+    print(f"{len(table)} slice stats → {out_dir / 'stats.csv'}; rendered {len(todo)} charts")
+    return table
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fit score distribution report.")
+    parser.add_argument("inp", nargs="?", default="data/transfer-players-2026-merged.json")
+    parser.add_argument("--batch", metavar="OUT_DIR", help="Write per-slice charts + stats here (headless)")
+    parser.add_argument("--jobs", type=int, help="Render processes (default: all cores)")
+    parser.add_argument("--min-count", type=int, default=MIN_COUNT)
+    parser.add_argument("--force", action="store_true", help="Re-render unchanged slices too")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    args = parse_args()
+    if args.batch:
+        batch_report(args.inp, args.batch, args.jobs, args.min_count, args.force)
+    else:
+        main(args.inp)
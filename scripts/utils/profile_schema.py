@@ -0,0 +1,351 @@
+#!/usr/bin/env python
+"""
+profile_schema.py – streaming field profile of scraped / merged JSON files
+
+Usage:
+    python scripts/utils/profile_schema.py [PATH ...] [--top 5] [--capacity 64] [--json OUT]
+
+- PATH is a JSON array of records or JSONL (one record per line); several
+  paths (e.g. one per season) are profiled as one stream.
+  Default: data/transfer-players-2026-merged.json
+- Records are decoded one at a time from fixed-size chunks, so memory is
+  bounded by the widest record and the sketches, not the file size.
+- Per field: present / null counts, value types, min / max of numeric
+  values (numeric text counts; heights like "6-8" are read as inches),
+  an approximate distinct count (HyperLogLog) and the most frequent values
+  (space-saving sketch: counts are upper bounds once the sketch is full).
+- Standard library only.
+"""
+import argparse
+import hashlib
+import json
+import math
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+DEFAULT_PATH = "data/transfer-players-2026-merged.json"
+CHUNK_SIZE   = 1 << 20        # bytes read per refill
+HLL_P        = 12             # 4096 registers → ~1.6 % relative error
+EXACT_LIMIT  = 1024           # distinct counts are exact up to this many values
+TOP_CAPACITY = 64
+HEIGHT_FIELDS = {"height", "247_height"}
+
+_HEIGHT_RE = re.compile(r"^\s*(\d)\s*[-']\s*(\d{1,2})\s*\"?\s*$")
+_WS = " \t\r\n"
+_NUM_CHARS = "0123456789.eE+-"
+
+
+# ---------------------------------------------------------------------------
+# 1. Incremental readers
+# ---------------------------------------------------------------------------
+def _iter_array(f, chunk_size: int) -> Iterator[Any]:
+    """Elements of a top-level JSON array, decoded one at a time."""
+    dec = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buf, pos = buf[pos:] + chunk, 0
+
+    def skip_ws():
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos] in _WS:
+                pos += 1
+            if pos < len(buf) or eof:
+                return
+            fill()
+
+    skip_ws()
+    if buf[pos:pos + 1] != "[":
+        raise ValueError("expected a JSON array")
+    pos += 1
+    skip_ws()
+    if buf[pos:pos + 1] == "]":
+        return
+    while True:
+        try:
+            obj, end = dec.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()                       # element spans the chunk boundary
+            continue
+        if (not eof and isinstance(obj, (int, float)) and not isinstance(obj, bool)
+                and (end == len(buf) or buf[end] in _NUM_CHARS)):
+            fill()                       # the number may continue in the next chunk
+            continue
+        pos = end
+        yield obj
+        skip_ws()
+        sep = buf[pos:pos + 1]
+        pos += 1
+        if sep == "]":
+            return
+        if sep != ",":
+            raise ValueError(f"unexpected {sep!r} between array elements")
+        skip_ws()
+
+
+def iter_records(path: str | Path, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Records of a JSON array or JSONL file, without loading the whole file."""
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(1)
+        while head and head in _WS:
+            head = f.read(1)
+        if head == "[":
+            f.seek(0)
+            yield from _iter_array(f, chunk_size)
+            return
+        f.seek(0)
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+# ---------------------------------------------------------------------------
+# 2. Sketches
+# ---------------------------------------------------------------------------
+def _hash64(s: str) -> int:
+    return int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """Approximate distinct count in 2**p bytes."""
+    def __init__(self, p: int = HLL_P):
+        self.p = p
+        self.m = 1 << p
+        self.reg = bytearray(self.m)
+
+    def add(self, h: int):
+        idx = h >> (64 - self.p)
+        rest = (h << self.p) & ((1 << 64) - 1)
+        rank = (64 - self.p + 1) if rest == 0 else (64 - rest.bit_length() + 1)
+        if rank > self.reg[idx]:
+            self.reg[idx] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        self.reg = bytearray(max(a, b) for a, b in zip(self.reg, other.reg))
+
+    def estimate(self) -> float:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        est = alpha * m * m / sum(2.0 ** -r for r in self.reg)
+        zeros = self.reg.count(0)
+        if est <= 2.5 * m and zeros:
+            est = m * math.log(m / zeros)          # linear counting for small sets
+        return est
+
+
+class SpaceSaving:
+    """Top-k frequent values; counts overestimate by at most `err`."""
+    def __init__(self, capacity: int = TOP_CAPACITY):
+        self.capacity = capacity
+        self.counts: Dict[Any, int] = {}
+        self.err: Dict[Any, int] = {}
+
+    def add(self, v):
+        if v in self.counts:
+            self.counts[v] += 1
+        elif len(self.counts) < self.capacity:
+            self.counts[v], self.err[v] = 1, 0
+        else:
+            victim = min(self.counts, key=self.counts.get)
+            c = self.counts.pop(victim)
+            del self.err[victim]
+            self.counts[v], self.err[v] = c + 1, c
+
+    def top(self, k: Optional[int] = None, min_count: int = 1) -> List[tuple]:
+        """Most frequent values whose guaranteed count (count − err) ≥ min_count."""
+        items = sorted(((v, c) for v, c in self.counts.items() if c - self.err[v] >= min_count),
+                       key=lambda kv: (-kv[1], str(kv[0])))
+        return items if k is None else items[:k]
+
+    @property
+    def exact(self) -> bool:
+        return not any(self.err.values())
+
+
+# ---------------------------------------------------------------------------
+# 3. Per-field profile
+# ---------------------------------------------------------------------------
+def _type_name(v) -> str:
+    if v is None:
+        return "null"
+    if isinstance(v, bool):
+        return "bool"
+    if isinstance(v, (int, float)):
+        return "int" if isinstance(v, int) else "float"
+    if isinstance(v, str):
+        return "str"
+    return "list" if isinstance(v, list) else "dict"
+
+
+def height_inches(v) -> Optional[float]:
+    """"6-8" / 6'8" → 80.0; plain numbers are taken as inches already."""
+    if isinstance(v, str):
+        m = _HEIGHT_RE.match(v)
+        if m:
+            return int(m.group(1)) * 12 + int(m.group(2))
+    return as_number(v)
+
+
+def as_number(v) -> Optional[float]:
+    if isinstance(v, bool) or v is None:
+        return None
+    if isinstance(v, (int, float)):
+        return float(v) if math.isfinite(v) else None
+    if isinstance(v, str):
+        try:
+            x = float(v.replace(",", ""))
+        except ValueError:
+            return None
+        return x if math.isfinite(x) else None
+    return None
+
+
+class FieldProfile:
+    def __init__(self, name: str, capacity: int = TOP_CAPACITY):
+        self.name = name
+        self.present = 0
+        self.nulls = 0
+        self.types: Dict[str, int] = {}
+        self.numeric = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.hll = HyperLogLog()
+        self.exact: Optional[set] = set()     # dropped past EXACT_LIMIT
+        self.top = SpaceSaving(capacity)
+        self._num = height_inches if name in HEIGHT_FIELDS else as_number
+
+    def add(self, v):
+        self.present += 1
+        t = _type_name(v)
+        self.types[t] = self.types.get(t, 0) + 1
+        if v is None or v == "" or (t == "float" and math.isnan(v)):
+            self.nulls += 1
+            return
+
+        key = json.dumps(v, sort_keys=True) if t in ("list", "dict") else f"{t}:{v}"
+        self.hll.add(_hash64(key))
+        if self.exact is not None:
+            self.exact.add(key)
+            if len(self.exact) > EXACT_LIMIT:
+                self.exact = None
+        if t not in ("list", "dict"):
+            self.top.add(v)
+
+        x = self._num(v)
+        if x is not None:
+            self.numeric += 1
+            self.min = x if self.min is None else min(self.min, x)
+            self.max = x if self.max is None else max(self.max, x)
+
+    def distinct(self) -> int:
+        return len(self.exact) if self.exact is not None else round(self.hll.estimate())
+
+    def summary(self, n_records: int, top_k: int = 5) -> Dict[str, Any]:
+        return {
+            "field": self.name,
+            "present": self.present,
+            "missing": n_records - self.present,
+            "nulls": self.nulls,
+            "types": dict(sorted(self.types.items(), key=lambda kv: -kv[1])),
+            "distinct": self.distinct(),
+            "distinctExact": self.exact is not None,
+            "numeric": self.numeric,
+            "min": self.min,
+            "max": self.max,
+            # once the sketch has evicted, only values seen at least twice are reliable
+            "top": [[v, c] for v, c in self.top.top(top_k, 1 if self.top.exact else 2)],
+            "topExact": self.top.exact,
+        }
+
+
+def profile_records(records: Iterable[Any], capacity: int = TOP_CAPACITY) -> Dict[str, Any]:
+    """Stream `records` once → {"records": n, "fields": {name: FieldProfile}}."""
+    fields: Dict[str, FieldProfile] = {}
+    n = skipped = 0
+    for rec in records:
+        if not isinstance(rec, dict):
+            skipped += 1
+            continue
+        n += 1
+        for k, v in rec.items():
+            fp = fields.get(k)
+            if fp is None:
+                fp = fields[k] = FieldProfile(k, capacity)
+            fp.add(v)
+    return {"records": n, "skipped": skipped, "fields": fields}
+
+
+def profile_files(paths: Iterable[str | Path], capacity: int = TOP_CAPACITY) -> Dict[str, Any]:
+    def chain():
+        for p in paths:
+            yield from iter_records(p)
+    return profile_records(chain(), capacity)
+
+
+# ---------------------------------------------------------------------------
+# 4. Report
+# ---------------------------------------------------------------------------
+def _fmt_num(x: Optional[float]) -> str:
+    if x is None:
+        return "-"
+    return f"{x:g}" if abs(x) < 1e6 else f"{x:.3e}"
+
+
+def _fmt_val(v) -> str:
+    return f"{v:.6g}" if isinstance(v, float) else str(v)
+
+
+def format_report(profile: Dict[str, Any], top_k: int = 5) -> str:
+    n = profile["records"]
+    lines = [f"{n} records, {len(profile['fields'])} fields"
+             + (f" ({profile['skipped']} non-object rows skipped)" if profile["skipped"] else "")]
+    lines.append(f"{'field':<24}{'present':>8}{'null':>7}  {'types':<18}{'distinct':>9}"
+                 f"{'min':>10}{'max':>10}  top values")
+    for name in sorted(profile["fields"]):
+        s = profile["fields"][name].summary(n, top_k)
+        types = ",".join(s["types"])
+        distinct = f"{'' if s['distinctExact'] else '~'}{s['distinct']}"
+        top = ", ".join(f"{_fmt_val(v):.20}×{c}" for v, c in s["top"])
+        lines.append(f"{name:<24}{s['present']:>8}{s['nulls']:>7}  {types:<18.18}{distinct:>9}"
+                     f"{_fmt_num(s['min']):>10}{_fmt_num(s['max']):>10}  {top}")
+    return "\n".join(lines)
+
+
+def to_json(profile: Dict[str, Any], top_k: int = 5) -> Dict[str, Any]:
+    n = profile["records"]
+    return {"records": n, "skipped": profile["skipped"],
+            "fields": [profile["fields"][k].summary(n, top_k) for k in sorted(profile["fields"])]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming schema profile of JSON / JSONL records.")
+    parser.add_argument("paths", nargs="*", default=[DEFAULT_PATH], help=f"Input files (default: {DEFAULT_PATH})")
+    parser.add_argument("--top", type=int, default=5, help="Top values shown per field (default: 5)")
+    parser.add_argument("--capacity", type=int, default=TOP_CAPACITY,
+                        help=f"Values tracked per field by the top-k sketch (default: {TOP_CAPACITY})")
+    parser.add_argument("--json", metavar="OUT", help="Also write the profile as JSON ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    profile = profile_files(args.paths, args.capacity)
+    if args.json == "-":
+        json.dump(to_json(profile, args.top), sys.stdout, indent=2, default=str)
+        print()
+        return profile
+    print(format_report(profile, args.top))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(to_json(profile, args.top), f, indent=2, default=str)
+        print(f"Wrote profile to {args.json}")
+    return profile
+
+
+if __name__ == "__main__":
+    main()
@@ -1,42 +1,41 @@
-import json
+from profile_schema import profile_files
 
 file_path = 'data/transfer-players-2026-merged.json'
 
-# Load the JSON data
-with open(file_path, 'r') as f:
-    data = json.load(f)
-
-
-# Get every unique field in the data
-all_fields = set()
-for entry in data:
-    all_fields.update(entry.keys())
+# Stream the JSON once (no full load); role / matchedTo values come from a
+# top-k sketch, so they are complete as long as there are ≤ 256 of them
+profile = profile_files([file_path], capacity=256)
+fields = profile['fields']
 
 print("All fields in the data:")
-for field in sorted(all_fields):
+for field in sorted(fields):
     print(field)
 
-print("\nUnique values for 'role':")
-roles = set(entry.get('role') for entry in data if 'role' in entry)
-for role in sorted(roles):
-    print(role)
 
-print("\nUnique values for 'matchedTo':")
-matched_to = set(entry.get('matchedTo') for entry in data if 'matchedTo' in entry)
-for m in (matched_to):
-    print(m)
+def print_values(field):
+    fp = fields.get(field)
+    if fp is None:
+        return
+    values = [v for v, _ in fp.top.top()]
+    for v in sorted(values, key=str):
+        print(v)
+    if fp.nulls:
+        print(None)
+    if not fp.top.exact:
+        print(f"... ~{fp.distinct()} distinct values, showing the most frequent {len(values)}")
 
-# Get max height and weight
-heights = [entry.get('height') for entry in data if 'height' in entry and isinstance(entry.get('height'), (int, float, str))]
-weights = [entry.get('weight') for entry in data if 'weight' in entry and isinstance(entry.get('weight'), (int, float, str))]
 
-# Convert to float if possible
-heights = [float(h) for h in heights if h is not None and str(h).replace('.', '', 1).isdigit()]
-weights = [float(w) for w in weights if w is not None and str(w).replace('.', '', 1).isdigit()]
+print("\nUnique values for 'role':")
+print_values('role')
+
+print("\nUnique values for 'matchedTo':")
+print_values('matchedTo')
 
-max_height = max(heights) if heights else None
-max_weight = max(weights) if weights else None
+# Max height ("6-8" → inches) and weight
+height = fields.get('height')
+weight = fields.get('weight')
+max_height = height.max if height else None
+max_weight = weight.max if weight else None
 
 print(f"\nMax height: {max_height}")
 print(f"Max weight: {max_weight}")
-    